@@ -0,0 +1,3 @@
+"""
+Benchmarks of the build performance of Pavo, on synthetic projects of configurable scale.
+"""
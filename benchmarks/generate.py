@@ -0,0 +1,294 @@
+import os
+import zlib
+import random
+import struct
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import yaml
+
+# The first publication date of the generated posts. Posts are spread over the days after it, a few posts per day.
+_FIRST_POST_DATE = date(2010, 1, 1)
+_POSTS_PER_DAY = 4
+
+_WORDS = (
+    "pavo static site generator build render template markdown page post image style asset cache "
+    "manifest output website content layout theme plugin server preview deploy fast simple flexible "
+    "reliable python jinja sass html css incremental parallel dispatch change file directory project"
+).split()
+
+
+@dataclass
+class Scale:  # pylint: disable=too-many-instance-attributes
+    """The size of a synthetic project.
+
+    Attributes:
+        pages: The amount of pages.
+        posts: The amount of posts.
+        templates: The amount of page templates, which are spread over the pages.
+        depth: The inheritance depth of the templates, including the base template.
+        data_files: The amount of data files.
+        images: The amount of images.
+        stylesheets: The amount of sass partials imported by the main stylesheet.
+        paragraphs: The amount of paragraphs in every post.
+        per_page: The amount of posts on every page of the paginated index.
+    """
+
+    pages: int
+    posts: int
+    templates: int = 4
+    depth: int = 3
+    data_files: int = 5
+    images: int = 5
+    stylesheets: int = 5
+    paragraphs: int = 6
+    per_page: int = 20
+
+
+SCALES = {
+    "tiny": Scale(pages=3, posts=10, templates=2, depth=2, images=1, stylesheets=2),
+    "small": Scale(pages=20, posts=200),
+    "medium": Scale(pages=100, posts=2000, templates=8, depth=4, images=20),
+    "large": Scale(
+        pages=500, posts=20000, templates=16, depth=5, images=50, stylesheets=20
+    ),
+}
+
+
+def generate_project(directory: str, scale: Scale, seed: int = 0) -> None:
+    """Generates a synthetic Pavo project, with deterministic content for the same scale and seed.
+
+    Args:
+        directory (str): The directory to generate the project in. It is created when it does not exist.
+        scale (Scale): The size of the project.
+        seed (int): The seed of the generated content.
+    """
+    generator = random.Random(seed)
+    for folder in (
+        "_data",
+        "_pages",
+        "_posts",
+        "_drafts",
+        "_static/public",
+        "_static/templates",
+        "_static/styles",
+        "_static/images",
+    ):
+        os.makedirs(os.path.join(directory, folder), exist_ok=True)
+
+    _write(directory, "pavoconfig.yaml", yaml.dump(_config(scale)))
+    _write(
+        directory,
+        "_data/site.yaml",
+        yaml.dump({"title": "Benchmark", "tagline": "Synthetic project"}),
+    )
+    for number in range(scale.data_files):
+        _write(
+            directory,
+            f"_data/data-{number}.yaml",
+            yaml.dump(
+                {
+                    "title": _sentence(generator, 4),
+                    "links": [
+                        {"name": _sentence(generator, 2), "url": f"/page-{link}.html"}
+                        for link in range(10)
+                    ],
+                }
+            ),
+        )
+
+    _write_templates(directory, scale)
+    _write_styles(directory, scale, generator)
+    for number in range(scale.images):
+        with open(
+            os.path.join(directory, f"_static/images/image-{number}.png"), "wb"
+        ) as file:
+            file.write(_png(640 + 64 * number, 480, number))
+    _write(directory, "_static/public/robots.txt", "User-agent: *\nAllow: /\n")
+
+    _write(
+        directory,
+        "_pages/index.md",
+        f"---\ntitle: Home\ntemplate: listing\npaginate: {scale.per_page}\n---\n",
+    )
+    for number in range(scale.pages):
+        _write(
+            directory,
+            f"_pages/page-{number}.md",
+            f"---\ntitle: Page {number}\ntemplate: template-{number % scale.templates}\n---\n"
+            + _markdown(generator, scale.paragraphs // 2 + 1),
+        )
+
+    for number in range(scale.posts):
+        published = _FIRST_POST_DATE + timedelta(days=number // _POSTS_PER_DAY)
+        _write(
+            directory,
+            f"_posts/{published.isoformat()}-post-{number}.md",
+            f"---\ntitle: {published.isoformat()} {_sentence(generator, 5)}\n---\n"
+            + _markdown(generator, scale.paragraphs),
+        )
+
+
+def _config(scale: Scale) -> dict:
+    """Creates the configuration of a synthetic project, with all optimizations enabled."""
+    return {
+        "version": "0.1.0",
+        "build": {
+            "default_templates": {"page": "template-0", "post": "post"},
+            "max_template_cache": max(50, scale.templates + scale.depth + 4),
+            "markdown": {"extras": ["cuddled-lists", "fenced-code-blocks"]},
+            "images": {"optimize": True, "widths": [320, 640], "webp": True},
+            "fingerprint": {"enabled": True, "public": []},
+            "styles": {"source_maps": False, "purge": {"enabled": True}},
+            "minify": {"enabled": True},
+            "compress": {"enabled": True, "formats": ["gzip"]},
+            "paths": {"site_config": "./_data/site.yaml"},
+        },
+        "logging": {"enabled": False, "level": 20},
+        "plugins": None,
+    }
+
+
+def _write_templates(directory: str, scale: Scale) -> None:
+    """Writes a chain of layouts of the configured depth, and the page, post and listing templates on top of it."""
+    _write(
+        directory,
+        "_static/templates/base.html",
+        "<!DOCTYPE html>\n<html>\n<head>\n<title>{{ site.title }} - {{ page.title }}</title>\n"
+        '<link rel="stylesheet" href="{{ asset("/styles/main.css") }}">\n</head>\n<body>\n'
+        '{% include "nav.html" %}\n{% block body %}{% endblock %}\n'
+        '<footer class="footer">{{ data["data-0"].title }}</footer>\n</body>\n</html>\n',
+    )
+    _write(
+        directory,
+        "_static/templates/nav.html",
+        '<nav class="nav">\n{% for link in data["data-0"].links %}\n'
+        '  <a class="nav-link" href="{{ link.url }}">{{ link.name }}</a>\n{% endfor %}\n</nav>\n',
+    )
+
+    parent = "base.html"
+    for level in range(1, scale.depth):
+        _write(
+            directory,
+            f"_static/templates/layout-{level}.html",
+            f'{{% extends "{parent}" %}}\n{{% block body %}}<div class="layout-{level}">\n'
+            f"{{% block layout_{level} %}}{{% endblock %}}\n</div>{{% endblock %}}\n",
+        )
+        parent = f"layout-{level}.html"
+
+    block = f"layout_{scale.depth - 1}" if scale.depth > 1 else "body"
+    for number in range(scale.templates):
+        _write(
+            directory,
+            f"_static/templates/template-{number}.html",
+            f'{{% extends "{parent}" %}}\n{{% block {block} %}}'
+            f'<main class="page page-{number}">\n<h1>{{{{ page.title }}}}</h1>\n{{{{ content }}}}\n'
+            f'<img src="{{{{ images[\'image-0.png\'] }}}}" alt="">\n</main>{{% endblock %}}\n',
+        )
+    _write(
+        directory,
+        "_static/templates/post.html",
+        f'{{% extends "{parent}" %}}\n{{% block {block} %}}<article class="post">\n'
+        "<h1>{{ page.title }}</h1>\n{{ content }}\n</article>{% endblock %}\n",
+    )
+    _write(
+        directory,
+        "_static/templates/listing.html",
+        f'{{% extends "{parent}" %}}\n{{% block {block} %}}<ul class="posts">\n'
+        "{% for post in paginator.items %}\n"
+        '  <li class="post-link"><a href="{{ post.slug }}">{{ post.title }}</a> {{ post.date }}</li>\n'
+        '{% endfor %}\n</ul>\n<a href="{{ paginator.next_url }}">Next</a>{% endblock %}\n',
+    )
+
+
+def _write_styles(directory: str, scale: Scale, generator: random.Random) -> None:
+    """Writes a main stylesheet that imports a variables partial and the configured amount of component partials."""
+    _write(
+        directory,
+        "_static/styles/_variables.scss",
+        "$primary: #336699;\n$spacing: 8px;\n@mixin card { padding: $spacing; border-radius: 4px; }\n",
+    )
+    imports = ['@import "variables";']
+    for number in range(scale.stylesheets):
+        rules = "\n".join(
+            f".component-{number}-{rule} {{ @include card; color: darken($primary, {generator.randint(0, 30)}%); }}"
+            for rule in range(20)
+        )
+        _write(
+            directory,
+            f"_static/styles/_component-{number}.scss",
+            f'@import "variables";\n{rules}\n',
+        )
+        imports.append(f'@import "component-{number}";')
+    _write(
+        directory,
+        "_static/styles/main.scss",
+        "\n".join(imports)
+        + "\n.nav { display: flex; .nav-link { margin: $spacing; } }\n"
+        ".post, .page { max-width: 60em; h1 { color: $primary; } }\n",
+    )
+
+
+def _markdown(generator: random.Random, paragraphs: int) -> str:
+    """Creates markdown with headings, emphasis, links, lists, quotes and code blocks."""
+    blocks = []
+    for number in range(paragraphs):
+        kind = number % 5
+        if kind == 0:
+            blocks.append(f"## {_sentence(generator, 4)}")
+        if kind == 3:
+            blocks.append("\n".join(f"- {_sentence(generator, 6)}" for _ in range(5)))
+        elif kind == 4:
+            blocks.append(
+                "```python\ndef handler(event):\n    return event.get('name')\n```"
+            )
+        else:
+            words = [generator.choice(_WORDS) for _ in range(generator.randint(40, 90))]
+            words[3] = f"*{words[3]}*"
+            words[8] = f"[{words[8]}](/page-{generator.randint(0, 9)}.html)"
+            blocks.append(f"{' '.join(words).capitalize()}.")
+        if number == 2:
+            blocks.append(f"> {_sentence(generator, 12)}")
+
+    return "\n\n".join(blocks) + "\n"
+
+
+def _sentence(generator: random.Random, words: int) -> str:
+    return " ".join(generator.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _png(width: int, height: int, seed: int) -> bytes:
+    """Encodes a gradient as an RGB PNG, so images can be generated without Pillow."""
+    rows = b"".join(
+        b"\x00"
+        + bytes(
+            channel
+            for column in range(width)
+            for channel in (
+                (column + seed * 16) % 256,
+                row % 256,
+                (column + row) % 256,
+            )
+        )
+        for row in range(height)
+    )
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + kind
+            + data
+            + struct.pack(">I", zlib.crc32(kind + data))
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _write(directory: str, path: str, content: str) -> None:
+    with open(os.path.join(directory, path), "w", encoding="utf-8") as file:
+        file.write(content)
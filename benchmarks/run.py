@@ -0,0 +1,293 @@
+"""
+Times builds, dispatches and development server rebuilds of synthetic Pavo projects, and compares them to baselines.
+
+Baselines depend on the machine they were timed on, so they are stored locally instead of in the repository. Store
+them once, before making changes, and compare to them afterwards. Run from the repository root:
+>>> python -m benchmarks.run --scale small --update-baseline
+>>> python -m benchmarks.run --scale small
+"""
+
+import os
+import sys
+import json
+import shutil
+import functools
+import argparse
+import platform
+import contextlib
+import tempfile
+import time
+from typing import Any, Callable, Iterator
+
+import tabulate
+
+from pavo.core.output import MemoryOutput
+from pavo.core.website_builder import WebsiteBuilder
+from benchmarks.generate import SCALES, generate_project
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def run_benchmarks(scale_name: str, repeat: int, jobs: int) -> dict[str, float]:
+    """Times every scenario on fresh copies of a synthetic project.
+
+    Args:
+        scale_name (str): The name of the scale of the project.
+        repeat (int): The amount of times to time every scenario.
+        jobs (int): The amount of processes to build with.
+
+    Returns:
+        dict: The fastest time of every scenario, in seconds. The fastest time is the least affected by other work on
+            the machine.
+    """
+    timings: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "source")
+        generate_project(source, SCALES[scale_name])
+        for run in range(repeat):
+            project = os.path.join(directory, f"run-{run}")
+            shutil.copytree(source, project)
+            with _in_project(project):
+                for name, seconds in _time_scenarios(project, jobs):
+                    timings.setdefault(name, []).append(seconds)
+
+    return {name: min(times) for name, times in timings.items()}
+
+
+def _time_scenarios(project: str, jobs: int) -> Iterator[tuple[str, float]]:
+    """Times the scenarios on a single copy of a project, which depend on the scenarios before them."""
+    build_directory = os.path.join(project, ".pavocache", "build")
+    manifest = os.path.join(project, ".pavocache", "manifest.json")
+
+    builder = WebsiteBuilder(build_directory, manifest, jobs=jobs)
+    yield "build_cold", _time(builder.build)
+    yield "dispatch_cold", _time(builder.dispatch_build)
+
+    builder = WebsiteBuilder(build_directory, manifest, jobs=jobs)
+    yield "build_warm", _time(builder.build)
+    yield "dispatch_warm", _time(builder.dispatch_build)
+
+    # The development server builds to memory once, and rebuilds after every change
+    server = WebsiteBuilder(build_directory, jobs=jobs, output=MemoryOutput())
+    server.build(False)
+    for name, path in (
+        ("rebuild_post", "_posts/2010-01-01-post-0.md"),
+        ("rebuild_page", "_pages/page-0.md"),
+        ("rebuild_template", "_static/templates/post.html"),
+        ("rebuild_style", "_static/styles/_variables.scss"),
+        ("rebuild_data", "_data/data-0.yaml"),
+    ):
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("\n")
+        yield name, _time(functools.partial(server.rebuild, {path}))
+
+
+def _time(function: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def _in_project(project: str) -> Iterator[None]:
+    """Runs in the directory of a project, without printing the messages of the builds."""
+    previous = os.getcwd()
+    os.chdir(project)
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                yield
+    finally:
+        os.chdir(previous)
+
+
+def fingerprint(jobs: int) -> dict[str, Any]:
+    """Describes the machine and settings that the benchmarks run with, which timings are only comparable within.
+
+    Args:
+        jobs (int): The amount of processes to build with.
+
+    Returns:
+        dict: The fingerprint of the machine.
+    """
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "jobs": jobs,
+    }
+
+
+def load_baseline(
+    scale_name: str, machine: dict[str, Any], path: str = BASELINES
+) -> dict[str, float]:
+    """Loads the baseline timings of a scale.
+
+    Args:
+        scale_name (str): The name of the scale of the project.
+        machine (dict): The fingerprint of the machine that the timings are compared on.
+        path (str): The file that the baselines are stored in.
+
+    Returns:
+        dict: The baseline time of every scenario, in seconds. Empty when no baselines were stored for the scale.
+
+    Raises:
+        ValueError: The baselines were stored on another machine or with other settings.
+    """
+    if not os.path.isfile(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as file:
+        baseline = json.load(file).get(scale_name)
+
+    if baseline is None:
+        return {}
+    if baseline.get("machine") != machine:
+        raise ValueError(
+            f"The baselines of the {scale_name} scale were stored on another machine or with other settings."
+        )
+
+    return dict(baseline["timings"])
+
+
+def store_baseline(
+    scale_name: str,
+    machine: dict[str, Any],
+    timings: dict[str, float],
+    path: str = BASELINES,
+) -> None:
+    """Stores timings as the baseline of a scale, replacing the previous baseline of the scale.
+
+    Args:
+        scale_name (str): The name of the scale of the project.
+        machine (dict): The fingerprint of the machine that the timings were recorded on.
+        timings (dict): The time of every scenario, in seconds.
+        path (str): The file to store the baselines in.
+    """
+    baselines = {}
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as file:
+            baselines = json.load(file)
+
+    baselines[scale_name] = {
+        "machine": machine,
+        "timings": {name: round(seconds, 4) for name, seconds in timings.items()},
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baselines, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(
+    timings: dict[str, float],
+    baseline: dict[str, float],
+    tolerance: float,
+    slack: float = 0.0,
+) -> list[str]:
+    """Finds the scenarios that became slower than their baseline allows.
+
+    Args:
+        timings (dict): The time of every scenario, in seconds.
+        baseline (dict): The baseline time of every scenario, in seconds.
+        tolerance (float): The fraction that a scenario can be slower than its baseline.
+        slack (float): The amount of seconds that a scenario can be slower on top of that, so that scenarios of a few
+            milliseconds do not fail on noise.
+
+    Returns:
+        list: The names of the scenarios that regressed.
+    """
+    return [
+        name
+        for name, seconds in timings.items()
+        if name in baseline and seconds > baseline[name] * (1 + tolerance) + slack
+    ]
+
+
+def _print_timings(timings: dict[str, float], baseline: dict[str, float]) -> None:
+    """Prints the time of every scenario, next to its baseline when there is one."""
+    print(
+        tabulate.tabulate(
+            [
+                (
+                    [name, seconds, baseline.get(name), seconds / baseline[name] - 1]
+                    if name in baseline
+                    else [name, seconds, None, None]
+                )
+                for name, seconds in timings.items()
+            ],
+            headers=["Scenario", "Time (s)", "Baseline (s)", "Change"],
+            floatfmt=("", ".3f", ".3f", "+.1%"),
+            missingval="-",
+        )
+    )
+
+
+def main() -> int:
+    """Runs the benchmarks from the command line.
+
+    Returns:
+        int: The exit code, which is 1 when a scenario regressed and 2 when the baselines are not comparable.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="The fraction that a scenario can be slower than its baseline, defaults to 0.25.",
+    )
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=0.05,
+        help="The amount of seconds that a scenario can be slower on top of the tolerance, defaults to 0.05.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the timings as the new baselines of the scale.",
+    )
+    args = parser.parse_args()
+
+    timings = run_benchmarks(args.scale, args.repeat, args.jobs)
+    machine = fingerprint(args.jobs)
+    if args.update_baseline:
+        _print_timings(timings, {})
+        store_baseline(args.scale, machine, timings)
+        print(f"Stored the baselines of the {args.scale} scale in {BASELINES}.")
+        return 0
+
+    try:
+        baseline = load_baseline(args.scale, machine)
+    except ValueError as err:
+        print(
+            f"{err} Store new baselines with --update-baseline to compare to.",
+            file=sys.stderr,
+        )
+        return 2
+
+    _print_timings(timings, baseline)
+    if not baseline:
+        print(
+            f"\nNo baselines of the {args.scale} scale were stored yet, store them with --update-baseline.",
+            file=sys.stderr,
+        )
+
+    regressions = compare(timings, baseline, args.tolerance, args.slack)
+    if regressions:
+        print(
+            f"\nREGRESSION: {', '.join(regressions)} became more than "
+            f"{args.tolerance:.0%} slower than the baseline.",
+            file=sys.stderr,
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,24 @@
-from pavo.core import CommandManager
-from pavo.commands import Build, Create, Dev, Help
+from pavo.core import CommandManager, PluginManager, messages
+from pavo.commands import Build, Cache, Create, Dev, Help
+from pavo.utils import cache, files
 
+# Plugins are only read from their declarations here, they are imported once something they provide is used.
+plugin_manager = PluginManager(manifest_path=cache.cache_path("plugins.json"))
+if files.cd_is_project():
+    plugin_manager.discover()
 
 command_manager = CommandManager()
-command_manager.register(Build())
+command_manager.register(Build(plugin_manager=plugin_manager))
+command_manager.register(Cache())
 command_manager.register(Create())
-command_manager.register(Dev())
+command_manager.register(Dev(plugin_manager=plugin_manager))
 command_manager.register(Help(command_manager=command_manager))
+
+for plugin_command in plugin_manager.commands():
+    if plugin_command.name in command_manager.registered_commands:
+        messages.warning(
+            f"Ignoring the {plugin_command.name} command of a plugin, a command with that name already exists."
+        )
+        continue
+
+    command_manager.register(plugin_command)
@@ -1,5 +1,6 @@
 import sys
 import argparse
+from typing import Optional
 
 from pavo.ddl.commands import CommandInterface
 from pavo.core import messages
@@ -10,11 +11,14 @@ from ._app import command_manager
 
 def _create_argument_parser(
     commands: list[CommandInterface],
+    command_name: Optional[str] = None,
 ) -> argparse.ArgumentParser:
     """Creates an argument parser with recursively added subparsers based on a list of commands.
 
     Args:
         commands: The commands that should get their own subparser. Highly recommended for all commands.
+        command_name: The command that is executed. When given, only the arguments of this command are set up, so
+            the commands of plugins are only imported when they are executed.
 
     Returns:
         The argument parser with subparsers attached.
@@ -32,7 +36,8 @@ def _create_argument_parser(
 
     for command in commands:
         command_parser = subparsers.add_parser(command.name, **default_options)
-        command.setup_parser(command_parser)
+        if command_name is None or command.name == command_name:
+            command.setup_parser(command_parser)
 
     return argument_parser
 
@@ -44,12 +49,14 @@ def run_console_application() -> None:
             "Your Pavo config file version does not match your actual Pavo version."
         )
 
-    parser = _create_argument_parser([command for (name, command) in command_manager])
-    parsed_arguments = parser.parse_args()
-
     # Fetch the command from argument vector, so that it doesn't influence the parsed_arguments in any way.
     command = sys.argv[1] if len(sys.argv) > 1 else "help"
 
+    parser = _create_argument_parser(
+        [registered for (_, registered) in command_manager], command
+    )
+    parsed_arguments = parser.parse_args()
+
     try:
         command_manager.execute(command, parsed_arguments)
     except Exception as error:
@@ -3,6 +3,7 @@ The "commands" module contains all default commands for Pavo. The commands are a
 Please refer to the documentation for plugins and scripts to alter / extend Pavo builtin commands.
 """
 from ._build import Build
+from ._cache import Cache
 from ._dev import Dev
 from ._create import Create
 from ._help import Help
@@ -1,11 +1,12 @@
+import os
 import argparse
 
 from dataclasses import dataclass
 from typing import Optional
-from tempfile import TemporaryDirectory
 
 from pavo.ddl.commands import CommandInterface
-from pavo.core import WebsiteBuilder
+from pavo.core import WebsiteBuilder, PluginManager, messages
+from pavo.utils import cache
 
 
 @dataclass
@@ -15,17 +16,71 @@ class Build(CommandInterface):
     name: str = "build"
     help: str = "Builds and optimizes the website in the output directory."
     allow_outside_project: bool = False
+    plugin_manager: Optional[PluginManager] = None
 
     def run(self, args: argparse.Namespace) -> None:
-        """Creates a temporary directory, builds the website and dispatches it.
+        """Builds the website in the build cache directory and dispatches it.
+
+        The build directory and its manifest are kept between builds, so that outputs whose inputs did not change
+        since the previous build are not built again.
 
         Args:
             args: The arguments provided by the caller.
         """
-        with TemporaryDirectory() as build_directory:
-            builder = WebsiteBuilder(build_directory)
-            builder.build()
-            builder.dispatch_build()
+        build_directory = cache.ensure_cache_directory("build")
+        builder = WebsiteBuilder(
+            build_directory,
+            cache.cache_path("manifest.json"),
+            jobs=args.jobs,
+            render_workers=args.render_workers,
+            profile=args.profile,
+            hooks=self.plugin_manager.hooks() if self.plugin_manager else None,
+            filters=self.plugin_manager.filters() if self.plugin_manager else None,
+        )
+        builder.build()
+        builder.dispatch_build(atomic=args.atomic)
+
+        if args.profile:
+            builder.profiler.stop()
+            builder.profiler.print_report(args.profile_top)
+            report, trace = builder.profiler.write(cache.cache_path("profile"))
+            messages.info(f"Wrote the build profile to {report} and {trace}.")
 
     def setup_parser(self, parser: argparse.ArgumentParser) -> None:
-        return
+        add_build_arguments(parser)
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help="Replace the output directory as a whole, instead of only writing the files that changed.",
+        )
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Measure the time and memory every build stage and file takes, and write a report and a trace.",
+        )
+        parser.add_argument(
+            "--profile-top",
+            type=int,
+            default=10,
+            help="The amount of slowest files and templates to list in the profile, defaults to 10.",
+        )
+
+
+def add_build_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the arguments that tune how a website is built, shared by all commands that build a website.
+
+    Args:
+        parser: The parser of the command.
+    """
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="The amount of processes to spread the build over, defaults to the amount of CPUs.",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=None,
+        help="The amount of threads to render pages and posts with, defaults to the amount of jobs.",
+    )
@@ -0,0 +1,33 @@
+import argparse
+from dataclasses import dataclass
+
+from pavo.ddl.commands import CommandInterface
+from pavo.core import messages
+from pavo.utils import cache
+
+
+@dataclass
+class Cache(CommandInterface):
+    """Built-in 'cache' command."""
+
+    name: str = "cache"
+    help: str = "Manages the build caches of the project."
+    allow_outside_project: bool = False
+
+    def run(self, args: argparse.Namespace) -> None:
+        """Manages the caches that Pavo keeps between builds, in the .pavocache directory.
+
+        Usage: "pavo cache clear" removes the caches of converted markdown, images, stylesheets, compressed and
+        minified files and compiled templates, so that the next build produces them from scratch. The build manifest,
+        the previous build and the other state of the project are kept.
+
+        Args:
+            args: The arguments provided by the caller.
+        """
+        if args.action == "clear":
+            for name in cache.ARTIFACT_CACHES:
+                cache.DiskCache(cache.cache_path(name)).clear()
+            messages.success("Cleared the build caches.")
+
+    def setup_parser(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument("action", type=str, choices=["clear"])
@@ -109,7 +109,30 @@ def _create_new_project_structure(project_name: str) -> None:
         "build": {
             "default_templates": {"page": "page", "post": "post", "draft": "page"},
             "max_template_cache": 50,
-            "markdown": {"extras": ["cuddled-lists", "fenced-code-blocks"]},
+            "markdown": {
+                "extras": ["cuddled-lists", "fenced-code-blocks"],
+                "cache_size": 256,
+            },
+            "images": {
+                "optimize": False,
+                "widths": [480, 960, 1920],
+                "quality": 82,
+                "webp": True,
+                "cache_size": 1024,
+            },
+            "fingerprint": {"enabled": False, "public": []},
+            "styles": {
+                "source_maps": False,
+                "purge": {"enabled": False, "safelist": []},
+                "cache_size": 64,
+            },
+            "minify": {"enabled": True, "cache_size": 256},
+            "compress": {
+                "enabled": False,
+                "formats": ["gzip", "brotli"],
+                "min_size": 1024,
+                "cache_size": 256,
+            },
             "paths": {"site_config": "./_data/site.yaml"},
         },
         "logging": {"enabled": True, "level": 20},
@@ -3,9 +3,10 @@ from tempfile import TemporaryDirectory
 from dataclasses import dataclass
 import argparse
 
-from pavo.core import messages
+from pavo.core import PluginManager, messages
 from pavo.ddl.commands import CommandInterface
-from pavo.server import LocalServer
+from pavo.server import LocalServer, DEFAULT_SETTLE_TIME
+from ._build import add_build_arguments
 
 
 @dataclass
@@ -15,6 +16,7 @@ class Dev(CommandInterface):
     name: str = "dev"
     help: str = "Starts a development preview server."
     allow_outside_project: bool = False
+    plugin_manager: Optional[PluginManager] = None
 
     def run(self, args: argparse.Namespace) -> None:
         """Starts a development server and builds the website to a temporary directory.
@@ -23,9 +25,21 @@ class Dev(CommandInterface):
             args: The arguments provided by the caller.
         """
         with TemporaryDirectory() as tmp_dir:
-            server = LocalServer(tmp_dir)
+            server = LocalServer(
+                tmp_dir,
+                jobs=args.jobs,
+                render_workers=args.render_workers,
+                settle_time=args.settle_time,
+                plugin_manager=self.plugin_manager,
+            )
             messages.header("Starting local development server. Awaiting build.")
             server.run()
 
     def setup_parser(self, parser: argparse.ArgumentParser) -> None:
-        return
+        add_build_arguments(parser)
+        parser.add_argument(
+            "--settle-time",
+            type=float,
+            default=DEFAULT_SETTLE_TIME,
+            help="The amount of seconds without file changes before the website is rebuilt.",
+        )
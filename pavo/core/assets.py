@@ -0,0 +1,111 @@
+import os
+import json
+from typing import Optional
+
+from pavo.utils import files
+from pavo.core.manifest import BuildManifest
+from pavo.core.output import BuildOutput
+
+# The file that maps the original paths of fingerprinted assets to their fingerprinted paths.
+ASSET_MANIFEST = "asset-manifest.json"
+
+# The amount of characters of the content hash that is added to the file names of fingerprinted assets.
+_FINGERPRINT_LENGTH = 10
+
+
+class AssetManifest:
+    """Maps the original paths of the assets in a build to the paths they are written to.
+
+    When fingerprinting is enabled, assets are written under names that contain a hash of their content, like
+    `styles/main.3f9a1c04e2.css`. These names change whenever the content changes, so they can be cached forever.
+
+    Args:
+        enabled (bool): Whether assets are written under fingerprinted names.
+        previous (dict): The fingerprinted paths of the previous build, by original path.
+
+    Attributes:
+        enabled (bool): Whether assets are written under fingerprinted names.
+        assets (dict): The fingerprinted paths of the current build, by original path.
+        previous (dict): The fingerprinted paths of the previous build, by original path.
+    """
+
+    def __init__(
+        self, enabled: bool = False, previous: Optional[dict[str, str]] = None
+    ) -> None:
+        self.enabled: bool = enabled
+        self.assets: dict[str, str] = {}
+        self.previous: dict[str, str] = previous or {}
+
+    def path(self, rel_path: str, digest: str) -> tuple[str, Optional[str]]:
+        """Finds the path to write an asset to.
+
+        Args:
+            rel_path (str): The original path of the asset, relative to the build directory.
+            digest (str): The hash of the content of the asset.
+
+        Returns:
+            tuple: The path to write the asset to, and the path of an older version of the asset in the current
+                build that it replaces, if any.
+        """
+        if not self.enabled:
+            return rel_path, None
+
+        stem, extension = os.path.splitext(rel_path)
+        fingerprinted = f"{stem}.{digest[:_FINGERPRINT_LENGTH]}{extension}"
+        replaced = self.assets.get(rel_path)
+        self.assets[rel_path] = fingerprinted
+        return fingerprinted, replaced if replaced != fingerprinted else None
+
+    def resolve(self, rel_path: str) -> str:
+        """Resolves the original path of an asset to its URL. Installed as the `asset` template global.
+
+        The URL keeps the prefix of the path, so root-absolute paths like `/styles/main.css` resolve to URLs that work
+        from pages in any directory.
+
+        Args:
+            rel_path (str): The original path of the asset, like `/styles/main.css`.
+
+        Returns:
+            str: The URL of the asset, like `/styles/main.3f9a1c04e2.css` when fingerprinting is enabled.
+        """
+        path = rel_path.removeprefix("./").lstrip("/")
+        prefix = rel_path[: len(rel_path) - len(path)]
+        return f"{prefix}{self.assets.get(path, path)}"
+
+    def to_json(self) -> bytes:
+        """Serializes the fingerprinted paths of the current build, for the asset manifest file."""
+        return json.dumps(self.assets, indent=2, sort_keys=True).encode("utf-8")
+
+    def write(self, manifest: BuildManifest, output: BuildOutput) -> None:
+        """Writes the asset manifest file to the build, when fingerprinting is enabled and the file is outdated.
+
+        Args:
+            manifest (BuildManifest): The manifest of the build, to record the asset manifest file in.
+            output (BuildOutput): The output the build writes to.
+        """
+        if not self.enabled:
+            return
+
+        content = self.to_json()
+        digest = files.hash_content(content)
+        inputs = {"assets": digest}
+        if not manifest.is_fresh(ASSET_MANIFEST, inputs, output):
+            output.write(ASSET_MANIFEST, content)
+            manifest.record(ASSET_MANIFEST, inputs, digest)
+
+    @staticmethod
+    def parse(content: Optional[bytes]) -> dict[str, str]:
+        """Parses an asset manifest file.
+
+        Args:
+            content (bytes): The contents of the file, or `None` if there is no file.
+
+        Returns:
+            dict: The fingerprinted paths by original path, empty when the file is missing or invalid.
+        """
+        try:
+            assets = json.loads(content) if content is not None else {}
+        except ValueError:
+            return {}
+
+        return assets if isinstance(assets, dict) else {}
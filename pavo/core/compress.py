@@ -0,0 +1,207 @@
+import os
+import gzip
+from concurrent.futures import Executor
+from typing import Optional
+
+from pavo.utils import cache, files
+from pavo.core.manifest import BuildManifest
+from pavo.core.output import BuildOutput
+
+# Brotli is an optional dependency, only gzip variants are written without it.
+try:
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore[assignment]
+
+# Bump this whenever the compression settings change, so variants compressed by older versions are not reused.
+_COMPRESSION_FORMAT = 1
+
+# The file extension of the precompressed variants, by encoding.
+EXTENSIONS = {"gzip": ".gz", "brotli": ".br"}
+
+# The outputs that are worth compressing, by file extension.
+_COMPRESSIBLE_EXTENSIONS = {
+    ".html",
+    ".htm",
+    ".css",
+    ".js",
+    ".mjs",
+    ".svg",
+    ".xml",
+    ".json",
+    ".map",
+}
+
+
+def is_available(encoding: str) -> bool:
+    """Checks whether an encoding can be used, brotli requires the Brotli package to be installed.
+
+    Args:
+        encoding (str): The encoding, `gzip` or `brotli`.
+    """
+    return encoding == "gzip" or (encoding == "brotli" and brotli is not None)
+
+
+def can_compress(rel_path: str) -> bool:
+    """Checks whether an output is worth compressing, based on its file name.
+
+    Args:
+        rel_path (str): The path of the output, relative to the build directory.
+    """
+    return os.path.splitext(rel_path)[1].lower() in _COMPRESSIBLE_EXTENSIONS
+
+
+def find_stale_variants(
+    manifest: BuildManifest, output: BuildOutput, encodings: list[str], min_size: int
+) -> dict[tuple[str, str], dict[str, str]]:
+    """Finds the compressed variants of the outputs of the current build that are missing or outdated.
+
+    Args:
+        manifest (BuildManifest): The manifest of the build, which knows the outputs and their variants.
+        output (BuildOutput): The output the build writes to.
+        encodings (list): The encodings to write variants in. Encodings that are not available are skipped.
+        min_size (int): The size in bytes below which outputs are not compressed.
+
+    Returns:
+        dict: The inputs of every variant to compress, by the path of its output and its encoding.
+    """
+    stale: dict[tuple[str, str], dict[str, str]] = {}
+    for rel_path in manifest.produced():
+        digest = manifest.output_hash(rel_path)
+        if digest is None or not can_compress(rel_path):
+            continue
+
+        for encoding in filter(is_available, encodings):
+            inputs = {"source": digest, "compression": f"{encoding}:{min_size}"}
+            if not manifest.is_fresh(
+                f"{rel_path}{EXTENSIONS[encoding]}", inputs, output
+            ):
+                stale[(rel_path, encoding)] = inputs
+
+    return stale
+
+
+def write_variants(
+    compressed: dict[tuple[str, str], Optional[bytes]],
+    inputs: dict[tuple[str, str], dict[str, str]],
+    manifest: BuildManifest,
+    output: BuildOutput,
+) -> None:
+    """Writes compressed variants next to their outputs, and removes the ones that are not worth keeping.
+
+    Args:
+        compressed (dict): The compressed content of every variant, by the path of its output and its encoding.
+        inputs (dict): The inputs of every variant, by the path of its output and its encoding.
+        manifest (BuildManifest): The manifest of the build, to record the variants in.
+        output (BuildOutput): The output the build writes to.
+    """
+    for (rel_path, encoding), content in compressed.items():
+        variant = f"{rel_path}{EXTENSIONS[encoding]}"
+        if content is None:
+            # Too small, or compressing does not make it smaller
+            manifest.forget(variant, output)
+            continue
+
+        output.write(variant, content)
+        manifest.record(
+            variant, inputs[(rel_path, encoding)], files.hash_content(content)
+        )
+
+
+def compress_outputs(
+    outputs: dict[tuple[str, str], str],
+    output: BuildOutput,
+    compress_cache: cache.DiskCache,
+    min_size: int,
+    executor: Optional[Executor] = None,
+) -> dict[tuple[str, str], Optional[bytes]]:
+    """Compresses outputs of a build, reusing the compressed variants of outputs with the same content.
+
+    Args:
+        outputs (dict): The content hash of every output to compress, by the path of the output and the encoding.
+        output (BuildOutput): The output the build was written to.
+        compress_cache (DiskCache): The cache of compressed variants.
+        min_size (int): The size in bytes below which outputs are not compressed.
+        executor (Executor): The executor to compress the outputs with. Defaults to compressing them one by one.
+
+    Returns:
+        dict: The compressed variant of every output, or `None` when the output is too small or does not get smaller.
+    """
+    compressed, to_compress = _cached_variants(
+        outputs, output, compress_cache, min_size
+    )
+    worth_compressing = [
+        key for key, source in to_compress.items() if len(source) >= min_size
+    ]
+    arguments = (
+        [to_compress[key] for key in worth_compressing],
+        [encoding for _, encoding in worth_compressing],
+    )
+    results = (
+        map(compress_content, *arguments)
+        if executor is None or len(worth_compressing) < 2
+        else executor.map(compress_content, *arguments, chunksize=8)
+    )
+    variants = dict(zip(worth_compressing, results))
+    for key, source in to_compress.items():
+        content = variants.get(key, b"")
+        compressed[key] = content if 0 < len(content) < len(source) else None
+
+        # Outputs that are not worth compressing are cached as empty variants
+        compress_cache.set(
+            _cache_key(outputs[key], key[1], min_size), compressed[key] or b""
+        )
+
+    return compressed
+
+
+def compress_content(content: bytes, encoding: str) -> bytes:
+    """Compresses content at the maximum compression level of an encoding.
+
+    This is a module-level function, so it can be run in the worker processes of a process pool.
+
+    Args:
+        content (bytes): The content to compress.
+        encoding (str): The encoding, `gzip` or `brotli`.
+
+    Returns:
+        bytes: The compressed content. Gzip variants have no timestamp, so the same content compresses the same.
+    """
+    if encoding == "brotli":
+        return bytes(brotli.compress(content, quality=11))
+
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _cache_key(digest: str, encoding: str, min_size: int) -> str:
+    return cache.DiskCache.key(
+        digest, encoding, str(min_size), str(_COMPRESSION_FORMAT)
+    )
+
+
+def _cached_variants(
+    outputs: dict[tuple[str, str], str],
+    output: BuildOutput,
+    compress_cache: cache.DiskCache,
+    min_size: int,
+) -> tuple[dict[tuple[str, str], Optional[bytes]], dict[tuple[str, str], bytes]]:
+    """Finds the compressed variants of outputs in the cache, and reads the outputs that are not cached yet.
+
+    Returns:
+        tuple: The cached variants, and the content of the outputs that are not cached, by path and encoding.
+    """
+    cached: dict[tuple[str, str], Optional[bytes]] = {}
+    sources: dict[tuple[str, str], bytes] = {}
+    contents: dict[str, bytes] = {}
+    for (rel_path, encoding), digest in outputs.items():
+        content = compress_cache.get(_cache_key(digest, encoding, min_size))
+        if content is not None:
+            cached[(rel_path, encoding)] = content or None
+            continue
+
+        # Outputs are read once, even when they are compressed with multiple encodings
+        if rel_path not in contents:
+            contents[rel_path] = output.read(rel_path) or b""
+        sources[(rel_path, encoding)] = contents[rel_path]
+
+    return cached, sources
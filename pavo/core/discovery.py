@@ -0,0 +1,207 @@
+import json
+from typing import Any, Callable, Iterator, Optional, Union
+
+from pavo.utils import config, files
+from pavo.core import sources
+from pavo.core.sources import MarkdownSource
+from pavo.ddl.build import Page, Post
+from pavo.ddl.hooks import Hook
+
+
+class Discovery:
+    """The pages and posts of a project, which are kept between builds so a rebuild only loads the changed sources.
+
+    Pages and posts are found with their frontmatter. Their content is only loaded when they are rendered.
+
+    Args:
+        load (Callable): Loads the markdown sources in a directory by their file names, in the same order.
+        cache_directory (str): The directory of the markdown cache, which the content of pages and posts is taken from.
+
+    Attributes:
+        found (dict): The pages and posts that were found, by the path to their source.
+        source_hashes (dict): The hash of the source of every page and post, by URL.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[str, list[str]], list[MarkdownSource]],
+        cache_directory: str,
+    ) -> None:
+        self.load: Callable[[str, list[str]], list[MarkdownSource]] = load
+        self.cache_directory: str = cache_directory
+        self.found: dict[str, Union[Page, Post]] = {}
+        self.source_hashes: dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Forgets the pages and posts that were found, so all of their sources are loaded again."""
+        self.found = {}
+        self.source_hashes = {}
+
+    def find_pages(
+        self, changed: Optional[set[str]] = None, post_parse: tuple[Hook, ...] = ()
+    ) -> tuple[list[Union[Page, Post]], list[Union[Page, Post]]]:
+        """Finds all pages that should be built.
+
+        Args:
+            changed (set): The paths of the page sources that changed. When given, only these sources are loaded
+                again and the previously found pages are reused. Defaults to loading all pages.
+            post_parse (tuple): The hooks that transform the pages once they are found.
+
+        Returns:
+            tuple: The pages, in the order of their source file names, and the pages whose source is gone.
+        """
+        names = sources.find_sources("_pages/")
+        for name, source in self._load("_pages/", names, changed):
+            slug_title = name.split(".")[0]
+            slug = f"/{slug_title}.html"
+            page = Page(
+                content=None,
+                loader=self._content_loader(f"_pages/{name}", slug),
+                metadata=source.metadata,
+                title=source.metadata.get("title", slug_title),
+                slug=slug,
+            )
+            self._add(f"_pages/{name}", page, source.hash, post_parse)
+
+        return self._collect("_pages/", names)
+
+    def find_posts(
+        self, changed: Optional[set[str]] = None, post_parse: tuple[Hook, ...] = ()
+    ) -> tuple[list[Union[Page, Post]], list[Union[Page, Post]]]:
+        """Finds all posts that should be built, which are the posts of which the publication date has passed.
+
+        Args:
+            changed (set): The paths of the post sources that changed. When given, only these sources are loaded
+                again and the previously found posts are reused. Defaults to loading all posts.
+            post_parse (tuple): The hooks that transform the posts once they are found.
+
+        Returns:
+            tuple: The posts, newest first, and the posts whose source is gone.
+        """
+        dates = sources.find_posts("_posts/")
+        for name, source in self._load("_posts/", list(dates), changed):
+            slug_title = name.split(".")[0]
+            slug = f"/posts/{slug_title}.html"
+            post = Post(
+                content=None,
+                loader=self._content_loader(f"_posts/{name}", slug),
+                metadata=source.metadata,
+                title=source.metadata.get("title", slug_title),
+                slug=slug,
+                date=dates[name].strftime("%B %d, %Y"),
+            )
+            self._add(f"_posts/{name}", post, source.hash, post_parse)
+
+        posts, removed = self._collect("_posts/", list(dates))
+        posts.sort(key=lambda x: x.title[:10])
+        posts.reverse()
+        return posts, removed
+
+    def source_hash(self, render_object: Union[Page, Post]) -> str:
+        """Retrieves the hash of the source file of a page or post.
+
+        Args:
+            render_object (Union[Page, Post]): The page or post to retrieve the hash for.
+
+        Returns:
+            str: The hash of the source file, or of the object itself when it was not discovered from a file.
+        """
+        digest = self.source_hashes.get(render_object.slug)
+        if digest is None:
+            digest = files.hash_content(
+                json.dumps(
+                    [render_object.content, render_object.metadata],
+                    sort_keys=True,
+                    default=str,
+                )
+            )
+
+        return digest
+
+    def index_hash(self, site: dict[str, Any]) -> str:
+        """Creates a hash over all pages and posts, for outputs that list the pages or posts of the website.
+
+        Args:
+            site (dict): The site, with its pages and posts.
+
+        Returns:
+            str: The hash, which changes whenever a page or post is added, removed or changed.
+        """
+        return files.hash_content(
+            "\n".join(
+                f"{key}:{item.slug}:{self.source_hash(item)}"
+                for key in ("pages", "posts")
+                for item in site[key]
+            )
+        )
+
+    def release(self) -> None:
+        """Releases the loaded content of all pages and posts, which the next build loads again."""
+        for render_object in self.found.values():
+            render_object.release()
+
+    def _load(
+        self, directory: str, names: list[str], changed: Optional[set[str]]
+    ) -> Iterator[tuple[str, MarkdownSource]]:
+        """Loads the sources that changed, or all sources when it is not known which ones changed."""
+        to_load = [
+            name for name in names if changed is None or f"{directory}{name}" in changed
+        ]
+        return zip(to_load, self.load(directory, to_load))
+
+    def _add(
+        self,
+        path: str,
+        render_object: Union[Page, Post],
+        digest: str,
+        post_parse: tuple[Hook, ...],
+    ) -> None:
+        """Adds a page or post that was found, after the hooks transformed it."""
+        self.source_hashes[render_object.slug] = digest
+        for hook in post_parse:
+            render_object = hook(render_object) or render_object
+        self.found[path] = render_object
+
+    def _collect(
+        self, directory: str, names: list[str]
+    ) -> tuple[list[Union[Page, Post]], list[Union[Page, Post]]]:
+        """Collects the pages or posts found in a directory, and forgets the ones whose source is gone.
+
+        Args:
+            directory (str): The directory that contains the sources.
+            names (list): The file names of the sources that are part of the website.
+
+        Returns:
+            tuple: The pages or posts in the same order as the names, and the ones whose source is gone.
+        """
+        paths = {f"{directory}{name}" for name in names}
+        removed = []
+        for path in [path for path in self.found if path.startswith(directory)]:
+            if path not in paths:
+                render_object = self.found.pop(path)
+                self.source_hashes.pop(render_object.slug, None)
+                removed.append(render_object)
+
+        return [self.found[f"{directory}{name}"] for name in names], removed
+
+    def _content_loader(self, path: str, slug: str) -> Callable[[], str]:
+        """Creates the loader of the content of a page or post, which converts its body when it is rendered.
+
+        Args:
+            path (str): The path to the markdown source.
+            slug (str): The URL of the page or post.
+
+        Returns:
+            Callable: The loader, which reuses the conversion of the body from the markdown cache.
+        """
+        extras = config.get_config_value("build.markdown.extras")
+
+        def load() -> str:
+            content, digest = sources.load_markdown_content(
+                path, extras, self.cache_directory
+            )
+            # The source can change after it was discovered, so the output is recorded with the source it shows
+            self.source_hashes[slug] = digest
+            return content
+
+        return load
@@ -0,0 +1,183 @@
+import os
+import json
+import shutil
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional, Any
+
+from pavo.utils import files
+from pavo.core import messages
+from pavo.core.state import StateFile
+
+# Bump this whenever the structure of the dispatch state changes, so older states are discarded instead of misread.
+_STATE_FORMAT = 1
+
+
+@dataclass
+class BuildDiff:
+    """The differences between a new build and the output directory.
+
+    Attributes:
+        added: The files that are new in the build.
+        changed: The files whose content differs from the file in the output directory.
+        removed: The files in the output directory that are no longer part of the build.
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+class Dispatcher:
+    """Brings the output directory up-to-date with a build, by comparing the content hashes of their files.
+
+    The hashes of the files in the output directory are persisted, and only computed again for files whose size or
+    modification time changed since the previous dispatch.
+
+    Args:
+        source (str): The directory that contains the build.
+        target (str): The output directory.
+        state_path (str): The file to persist the hashes of the output directory to.
+        known_hash (Callable): Retrieves the hash of a file in the build, if it is known already. Unknown files are
+            hashed from disk.
+
+    Attributes:
+        source (str): The directory that contains the build.
+        target (str): The output directory.
+        state_path (str): The file to persist the hashes of the output directory to.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        state_path: Optional[str] = None,
+        known_hash: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
+        self.source: str = source
+        self.target: str = target
+        self.state_path: Optional[str] = state_path
+        self._known_hash: Callable[[str], Optional[str]] = known_hash or (
+            lambda rel_path: None
+        )
+        self._state: dict[str, list[Any]] = self._state_file().load().get("files", {})
+
+    def diff(self) -> BuildDiff:
+        """Compares the build with the output directory.
+
+        Returns:
+            BuildDiff: The files that were added, changed or removed, in sorted order.
+        """
+        build_files = _walk(self.source)
+        target_files = set(_walk(self.target))
+        diff = BuildDiff(removed=sorted(target_files - set(build_files)))
+        for rel_path in sorted(build_files):
+            if rel_path not in target_files:
+                diff.added.append(rel_path)
+            elif self._build_hash(rel_path) != self._target_hash(rel_path):
+                diff.changed.append(rel_path)
+
+        return diff
+
+    def apply(self, diff: BuildDiff) -> None:
+        """Writes the added and changed files to the output directory and deletes the removed files.
+
+        Files are replaced one by one, so every file in the output directory is always either the old or the new
+        version. Unchanged files are not touched at all.
+
+        Args:
+            diff (BuildDiff): The differences to apply.
+        """
+        for rel_path in (*diff.added, *diff.changed):
+            target = os.path.join(self.target, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(self.source, rel_path), f"{target}.pavotmp")
+            os.replace(f"{target}.pavotmp", target)
+            self._remember(rel_path, self._build_hash(rel_path))
+
+        for rel_path in diff.removed:
+            try:
+                os.remove(os.path.join(self.target, rel_path))
+            except FileNotFoundError:
+                pass
+            self._state.pop(rel_path, None)
+
+        _remove_empty_directories(self.target)
+        self._state_file().save({"files": self._state})
+
+    def dispatch(self, atomic: bool = False) -> BuildDiff:
+        """Dispatches the build to the output directory.
+
+        Args:
+            atomic (bool): Replace the output directory as a whole, instead of only writing the changes.
+
+        Returns:
+            BuildDiff: The changes between the build and the output directory.
+        """
+        diff = self.diff()
+        if atomic:
+            self.swap()
+        else:
+            self.apply(diff)
+        return diff
+
+    def swap(self) -> None:
+        """Replaces the output directory as a whole with a copy of the build."""
+        files.force_create_empty_directory(".pavobuild")
+        messages.info("Done initializing an empty build directory.")
+        shutil.copytree(self.source, ".pavobuild/", dirs_exist_ok=True)
+        messages.info("Dispatched build to build directory.")
+        shutil.rmtree(self.target, ignore_errors=True)
+        os.rename(".pavobuild/", self.target)
+
+        self._state = {}
+        for rel_path in _walk(self.target):
+            self._remember(rel_path, self._build_hash(rel_path))
+        self._state_file().save({"files": self._state})
+
+    def _build_hash(self, rel_path: str) -> str:
+        digest = self._known_hash(rel_path)
+        return digest or files.hash_file(os.path.join(self.source, rel_path))
+
+    def _target_hash(self, rel_path: str) -> str:
+        self._state[rel_path] = files.hash_file_signature(
+            os.path.join(self.target, rel_path), self._state.get(rel_path)
+        )
+        return str(self._state[rel_path][2])
+
+    def _state_file(self) -> StateFile:
+        return StateFile(self.state_path, _STATE_FORMAT, "dispatch state")
+
+    def _remember(self, rel_path: str, digest: str) -> None:
+        stat = os.stat(os.path.join(self.target, rel_path))
+        self._state[rel_path] = [stat.st_mtime_ns, stat.st_size, digest]
+
+
+def write_changes(diff: BuildDiff, path: str) -> None:
+    """Writes the differences of a dispatch to a JSON file, for tools that synchronise the output directory.
+
+    Args:
+        diff (BuildDiff): The differences that were dispatched.
+        path (str): The file to write the differences to.
+    """
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(asdict(diff), file, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def _walk(directory: str) -> list[str]:
+    """Lists all files in a directory and its subdirectories, relative to the directory and separated by '/'."""
+    found = []
+    for root, _, names in os.walk(directory):
+        rel_root = os.path.relpath(root, directory)
+        for name in names:
+            rel_path = name if rel_root == "." else f"{rel_root}/{name}"
+            found.append(rel_path.replace(os.sep, "/"))
+
+    return found
+
+
+def _remove_empty_directories(directory: str) -> None:
+    """Removes the subdirectories of a directory that do not contain any files anymore."""
+    for root, _, _ in os.walk(directory, topdown=False):
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
@@ -1,4 +1,6 @@
-from typing import Optional
+from typing import Optional, Union
+
+from pavo.ddl.build import Page, Post
 
 
 # Base Pavo Exception
@@ -23,3 +25,14 @@ class InvalidExecutionDirectoryError(PavoException):
 
 class MessageTypeAlreadyExists(PavoException):
     """The message type you are trying to register, already exists."""
+
+
+class RenderError(PavoException):
+    """One or more pages could not be rendered. Please see the logs."""
+
+    def __init__(self, errors: list[tuple[Union[Page, Post], BaseException]]):
+        self.errors: list[tuple[Union[Page, Post], BaseException]] = errors
+        super().__init__(
+            f"Failed to render {len(errors)} page(s): "
+            + ", ".join(render_object.slug for render_object, _ in errors)
+        )
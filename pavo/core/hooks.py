@@ -1,3 +1,5 @@
+from typing import Any
+
 from pavo.ddl.hooks import HookManagerInterface, HookTypes, Hook, Invoker
 from pavo.core.exceptions import FunctionAlreadyRegisteredException
 
@@ -29,15 +31,51 @@ class HookManager(HookManagerInterface):
         # Finally, update the hook mapping with the newly registered hooks
         registered_hooks[hook.type.name].append(hook)
         self.hooks[hook.invoker.unique_name] = registered_hooks
+        self._dispatch_table[(hook.invoker.unique_name, hook.type)] = tuple(
+            registered_hooks[hook.type.name]
+        )
 
         return True
 
-    def execute(self, type_: HookTypes, invoker: Invoker) -> None:
+    def hooks_for(self, type_: HookTypes, invoker: Invoker) -> tuple[Hook, ...]:
+        """Looks up the hooks that belong to a certain Invoker, to execute them many times with a single lookup.
+
+        Args:
+            type_ (HookTypes): The type of hooks.
+            invoker (Invoker): The method that invokes the hooks.
+
+        Returns:
+            tuple: The hooks in the order they were registered. Empty when there are none.
+        """
+        return self._dispatch_table.get((invoker.unique_name, type_), ())
+
+    def execute(
+        self, type_: HookTypes, invoker: Invoker, *args: Any, **kwargs: Any
+    ) -> None:
         """Executes the hooks that belong to a certain Invoker.
 
         Args:
             type_ (HookTypes): The type of hooks that should be executed.
             invoker (Invoker): The method that invoked the hooks.
+            *args: The arguments to execute the hooks with.
+            **kwargs: The keyword arguments to execute the hooks with.
+        """
+        for hook in self._dispatch_table.get((invoker.unique_name, type_), ()):
+            hook(*args, **kwargs)
+
+    def signature(self) -> str:
+        """Describes the registered hooks, so builds can tell when the hooks that transform their outputs changed.
+
+        Returns:
+            str: The types and functions of all registered hooks, by invoker.
         """
-        for hook in self.hooks.get(invoker.unique_name, {}).get(type_.name, []):
-            hook()
+        return ";".join(
+            f"{name}:{type_.name}:"
+            + ",".join(
+                f"{hook.func.__module__}.{hook.func.__qualname__}" for hook in hooks
+            )
+            for (name, type_), hooks in sorted(
+                self._dispatch_table.items(),
+                key=lambda item: (item[0][0], item[0][1].name),
+            )
+        )
@@ -0,0 +1,251 @@
+import io
+import os
+import json
+import itertools
+from concurrent.futures import Executor
+from dataclasses import dataclass, asdict
+from typing import Any, Optional, Iterator
+
+from pavo.utils import cache, files
+from pavo.core import messages
+from pavo.ddl.build import ImageReference
+
+# Pillow is an optional dependency, images are copied as they are without it.
+try:
+    from PIL import Image, ImageOps, __version__ as PILLOW_VERSION
+except ImportError:
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+    PILLOW_VERSION = ""
+
+# The image formats that can be optimized, by the file extension of the source.
+_OPTIMIZABLE_EXTENSIONS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG"}
+
+
+@dataclass
+class EncodedImage:
+    """A variant of a source image that was encoded by the optimization stage, and stored in the image cache.
+
+    Attributes:
+        name: The file name of the variant, like `photo-480w.webp`.
+        width: The width of the variant in pixels.
+        height: The height of the variant in pixels.
+        format: The format of the variant, like `jpeg`, `png` or `webp`.
+        key: The key of the encoded variant in the image cache.
+    """
+
+    name: str
+    width: int
+    height: int
+    format: str
+    key: str
+
+
+def is_available() -> bool:
+    """Checks whether images can be optimized, which requires Pillow to be installed."""
+    return Image is not None
+
+
+def can_optimize(name: str) -> bool:
+    """Checks whether an image can be optimized, based on its file name.
+
+    Args:
+        name (str): The file name of the image.
+    """
+    return os.path.splitext(name)[1].lower() in _OPTIMIZABLE_EXTENSIONS
+
+
+def hash_references(references: dict[str, ImageReference]) -> str:
+    """Hashes the references to the images in the build, which change when an image or one of its variants moves.
+
+    Args:
+        references (dict): The references to the images, by image name.
+
+    Returns:
+        str: The hash of the references.
+    """
+    return files.hash_content(
+        json.dumps(
+            {
+                image: [reference, reference.srcset, reference.webp_srcset]
+                for image, reference in references.items()
+            },
+            sort_keys=True,
+        )
+    )
+
+
+def cached_variants(
+    image_cache: cache.DiskCache, digest: str, settings: dict[str, Any]
+) -> Optional[list[EncodedImage]]:
+    """Retrieves the variants of an image that were encoded before, with the same source and settings.
+
+    Args:
+        image_cache (DiskCache): The image cache.
+        digest (str): The hash of the source image.
+        settings (dict): The optimization settings.
+
+    Returns:
+        list: The variants of the image, or `None` if the image was not optimized with these settings before.
+    """
+    index = image_cache.get(_index_key(digest, settings))
+    if index is None:
+        return None
+
+    return [EncodedImage(**variant) for variant in json.loads(index)]
+
+
+def encode_images(
+    paths: dict[str, str],
+    digests: dict[str, str],
+    settings: dict[str, Any],
+    image_cache: cache.DiskCache,
+    executor: Optional[Executor] = None,
+) -> dict[str, list[EncodedImage]]:
+    """Finds the encoded variants of images in the image cache, and encodes the images that are not cached yet.
+
+    Args:
+        paths (dict): The paths to the source images, by the file name of the optimized image.
+        digests (dict): The hashes of the source images, by file name.
+        settings (dict): The optimization settings.
+        image_cache (DiskCache): The image cache.
+        executor (Executor): The executor to encode the images with. Defaults to encoding them one by one.
+
+    Returns:
+        dict: The encoded variants of every image, by file name.
+    """
+    variants: dict[str, list[EncodedImage]] = {}
+    to_encode = []
+    for name in paths:
+        cached = cached_variants(image_cache, digests[name], settings)
+        if cached is None:
+            to_encode.append(name)
+        else:
+            variants[name] = cached
+
+    arguments = (
+        [paths[name] for name in to_encode],
+        to_encode,
+        [digests[name] for name in to_encode],
+        itertools.repeat(settings),
+        itertools.repeat(image_cache.directory),
+    )
+    encoded = (
+        map(optimize_image, *arguments)
+        if executor is None or len(to_encode) < 2
+        else executor.map(optimize_image, *arguments)
+    )
+    for name, image_variants in zip(to_encode, encoded):
+        messages.info(f"Optimized {name} into {len(image_variants)} variant(s).")
+        variants[name] = image_variants
+
+    return variants
+
+
+def optimize_image(  # pylint: disable=too-many-locals
+    path: str, name: str, digest: str, settings: dict[str, Any], cache_directory: str
+) -> list[EncodedImage]:
+    """Recompresses an image without metadata, and encodes resized and WebP variants of it into the image cache.
+
+    This is a module-level function, so it can be run in the worker processes of a process pool.
+
+    Args:
+        path (str): The path to the source image.
+        name (str): The file name of the optimized image.
+        digest (str): The hash of the source image.
+        settings (dict): The optimization settings, with the `widths`, `quality` and `webp` keys.
+        cache_directory (str): The directory of the image cache.
+
+    Returns:
+        list: The encoded variants, starting with the optimized image at its original size.
+    """
+    image_cache = cache.DiskCache(cache_directory)
+    stem, extension = os.path.splitext(name)
+    encodings = [(_OPTIMIZABLE_EXTENSIONS[extension.lower()], extension)]
+    if settings["webp"]:
+        encodings.append(("WEBP", ".webp"))
+
+    with open(path, "rb") as file:
+        source = file.read()
+
+    variants = []
+    for image, suffix in _resize(source, settings["widths"]):
+        for encoding, variant_extension in encodings:
+            content = _encode(image, encoding, settings["quality"])
+            if (
+                suffix == ""
+                and encoding == encodings[0][0]
+                and len(content) >= len(source)
+            ):
+                # Never make an image larger than the original
+                content = source
+
+            variant = EncodedImage(
+                name=f"{stem}{suffix}{variant_extension}",
+                width=image.width,
+                height=image.height,
+                format=encoding.lower(),
+                key=cache.DiskCache.key(
+                    digest, _settings_key(settings), name, suffix, encoding
+                ),
+            )
+            image_cache.set(variant.key, content)
+            variants.append(variant)
+
+    image_cache.set(
+        _index_key(digest, settings),
+        json.dumps([asdict(variant) for variant in variants]).encode("utf-8"),
+    )
+    return variants
+
+
+def _resize(source: bytes, widths: list[int]) -> Iterator[tuple[Any, str]]:
+    """Decodes an image and resizes it to all widths that are smaller than the image itself.
+
+    Args:
+        source (bytes): The encoded source image.
+        widths (list): The widths to resize to, in pixels.
+
+    Returns:
+        Iterator: The image at its original size and every smaller width, with the file name suffix for the size.
+    """
+    with Image.open(io.BytesIO(source)) as original:
+        # Apply the orientation from the metadata before the metadata is left out
+        image = ImageOps.exif_transpose(original)
+
+    yield image, ""
+    for width in sorted({width for width in widths if 0 < width < image.width}):
+        height = max(1, round(image.height * width / image.width))
+        yield image.resize((width, height), Image.Resampling.LANCZOS), f"-{width}w"
+
+
+def _encode(image: Any, encoding: str, quality: int) -> bytes:
+    """Encodes an image without any of the metadata of the source.
+
+    Args:
+        image (Image): The image to encode.
+        encoding (str): The Pillow format to encode to.
+        quality (int): The quality of lossy encodings, from 1 to 100.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    buffer = io.BytesIO()
+    if encoding == "JPEG":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif encoding == "PNG":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.save(buffer, encoding, quality=quality, method=6)
+
+    return buffer.getvalue()
+
+
+def _settings_key(settings: dict[str, Any]) -> str:
+    return json.dumps(settings, sort_keys=True) + PILLOW_VERSION
+
+
+def _index_key(digest: str, settings: dict[str, Any]) -> str:
+    return cache.DiskCache.key(digest, _settings_key(settings), "index")
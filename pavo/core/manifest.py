@@ -0,0 +1,183 @@
+import os
+import threading
+from typing import Optional, Any
+
+from pavo.utils import files
+from pavo.core import messages
+from pavo.core.output import BuildOutput
+from pavo.core.state import StateFile
+
+# Bump this whenever the structure of the manifest changes, so older manifests are discarded instead of misread.
+_MANIFEST_FORMAT = 1
+
+
+class BuildManifest:
+    """Records, for every output file of a build, the hashes of the inputs it was produced from.
+
+    A build consults the manifest before producing an output. When the inputs of an output did not change since the
+    previous build and the output still exists, the output can be kept as is instead of being produced again.
+
+    Args:
+        path (str): The file to persist the manifest to. When `None`, the manifest only lives in memory.
+
+    Attributes:
+        path (str): The file to persist the manifest to, or `None` when the manifest only lives in memory.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path: Optional[str] = path
+        self._sources: dict[str, list[Any]] = {}
+        self._outputs: dict[str, dict[str, Any]] = {}
+        self._produced: set[str] = set()
+        self._changed: set[str] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Loads the manifest from disk. A missing, corrupt or outdated manifest results in an empty manifest."""
+        manifest = self._state_file().load()
+        self._sources = manifest.get("sources", {})
+        self._outputs = manifest.get("outputs", {})
+
+    def save(self) -> None:
+        """Writes the manifest to disk, replacing the previous manifest atomically."""
+        self._state_file().save({"sources": self._sources, "outputs": self._outputs})
+
+    def _state_file(self) -> StateFile:
+        return StateFile(self.path, _MANIFEST_FORMAT, "build manifest", versioned=True)
+
+    def begin(self) -> None:
+        """Starts a new build, forgetting which outputs were produced and changed by the previous one."""
+        self._produced = set()
+        self._changed = set()
+
+    def hash_source(self, path: str) -> str:
+        """Hashes a source file, reusing the previous hash when the size and modification time did not change.
+
+        Args:
+            path (str): The path to the source file.
+
+        Returns:
+            str: The digest of the file contents.
+        """
+        self._sources[path] = files.hash_file_signature(path, self._sources.get(path))
+        return str(self._sources[path][2])
+
+    def remember_source(
+        self, path: str, signature: tuple[int, int], digest: str
+    ) -> None:
+        """Remembers the hash of a source file that was hashed elsewhere, for example in a worker process.
+
+        Args:
+            path (str): The path to the source file.
+            signature (tuple): The modification time (in nanoseconds) and size of the file when it was hashed.
+            digest (str): The digest of the file contents.
+        """
+        self._sources[path] = [signature[0], signature[1], digest]
+
+    def is_fresh(
+        self, output: str, inputs: dict[str, str], build_output: BuildOutput
+    ) -> bool:
+        """Checks whether an output is up-to-date, and registers it as part of the current build.
+
+        Args:
+            output (str): The path of the output file, relative to the build directory.
+            inputs (dict): The hashes of the inputs the output would be produced from.
+            build_output (BuildOutput): The output the build writes to.
+
+        Returns:
+            bool: Whether the output was produced from exactly these inputs and still exists.
+        """
+        with self._lock:
+            self._produced.add(output)
+            entry = self._outputs.get(output)
+
+        return (
+            entry is not None
+            and entry["inputs"] == inputs
+            and build_output.exists(output)
+        )
+
+    def record(self, output: str, inputs: dict[str, str], digest: str) -> None:
+        """Records the inputs and the resulting content hash of an output that was produced in the current build.
+
+        Args:
+            output (str): The path of the output file, relative to the build directory.
+            inputs (dict): The hashes of the inputs the output was produced from.
+            digest (str): The hash of the produced output.
+        """
+        with self._lock:
+            self._produced.add(output)
+            if self._outputs.get(output) != {"inputs": inputs, "hash": digest}:
+                self._changed.add(output)
+            self._outputs[output] = {"inputs": inputs, "hash": digest}
+
+    def output_hash(self, output: str) -> Optional[str]:
+        """Retrieves the recorded content hash of an output.
+
+        Args:
+            output (str): The path of the output file, relative to the build directory.
+
+        Returns:
+            str: The recorded hash, or `None` if the output is unknown.
+        """
+        entry = self._outputs.get(output)
+        return None if entry is None else str(entry["hash"])
+
+    def produced(self) -> list[str]:
+        """Lists the outputs that are part of the current build so far.
+
+        Returns:
+            list: The sorted paths of the outputs, relative to the build directory.
+        """
+        with self._lock:
+            return sorted(self._produced)
+
+    def changed(self) -> list[str]:
+        """Lists the outputs whose content or inputs changed in the current build so far, and the removed outputs.
+
+        Outputs of the previous build that were not produced by the current build so far count as removed.
+
+        Returns:
+            list: The sorted paths of the outputs, relative to the build directory.
+        """
+        with self._lock:
+            return sorted(self._changed | (self._outputs.keys() - self._produced))
+
+    def forget(self, output: str, build_output: BuildOutput) -> None:
+        """Removes an output from the build directory, because the source it was produced from is gone.
+
+        Args:
+            output (str): The path of the output file, relative to the build directory.
+            build_output (BuildOutput): The output the build writes to.
+        """
+        with self._lock:
+            self._produced.discard(output)
+            self._changed.add(output)
+            known = self._outputs.pop(output, None)
+
+        if build_output.remove(output) and known is not None:
+            messages.info(f"Removed {output}, it is no longer part of the website.")
+
+    def finish(self, build_output: BuildOutput) -> list[str]:
+        """Finishes the current build by removing outputs that were not produced anymore, and saves the manifest.
+
+        Args:
+            build_output (BuildOutput): The output the build writes to.
+
+        Returns:
+            list: The outputs that were removed from the build directory.
+        """
+        stale = sorted(set(self._outputs) - self._produced)
+        for output in stale:
+            del self._outputs[output]
+            build_output.remove(output)
+            messages.info(f"Removed {output}, it is no longer part of the website.")
+
+        # Forget about sources that have been deleted, so the manifest does not grow forever.
+        self._sources = {
+            path: known for path, known in self._sources.items() if os.path.exists(path)
+        }
+
+        self.save()
+        return stale
@@ -0,0 +1,211 @@
+import re
+from html.parser import HTMLParser
+from typing import Optional, Iterable, Iterator
+
+# The elements of which the content is left exactly as it is.
+_PRESERVED_ELEMENTS = {"pre", "textarea", "script", "style"}
+
+# The elements around which whitespace is never rendered, so it can be removed.
+_BLOCK_ELEMENTS = {
+    *("html", "head", "body", "title", "meta", "link", "base", "script", "style"),
+    *("div", "p", "ul", "ol", "li", "dl", "dt", "dd", "hr", "br", "blockquote"),
+    *("table", "caption", "colgroup", "col", "thead", "tbody", "tfoot", "tr"),
+    *("td", "th", "section", "article", "aside", "header", "footer", "nav", "main"),
+    *("h1", "h2", "h3", "h4", "h5", "h6", "form", "fieldset", "legend", "figure"),
+    *("figcaption", "address", "details", "summary", "option", "optgroup"),
+    *("noscript", "template", "!doctype"),
+}
+
+# The end tags that can be left out when they are directly followed by one of these start tags.
+_OPTIONAL_END_TAGS = {
+    "li": {"li"},
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "p": {
+        *("address", "article", "aside", "blockquote", "details", "div", "dl"),
+        *("fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3"),
+        *("h4", "h5", "h6", "header", "hgroup", "hr", "main", "menu", "nav", "ol"),
+        *("p", "pre", "section", "table", "ul"),
+    },
+    "option": {"option", "optgroup"},
+    "tr": {"tr"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "thead": {"tbody", "tfoot"},
+    "tbody": {"tbody", "tfoot"},
+}
+
+# The optional end tags that can also be left out when they are directly followed by the end tag of their parent.
+_OMITTED_BEFORE_PARENT_END = {"li", "dd", "option", "tr", "td", "th", "tbody"}
+
+_WHITESPACE = re.compile(r"[ \t\n\r\f]+")
+
+
+class HTMLMinifier(HTMLParser):
+    """Minifies HTML by collapsing whitespace and leaving out comments and optional end tags.
+
+    The content of `<pre>`, `<textarea>`, `<script>` and `<style>` elements, and all tags themselves including their
+    attributes, are kept exactly as they are. HTML can be fed in chunks, and the minified HTML is returned as soon as
+    it is known.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self._output: list[str] = []
+        self._text: list[str] = []
+        self._pending_end: Optional[str] = None
+        self._preserved: list[str] = []
+        self._after_block: bool = True
+
+    def minify(self, chunk: str) -> str:
+        """Feeds a chunk of HTML to the minifier.
+
+        Args:
+            chunk (str): The next part of the HTML.
+
+        Returns:
+            str: The part of the minified HTML that is complete.
+        """
+        self.feed(chunk)
+        return self._take()
+
+    def finish(self) -> str:
+        """Finishes minifying, after all HTML has been fed.
+
+        Returns:
+            str: The rest of the minified HTML.
+        """
+        self.close()
+        self._resolve_pending(omitted=False)
+        self._flush(block=True)
+        return self._take()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        self._tag(tag, self.get_starttag_text() or f"<{tag}>", start=True)
+        if tag in _PRESERVED_ELEMENTS:
+            self._preserved.append(tag)
+
+    def handle_startendtag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+        self._tag(tag, self.get_starttag_text() or f"<{tag}/>", start=True)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._preserved and self._preserved[-1] == tag:
+            self._preserved.pop()
+            self._output.append(f"</{tag}>")
+            self._after_block = tag in _BLOCK_ELEMENTS
+            return
+
+        self._tag(tag, f"</{tag}>", start=False)
+
+    def handle_data(self, data: str) -> None:
+        self._append_text(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self._append_text(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self._append_text(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        if self._preserved or data.startswith("[if") or data.startswith("<![endif]"):
+            # Conditional comments are kept, because they are not really comments to older browsers
+            self._append_text(f"<!--{data}-->", raw=True)
+
+    def handle_decl(self, decl: str) -> None:
+        self._tag("!doctype", f"<!{decl}>", start=True)
+
+    def handle_pi(self, data: str) -> None:
+        self._append_text(f"<?{data}>", raw=True)
+
+    def unknown_decl(self, data: str) -> None:
+        self._append_text(f"<![{data}]>", raw=True)
+
+    def _append_text(self, text: str, raw: bool = False) -> None:
+        if self._preserved:
+            self._output.append(text)
+        elif raw:
+            self._resolve_pending(omitted=False)
+            self._flush(block=False)
+            self._output.append(text)
+        else:
+            self._text.append(text)
+
+    def _tag(self, tag: str, text: str, start: bool) -> None:
+        """Writes a tag, after the text before it, and leaves out the end tag before it when that is allowed."""
+        if self._preserved:
+            self._output.append(text)
+            return
+
+        if self._pending_end is not None:
+            self._resolve_pending(
+                omitted=not "".join(self._text).strip()
+                and (
+                    tag in _OPTIONAL_END_TAGS[self._pending_end]
+                    if start
+                    else self._pending_end in _OMITTED_BEFORE_PARENT_END
+                )
+            )
+
+        self._flush(block=tag in _BLOCK_ELEMENTS)
+        if not start and tag in _OPTIONAL_END_TAGS:
+            # Whether the end tag can be left out depends on what follows it
+            self._pending_end = tag
+        else:
+            self._output.append(text)
+            self._after_block = tag in _BLOCK_ELEMENTS
+
+    def _resolve_pending(self, omitted: bool) -> None:
+        """Writes or leaves out the optional end tag that was held back, before the text that follows it."""
+        pending, self._pending_end = self._pending_end, None
+        if pending is not None and not omitted:
+            self._output.append(f"</{pending}>")
+            self._after_block = pending in _BLOCK_ELEMENTS
+
+    def _flush(self, block: bool) -> None:
+        """Writes the collected text with collapsed whitespace, which is trimmed next to block elements."""
+        text = _WHITESPACE.sub(" ", "".join(self._text))
+        self._text = []
+        if self._after_block:
+            text = text.lstrip(" ")
+        if block:
+            text = text.rstrip(" ")
+        if text:
+            self._output.append(text)
+            self._after_block = False
+
+    def _take(self) -> str:
+        output = "".join(self._output)
+        self._output = []
+        return output
+
+
+def minify_html(html: str) -> str:
+    """Minifies an HTML document.
+
+    Args:
+        html (str): The HTML to minify.
+
+    Returns:
+        str: The minified HTML.
+    """
+    return "".join(minify_chunks([html]))
+
+
+def minify_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    """Minifies an HTML document that is produced in parts, like a template that is rendered in chunks.
+
+    Args:
+        chunks (Iterable): The parts of the HTML, in order.
+
+    Returns:
+        Iterator: The parts of the minified HTML, as soon as they are complete.
+    """
+    minifier = HTMLMinifier()
+    for chunk in chunks:
+        minified = minifier.minify(chunk)
+        if minified:
+            yield minified
+
+    yield minifier.finish()
@@ -0,0 +1,163 @@
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional, Iterable
+
+# The amount of bytes that is buffered in memory while an output file is written in parts.
+_BUFFER_SIZE = 64 * 1024
+
+
+class BuildOutput(ABC):
+    """The place a build writes its output files to. Paths are relative to the root of the website, using '/'."""
+
+    @abstractmethod
+    def write(self, rel_path: str, content: bytes) -> None:
+        """Writes an output file, replacing any previous version.
+
+        Args:
+            rel_path (str): The path of the output file.
+            content (bytes): The contents of the file.
+        """
+
+    @abstractmethod
+    def write_stream(self, rel_path: str, chunks: Iterable[bytes]) -> None:
+        """Writes an output file from content that is produced in parts, replacing any previous version.
+
+        Args:
+            rel_path (str): The path of the output file.
+            chunks (Iterable): The parts of the contents of the file, in order.
+        """
+
+    @abstractmethod
+    def copy(self, path: str, rel_path: str) -> None:
+        """Copies a project file to the output.
+
+        Args:
+            path (str): The path to the file to copy.
+            rel_path (str): The path of the output file.
+        """
+
+    @abstractmethod
+    def read(self, rel_path: str) -> Optional[bytes]:
+        """Reads an output file.
+
+        Args:
+            rel_path (str): The path of the output file.
+
+        Returns:
+            bytes: The contents of the file, or `None` if the file does not exist.
+        """
+
+    @abstractmethod
+    def exists(self, rel_path: str) -> bool:
+        """Checks whether an output file exists.
+
+        Args:
+            rel_path (str): The path of the output file.
+        """
+
+    @abstractmethod
+    def remove(self, rel_path: str) -> bool:
+        """Removes an output file.
+
+        Args:
+            rel_path (str): The path of the output file.
+
+        Returns:
+            bool: Whether the file existed.
+        """
+
+
+class DiskOutput(BuildOutput):
+    """Writes the output of a build to a directory.
+
+    Args:
+        root (str): The directory to write the output to.
+
+    Attributes:
+        root (str): The directory to write the output to.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root: str = root
+
+    def write(self, rel_path: str, content: bytes) -> None:
+        path = self._path(rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+
+    def write_stream(self, rel_path: str, chunks: Iterable[bytes]) -> None:
+        path = self._path(rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # The parts are written to a temporary file first, so a failure halfway does not leave a partial output behind
+        try:
+            with open(f"{path}.tmp", "wb", buffering=_BUFFER_SIZE) as file:
+                for chunk in chunks:
+                    file.write(chunk)
+        except BaseException:
+            os.remove(f"{path}.tmp")
+            raise
+
+        os.replace(f"{path}.tmp", path)
+
+    def copy(self, path: str, rel_path: str) -> None:
+        target = self._path(rel_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy(path, target)
+
+    def read(self, rel_path: str) -> Optional[bytes]:
+        try:
+            with open(self._path(rel_path), "rb") as file:
+                return file.read()
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def exists(self, rel_path: str) -> bool:
+        return os.path.isfile(self._path(rel_path))
+
+    def remove(self, rel_path: str) -> bool:
+        try:
+            os.remove(self._path(rel_path))
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _path(self, rel_path: str) -> str:
+        return os.path.join(self.root, rel_path)
+
+
+class MemoryOutput(BuildOutput):
+    """Keeps the output of a build in memory, for example to serve it from the development server.
+
+    Attributes:
+        files (dict): The contents of the output files, by path.
+    """
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def write(self, rel_path: str, content: bytes) -> None:
+        with self._lock:
+            self.files[rel_path] = content
+
+    def write_stream(self, rel_path: str, chunks: Iterable[bytes]) -> None:
+        self.write(rel_path, b"".join(chunks))
+
+    def copy(self, path: str, rel_path: str) -> None:
+        with open(path, "rb") as file:
+            self.write(rel_path, file.read())
+
+    def read(self, rel_path: str) -> Optional[bytes]:
+        return self.files.get(rel_path)
+
+    def exists(self, rel_path: str) -> bool:
+        return rel_path in self.files
+
+    def remove(self, rel_path: str) -> bool:
+        with self._lock:
+            return self.files.pop(rel_path, None) is not None
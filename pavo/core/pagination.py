@@ -0,0 +1,89 @@
+import os
+import dataclasses
+import math
+from typing import Any, Optional
+
+from pavo.core import messages
+from pavo.ddl.build import Page, Paginator
+
+
+def page_size(page: Page) -> Optional[int]:
+    """Finds the amount of posts per page that a page lists, which it sets with `paginate` in its frontmatter.
+
+    Args:
+        page (Page): The page to find the page size of.
+
+    Returns:
+        int: The amount of posts per page, or `None` when the page is not paginated or sets an invalid page size.
+    """
+    per_page = page.metadata.get("paginate")
+    if per_page is None:
+        return None
+
+    if not isinstance(per_page, int) or isinstance(per_page, bool) or per_page < 1:
+        messages.warning(
+            f"Ignored pagination of {page.slug}. Expected a positive number of posts per page."
+        )
+        return None
+
+    return per_page
+
+
+def paginate(page: Page, posts: tuple[Any, ...], per_page: int) -> list[Page]:
+    """Splits a page that lists the posts of the website into a page per slice of posts.
+
+    The first slice of posts is rendered to the page itself, the next ones to `page/2.html`, `page/3.html` and so on,
+    next to the page or in a directory named after it. Every page gets a `paginator` with its slice of posts and links
+    to its neighbours.
+
+    Args:
+        page (Page): The page to paginate.
+        posts (tuple): The posts of the website.
+        per_page (int): The amount of posts per page.
+
+    Returns:
+        list: Copies of the page, one for every slice of posts, in order.
+    """
+    urls = pagination_urls(page.slug, max(1, math.ceil(len(posts) / per_page)))
+    return [
+        _with_paginator(
+            page,
+            url,
+            Paginator(
+                items=posts[(number - 1) * per_page : number * per_page],
+                page=number,
+                pages=len(urls),
+                total=len(posts),
+                per_page=per_page,
+                previous_url=urls[number - 2] if number > 1 else None,
+                next_url=urls[number] if number < len(urls) else None,
+            ),
+        )
+        for number, url in enumerate(urls, start=1)
+    ]
+
+
+def pagination_urls(slug: str, pages: int) -> list[str]:
+    """Creates the URLs of the pages of a paginated page.
+
+    Args:
+        slug (str): The URL of the paginated page, which is the URL of its first page.
+        pages (int): The amount of pages.
+
+    Returns:
+        list: The URL of every page. The pages after the first are in `/page/`, or in `/<name>/page/` for pages other
+            than the index.
+    """
+    directory, name = slug.rsplit("/", 1)
+    if name != "index.html":
+        directory = f"{directory}/{os.path.splitext(name)[0]}"
+
+    return [
+        slug,
+        *(f"{directory}/page/{number}.html" for number in range(2, pages + 1)),
+    ]
+
+
+def _with_paginator(page: Page, slug: str, paginator: Paginator) -> Page:
+    """Copies a page, to render one of the pages of a paginated listing with."""
+    return dataclasses.replace(page, slug=slug, paginator=paginator)
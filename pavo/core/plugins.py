@@ -1,5 +1,422 @@
-from pavo.ddl.plugins import PluginManagerInterface
+import os
+import ast
+import sys
+import types
+import threading
+import importlib
+import importlib.util
+import importlib.metadata
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Optional
+
+from pavo.ddl.commands import CommandInterface
+from pavo.ddl.hooks import HookTypes, Hook, Invoker
+from pavo.ddl.plugins import (
+    PluginManagerInterface,
+    Plugin,
+    PluginCommand,
+    PluginHook,
+)
+from pavo.core import messages
+from pavo.core.hooks import HookManager
+from pavo.core.state import StateFile
+from pavo.utils import files
+
+# The directory of a project that contains its own plugins.
+PLUGIN_DIRECTORY = "_plugins"
+
+# The entry point group that installed packages register their plugins in.
+ENTRY_POINT_GROUP = "pavo.plugins"
+
+# The name of the dictionary in a plugin module that declares what the plugin provides.
+DECLARATION = "PAVO_PLUGIN"
+
+# The package that the plugins of a project are imported into, so they do not clash with installed modules.
+PROJECT_PACKAGE = "pavo_project_plugins"
+
+# Bump this whenever the structure of the manifest changes, so older manifests are discarded instead of misread.
+_MANIFEST_FORMAT = 1
+
+
+class PluginFunction:
+    """A function of a plugin, that imports the plugin the first time it is called.
+
+    Args:
+        manager (PluginManager): The manager that imports the plugin.
+        plugin (Plugin): The plugin that provides the function.
+        name (str): The name of the function in the plugin module.
+    """
+
+    def __init__(self, manager: "PluginManager", plugin: Plugin, name: str) -> None:
+        self._manager: "PluginManager" = manager
+        self._plugin: Plugin = plugin
+        self._function: Optional[Callable] = None
+        self.__name__: str = name
+        self.__module__: str = plugin.module
+
+        # Include the hash of the plugin source, so builds can tell when the plugin changed
+        self.__qualname__: str = f"{name}[{plugin.hash[:12]}]"
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"PluginFunction({self.__module__}.{self.__name__})"
+
+    @property
+    def jinja_pass_arg(self) -> Any:
+        """Whether Jinja should pass the context or environment to the function, when it is used as filter."""
+        return getattr(self.resolve(), "jinja_pass_arg", None)
+
+    def resolve(self) -> Callable:
+        """Imports the plugin, if it was not imported yet.
+
+        Returns:
+            Callable: The actual function of the plugin.
+        """
+        if self._function is None:
+            self._function = getattr(self._manager.load(self._plugin), self.__name__)
+
+        return self._function
+
+
+@dataclass(kw_only=True)
+class PluginCommandProxy(CommandInterface):
+    """A command of a plugin, that imports the plugin once the command is set up or run.
+
+    Attributes:
+        factory: Imports the plugin and creates the actual command.
+    """
+
+    factory: Callable[[], CommandInterface]
+    _command: Optional[CommandInterface] = field(default=None, init=False, repr=False)
+
+    def run(self, args: Any) -> None:
+        self.resolve().run(args)
+
+    def setup_parser(self, parser: Any) -> None:
+        self.resolve().setup_parser(parser)
+
+    def resolve(self) -> CommandInterface:
+        """Imports the plugin and creates the command, if that was not done yet.
+
+        Returns:
+            CommandInterface: The actual command of the plugin.
+        """
+        if self._command is None:
+            self._command = self.factory()
+
+        return self._command
 
 
 class PluginManager(PluginManagerInterface):
-    """Placeholder for a future PluginManager"""
+    """Discovers plugins in the `_plugins/` directory of a project and in installed packages.
+
+    Plugins declare what they provide in a `PAVO_PLUGIN` dictionary at the top level of their module, which is read
+    without importing the plugin:
+    >>> PAVO_PLUGIN = {
+    >>>     "name": "sitemap",
+    >>>     "commands": [{"name": "sitemap", "help": "Writes a sitemap.", "class": "Sitemap"}],
+    >>>     "hooks": [{"type": "AFTER", "stage": "dispatch", "function": "write_sitemap"}],
+    >>>     "filters": {"slugify": "slugify"},
+    >>> }
+
+    The declarations are cached in a manifest, and only read again when the source of a plugin changes. Plugins are
+    imported the first time one of their commands is set up or run, or one of their hooks or filters is called.
+
+    Args:
+        directory (str): The directory that contains the plugins of the project.
+        manifest_path (str): The file to cache the declarations of the plugins in. When `None`, nothing is cached.
+        entry_points (bool): Whether to discover the plugins of installed packages as well.
+
+    Attributes:
+        directory (str): The directory that contains the plugins of the project.
+        manifest_path (str): The file to cache the declarations of the plugins in, or `None` when nothing is cached.
+        entry_points (bool): Whether to discover the plugins of installed packages as well.
+    """
+
+    def __init__(
+        self,
+        directory: str = PLUGIN_DIRECTORY,
+        manifest_path: Optional[str] = None,
+        entry_points: bool = True,
+    ) -> None:
+        super().__init__()
+        self.directory: str = directory
+        self.manifest_path: Optional[str] = manifest_path
+        self.entry_points: bool = entry_points
+        self._modules: dict[str, types.ModuleType] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._manifest: StateFile = StateFile(
+            manifest_path, _MANIFEST_FORMAT, "plugin manifest"
+        )
+
+    def discover(self) -> None:
+        """Finds the plugins and reads their declarations, from the manifest when their source did not change."""
+        cached: dict[str, dict[str, Any]] = self._manifest.load().get("plugins", {})
+        entries = {}
+        self._plugins = {}
+        for module, path in self._find_sources():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cached.get(path)
+            if (
+                entry is None
+                or entry.get("module") != module
+                or entry.get("signature") != signature
+            ):
+                entry = _read_declaration(module, path, signature)
+
+            entries[path] = entry
+            if entry["error"] is not None:
+                messages.warning(f"Ignoring plugin at {path}: {entry['error']}")
+                continue
+
+            if entry["plugin"] is None:
+                continue
+
+            plugin = _plugin_from_dict(entry["plugin"])
+            if plugin.name in self._plugins:
+                messages.warning(
+                    f"Ignoring plugin at {path}, a plugin named {plugin.name} was already found."
+                )
+                continue
+
+            self._plugins[plugin.name] = plugin
+
+        if entries != cached:
+            try:
+                self._manifest.save({"plugins": entries})
+            except OSError as err:
+                messages.debug(f"Could not write the plugin manifest: {repr(err)}")
+
+        messages.debug(f"Found {len(self._plugins)} plugin(s).")
+
+    def load(self, plugin: Plugin) -> types.ModuleType:
+        """Imports the module of a plugin, if it was not imported yet.
+
+        Args:
+            plugin (Plugin): The plugin to import.
+
+        Returns:
+            ModuleType: The module of the plugin.
+        """
+        with self._lock:
+            module = self._modules.get(plugin.module)
+            if module is None:
+                if plugin.module.startswith(f"{PROJECT_PACKAGE}."):
+                    self._ensure_project_package()
+
+                messages.debug(f"Importing plugin {plugin.name}.")
+                module = importlib.import_module(plugin.module)
+                self._modules[plugin.module] = module
+
+        return module
+
+    def commands(self) -> list[CommandInterface]:
+        """Creates the commands of all plugins, without importing the plugins.
+
+        Returns:
+            list: The commands, which import their plugin once they are set up or run.
+        """
+        return [
+            PluginCommandProxy(
+                name=command.name,
+                help=command.help,
+                allow_outside_project=command.allow_outside_project,
+                factory=self._command_factory(plugin, command),
+            )
+            for plugin in self._plugins.values()
+            for command in plugin.commands
+        ]
+
+    def hooks(self) -> HookManager:
+        """Registers the hooks of all plugins to a hook manager, without importing the plugins.
+
+        Returns:
+            HookManager: The manager the hooks were registered to.
+        """
+        manager = HookManager()
+        for plugin in self._plugins.values():
+            for hook in plugin.hooks:
+                manager.register(
+                    Hook(
+                        PluginFunction(self, plugin, hook.function),
+                        HookTypes[hook.type],
+                        Invoker.for_stage(hook.stage),
+                    )
+                )
+
+        return manager
+
+    def filters(self) -> dict[str, Callable]:
+        """Creates the Jinja filters of all plugins, without importing the plugins.
+
+        Returns:
+            dict: The filters by name, which import their plugin the first time they are called.
+        """
+        return {
+            name: PluginFunction(self, plugin, function)
+            for plugin in self._plugins.values()
+            for name, function in plugin.filters.items()
+        }
+
+    def _command_factory(
+        self, plugin: Plugin, command: PluginCommand
+    ) -> Callable[[], CommandInterface]:
+        def factory() -> CommandInterface:
+            command_class: Callable[[], CommandInterface] = getattr(
+                self.load(plugin), command.cls
+            )
+            return command_class()
+
+        return factory
+
+    def _find_sources(self) -> list[tuple[str, str]]:
+        """Finds the modules that could contain a plugin, with the path to their source."""
+        sources = []
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                path = os.path.join(self.directory, name)
+                if name.startswith(("_", ".")):
+                    continue
+
+                if name.endswith(".py") and os.path.isfile(path):
+                    sources.append((f"{PROJECT_PACKAGE}.{name[:-3]}", path))
+                elif os.path.isfile(os.path.join(path, "__init__.py")):
+                    sources.append(
+                        (f"{PROJECT_PACKAGE}.{name}", os.path.join(path, "__init__.py"))
+                    )
+
+        if not self.entry_points:
+            return sources
+
+        for entry_point in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP):
+            try:
+                spec = importlib.util.find_spec(entry_point.module)
+            except (ImportError, ValueError) as err:
+                messages.warning(
+                    f"Ignoring plugin {entry_point.name}, its module could not be found."
+                )
+                messages.debug(repr(err))
+                continue
+
+            if spec is not None and spec.origin is not None and spec.has_location:
+                sources.append((entry_point.module, spec.origin))
+
+        return sources
+
+    def _ensure_project_package(self) -> None:
+        """Creates the package that the plugins of the project are imported into."""
+        package = sys.modules.get(PROJECT_PACKAGE)
+        directory = os.path.abspath(self.directory)
+        if package is None:
+            package = types.ModuleType(PROJECT_PACKAGE)
+            package.__path__ = []
+            sys.modules[PROJECT_PACKAGE] = package
+
+        if directory not in package.__path__:
+            package.__path__.append(directory)
+
+
+def _read_declaration(module: str, path: str, signature: list[int]) -> dict[str, Any]:
+    """Reads the declaration of a plugin from its source, without importing it.
+
+    Returns:
+        dict: The manifest entry of the source, with the plugin as dictionary. The plugin is `None` when the source
+            does not declare a plugin, and the error describes why the declaration is invalid, if it is.
+    """
+    entry: dict[str, Any] = {
+        "module": module,
+        "signature": signature,
+        "plugin": None,
+        "error": None,
+    }
+    try:
+        with open(path, "rb") as file:
+            raw = file.read()
+
+        declaration = _find_declaration(ast.parse(raw, path))
+        if declaration is not None:
+            entry["plugin"] = asdict(
+                _parse_declaration(declaration, module, path, files.hash_content(raw))
+            )
+    except (OSError, SyntaxError, ValueError, TypeError, KeyError) as err:
+        entry["error"] = str(err) or repr(err)
+
+    return entry
+
+
+def _find_declaration(tree: ast.Module) -> Optional[Any]:
+    """Evaluates the top level `PAVO_PLUGIN` assignment of a module, which has to be a literal."""
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+
+        if any(
+            isinstance(target, ast.Name) and target.id == DECLARATION
+            for target in targets
+        ):
+            return ast.literal_eval(value)
+
+    return None
+
+
+def _parse_declaration(declaration: Any, module: str, path: str, hash_: str) -> Plugin:
+    """Validates a declaration and converts it to a Plugin."""
+    if not isinstance(declaration, dict):
+        raise ValueError(f"{DECLARATION} should be a dictionary.")
+
+    commands = [
+        PluginCommand(
+            name=str(command["name"]).lower(),
+            help=str(command.get("help", "")),
+            cls=str(command["class"]),
+            allow_outside_project=bool(command.get("allow_outside_project", False)),
+        )
+        for command in declaration.get("commands", [])
+    ]
+    hooks = [
+        PluginHook(
+            type=str(hook["type"]).upper(),
+            stage=str(hook["stage"]),
+            function=str(hook["function"]),
+        )
+        for hook in declaration.get("hooks", [])
+    ]
+    for hook in hooks:
+        if hook.type not in HookTypes.__members__:
+            raise ValueError(f"Unknown hook type {hook.type}.")
+
+    filters = declaration.get("filters", {})
+    if not isinstance(filters, dict):
+        raise ValueError("The filters should be a dictionary of filter names.")
+
+    return Plugin(
+        name=str(declaration.get("name", module.rsplit(".", 1)[-1])),
+        module=module,
+        path=path,
+        hash=hash_,
+        commands=commands,
+        hooks=hooks,
+        filters={str(name): str(function) for name, function in filters.items()},
+    )
+
+
+def _plugin_from_dict(plugin: dict[str, Any]) -> Plugin:
+    """Creates a Plugin from its dictionary in the manifest."""
+    return Plugin(
+        **{
+            **plugin,
+            "commands": [PluginCommand(**command) for command in plugin["commands"]],
+            "hooks": [PluginHook(**hook) for hook in plugin["hooks"]],
+        }
+    )
@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Optional, Iterator, ContextManager, Any
+
+import tabulate
+
+from pavo.core import messages
+
+
+@dataclass
+class StageTiming:
+    """The resources that a stage of a build used.
+
+    Attributes:
+        name: The name of the stage.
+        start: When the stage started, in seconds since the profiler was created.
+        wall: The time the stage took, in seconds.
+        cpu: The CPU time the build process spent in the stage, in seconds. Work done by worker processes is not
+            included.
+        peak_memory: The peak of the memory allocated by Python during the stage, in bytes.
+    """
+
+    name: str
+    start: float
+    wall: float
+    cpu: float
+    peak_memory: int
+
+
+@dataclass
+class FileTiming:
+    """The time it took to process a single file.
+
+    Attributes:
+        kind: What was done with the file, like `markdown` or `render`.
+        name: The path of the file.
+        wall: The time it took, in seconds.
+        start: When processing started, in seconds since the profiler was created. `None` when the file was processed
+            by a worker process.
+        thread: The thread that processed the file, numbered in the order the threads were first seen.
+        template: The template the file was rendered with, when it was rendered.
+    """
+
+    kind: str
+    name: str
+    wall: float
+    start: Optional[float] = None
+    thread: int = 0
+    template: Optional[str] = None
+
+
+class BuildProfiler:
+    """Measures where a build spends its time and memory, per build stage and per file.
+
+    A disabled profiler measures nothing, so the build can always be instrumented without slowing it down.
+
+    Args:
+        enabled (bool): Whether to measure the build.
+
+    Attributes:
+        enabled (bool): Whether to measure the build.
+        stages (list): The resources used by every build stage, in the order the stages ran.
+        files (list): The time it took to process every file.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self.stages: list[StageTiming] = []
+        self.files: list[FileTiming] = []
+        self._origin: float = time.perf_counter()
+        self._threads: dict[int, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._tracing: bool = False
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Measures the wall time, CPU time and peak memory of a build stage. Stages should not be nested.
+
+        Args:
+            name (str): The name of the stage.
+
+        Returns:
+            ContextManager: The context to run the stage in.
+        """
+        return self._measure_stage(name) if self.enabled else nullcontext()
+
+    def file(
+        self, kind: str, name: str, template: Optional[str] = None
+    ) -> ContextManager[None]:
+        """Measures the time it takes to process a single file. Files can be processed concurrently by multiple threads.
+
+        Args:
+            kind (str): What is done with the file, like `markdown` or `render`.
+            name (str): The path of the file.
+            template (str): The template the file is rendered with, when it is rendered.
+
+        Returns:
+            ContextManager: The context to process the file in.
+        """
+        return (
+            self._measure_file(kind, name, template) if self.enabled else nullcontext()
+        )
+
+    def record_file(self, kind: str, name: str, wall: float) -> None:
+        """Records the time it took to process a file elsewhere, for example in a worker process.
+
+        Args:
+            kind (str): What was done with the file, like `markdown`.
+            name (str): The path of the file.
+            wall (float): The time it took, in seconds.
+        """
+        if self.enabled:
+            with self._lock:
+                self.files.append(FileTiming(kind, name, wall))
+
+    def stop(self) -> None:
+        """Stops tracing memory allocations, when the profiler started tracing them."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def print_report(self, top: int = 10) -> None:
+        """Prints the resources used by every stage, and the slowest files and templates.
+
+        Args:
+            top (int): The amount of files and templates to list.
+        """
+        messages.echo(
+            tabulate.tabulate(
+                [
+                    [stage.name, stage.wall, stage.cpu, stage.peak_memory / 1024**2]
+                    for stage in self.stages
+                ],
+                headers=["Stage", "Wall (s)", "CPU (s)", "Peak memory (MB)"],
+                floatfmt=".3f",
+            )
+        )
+
+        for kind in sorted({timing.kind for timing in self.files}):
+            slowest = sorted(
+                (timing for timing in self.files if timing.kind == kind),
+                key=lambda timing: timing.wall,
+                reverse=True,
+            )[:top]
+            messages.echo("")
+            messages.echo(
+                tabulate.tabulate(
+                    [[timing.name, timing.wall * 1000] for timing in slowest],
+                    headers=[f"Slowest {kind}", "Time (ms)"],
+                    floatfmt=".2f",
+                )
+            )
+
+        templates = self._template_totals()
+        if templates:
+            messages.echo("")
+            messages.echo(
+                tabulate.tabulate(
+                    [
+                        [name, count, total * 1000, total * 1000 / count]
+                        for name, (count, total) in sorted(
+                            templates.items(), key=lambda item: item[1][1], reverse=True
+                        )[:top]
+                    ],
+                    headers=["Template", "Renders", "Total (ms)", "Mean (ms)"],
+                    floatfmt=".2f",
+                )
+            )
+
+    def to_json(self) -> dict[str, Any]:
+        """Creates the report of the build, which can be compared between builds.
+
+        Returns:
+            dict: The stages and the files, with the files sorted by kind and path.
+        """
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            "files": [
+                asdict(timing)
+                for timing in sorted(
+                    self.files, key=lambda timing: (timing.kind, timing.name)
+                )
+            ],
+            "templates": {
+                name: {"renders": count, "wall": total}
+                for name, (count, total) in sorted(self._template_totals().items())
+            },
+        }
+
+    def to_trace(self) -> dict[str, Any]:
+        """Creates a trace of the build in the Chrome trace event format, to view in `chrome://tracing` or Perfetto.
+
+        Returns:
+            dict: The trace, with the stages on the first row and the files on a row per thread.
+        """
+        events = [
+            {
+                "name": stage.name,
+                "cat": "stage",
+                "ph": "X",
+                "ts": stage.start * 1e6,
+                "dur": stage.wall * 1e6,
+                "pid": os.getpid(),
+                "tid": 0,
+                "args": {"cpu": stage.cpu, "peak_memory": stage.peak_memory},
+            }
+            for stage in self.stages
+        ]
+        events.extend(
+            {
+                "name": timing.name,
+                "cat": timing.kind,
+                "ph": "X",
+                "ts": timing.start * 1e6,
+                "dur": timing.wall * 1e6,
+                "pid": os.getpid(),
+                "tid": timing.thread,
+                "args": {"template": timing.template},
+            }
+            for timing in self.files
+            if timing.start is not None
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, directory: str) -> tuple[str, str]:
+        """Writes the report and the trace of the build.
+
+        Args:
+            directory (str): The directory to write `report.json` and `trace.json` to.
+
+        Returns:
+            tuple: The paths to the report and the trace.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = (
+            os.path.join(directory, "report.json"),
+            os.path.join(directory, "trace.json"),
+        )
+        for path, content in zip(paths, (self.to_json(), self.to_trace())):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(content, file, indent=2)
+
+        return paths
+
+    @contextmanager
+    def _measure_stage(self, name: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+        tracemalloc.reset_peak()
+        start, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                StageTiming(
+                    name=name,
+                    start=start - self._origin,
+                    wall=time.perf_counter() - start,
+                    cpu=time.process_time() - cpu,
+                    peak_memory=tracemalloc.get_traced_memory()[1],
+                )
+            )
+
+    @contextmanager
+    def _measure_file(
+        self, kind: str, name: str, template: Optional[str]
+    ) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            with self._lock:
+                thread = self._threads.setdefault(
+                    threading.get_ident(), len(self._threads) + 1
+                )
+                self.files.append(
+                    FileTiming(kind, name, wall, start - self._origin, thread, template)
+                )
+
+    def _template_totals(self) -> dict[str, tuple[int, float]]:
+        """Sums the render times of every template, over all files rendered with it."""
+        totals: dict[str, tuple[int, float]] = {}
+        for timing in self.files:
+            if timing.template is not None:
+                count, total = totals.get(timing.template, (0, 0.0))
+                totals[timing.template] = (count + 1, total + timing.wall)
+
+        return totals
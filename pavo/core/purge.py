@@ -0,0 +1,295 @@
+import os
+import re
+import fnmatch
+import functools
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional, Iterator
+
+from pavo.core.output import BuildOutput, DiskOutput
+
+# The amount of characters that is read from an HTML file at once while collecting selectors.
+_CHUNK_SIZE = 64 * 1024
+
+# The amount of HTML files that a worker process collects selectors from per task.
+_BATCH_SIZE = 64
+
+# The at-rules that contain style rules, which are purged on their own. The rules in other at-rules are always kept.
+_CONDITIONAL_RULES = {
+    "media",
+    "supports",
+    "document",
+    "-moz-document",
+    "layer",
+    "container",
+}
+
+# The tags that style rules apply to, even when a document leaves them out.
+_IMPLIED_TAGS = {"html", "head", "body"}
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.DOTALL)
+_AT_RULE_NAME = re.compile(r"@([\w-]+)")
+_IDENTIFIER = r"(?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w-])+"
+_CLASS_OR_ID = re.compile(rf"([.#])({_IDENTIFIER})")
+_TAG = re.compile(rf"(?:^|[\s>+~])({_IDENTIFIER})")
+_ESCAPE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?|\\(.)")
+
+
+@dataclass
+class UsedSelectors:
+    """The tags, classes and ids that are used in the HTML of a website.
+
+    Attributes:
+        tags: The names of the tags, in lowercase.
+        classes: The class names.
+        ids: The ids.
+    """
+
+    tags: set[str] = field(default_factory=set)
+    classes: set[str] = field(default_factory=set)
+    ids: set[str] = field(default_factory=set)
+
+    def update(self, other: "UsedSelectors") -> None:
+        """Adds the tags, classes and ids of other HTML.
+
+        Args:
+            other (UsedSelectors): The tags, classes and ids to add.
+        """
+        self.tags.update(other.tags)
+        self.classes.update(other.classes)
+        self.ids.update(other.ids)
+
+
+class _SelectorParser(HTMLParser):
+    """Collects the tags, classes and ids of the elements in an HTML document, which can be fed in chunks."""
+
+    def __init__(self, used: UsedSelectors) -> None:
+        super().__init__(convert_charrefs=True)
+        self.used: UsedSelectors = used
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        self.used.tags.add(tag)
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == "class":
+                self.used.classes.update(value.split())
+            elif name == "id":
+                self.used.ids.add(value.strip())
+
+
+def collect_selectors(
+    documents: list[str], output: BuildOutput, executor: Optional[Executor] = None
+) -> UsedSelectors:
+    """Collects the tags, classes and ids that are used in the HTML files of a build.
+
+    Files on disk are streamed in chunks, so memory use does not grow with the size of a document. They are spread
+    over the executor in batches.
+
+    Args:
+        documents (list): The paths of the HTML files, relative to the build directory.
+        output (BuildOutput): The output the build was written to.
+        executor (Executor): The executor to parse the files with. Defaults to parsing them one by one.
+
+    Returns:
+        UsedSelectors: The tags, classes and ids of all files together.
+    """
+    used = UsedSelectors(tags=set(_IMPLIED_TAGS))
+    if not isinstance(output, DiskOutput):
+        for document in documents:
+            parser = _SelectorParser(used)
+            parser.feed((output.read(document) or b"").decode("utf-8", "replace"))
+            parser.close()
+        return used
+
+    paths = [os.path.join(output.root, document) for document in documents]
+    batches = [
+        paths[start : start + _BATCH_SIZE]
+        for start in range(0, len(paths), _BATCH_SIZE)
+    ]
+    for collected in (
+        map(collect_files, batches)
+        if executor is None or len(batches) < 2
+        else executor.map(collect_files, batches)
+    ):
+        used.update(collected)
+
+    return used
+
+
+def collect_files(paths: list[str]) -> UsedSelectors:
+    """Collects the tags, classes and ids that are used in HTML files, reading each file in chunks.
+
+    This is a module-level function, so it can be run in the worker processes of a process pool.
+
+    Args:
+        paths (list): The paths to the HTML files.
+
+    Returns:
+        UsedSelectors: The tags, classes and ids of the files together.
+    """
+    used = UsedSelectors()
+    for path in paths:
+        parser = _SelectorParser(used)
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            for chunk in iter(functools.partial(file.read, _CHUNK_SIZE), ""):
+                parser.feed(chunk)
+        parser.close()
+
+    return used
+
+
+def purge_stylesheet(css: str, used: UsedSelectors, safelist: list[str]) -> str:
+    """Removes the style rules of which none of the selectors match the used tags, classes and ids.
+
+    Matching is conservative: a selector is kept when every tag, class and id in it is used somewhere, even when
+    they are used on different elements. Pseudo-classes, attribute selectors and the arguments of functional
+    pseudo-classes like `:not()` are ignored. Rules in at-rules like `@font-face` and `@keyframes` are always kept.
+
+    Args:
+        css (str): The stylesheet.
+        used (UsedSelectors): The tags, classes and ids that are used in the website.
+        safelist (list): Names or patterns (like `is-*`) of tags, classes and ids to keep, even when they are unused.
+
+    Returns:
+        str: The stylesheet without the unmatched rules.
+    """
+
+    def is_used(kind: str, name: str) -> bool:
+        names = {".": used.classes, "#": used.ids, "": used.tags}[kind]
+        return name in names or any(
+            fnmatch.fnmatchcase(name, pattern) for pattern in safelist
+        )
+
+    def matches(selector: str) -> bool:
+        selector = _strip_selector(selector)
+        for kind, name in _CLASS_OR_ID.findall(selector):
+            if not is_used(kind, _unescape(name)):
+                return False
+
+        return all(
+            is_used("", _unescape(tag).lower())
+            for tag in _TAG.findall(_CLASS_OR_ID.sub(" ", selector))
+            if tag != "-"
+        )
+
+    def purge(start: int, end: int) -> str:
+        kept = []
+        for item_start, brace, item_end in _split_rules(css, start, end):
+            prelude = _COMMENTS.sub(
+                "", css[item_start : max(brace, item_start)]
+            ).strip()
+            at_rule = _AT_RULE_NAME.match(prelude)
+            if brace == -1 or (
+                at_rule and at_rule[1].lower() not in _CONDITIONAL_RULES
+            ):
+                kept.append(css[item_start:item_end])
+            elif at_rule:
+                inner = purge(brace + 1, item_end - 1)
+                if _COMMENTS.sub("", inner).strip():
+                    kept.append(f"{css[item_start : brace + 1]}{inner}}}")
+            elif any(matches(selector) for selector in _split_selectors(prelude)):
+                kept.append(css[item_start:item_end])
+
+        return "".join(kept)
+
+    return purge(0, len(css))
+
+
+def _split_rules(css: str, start: int, end: int) -> Iterator[tuple[int, int, int]]:
+    """Splits a block of CSS into its statements and rules, skipping over comments and strings.
+
+    Args:
+        css (str): The stylesheet.
+        start (int): The start of the block.
+        end (int): The end of the block.
+
+    Returns:
+        Iterator: The start, the position of the opening brace (-1 for statements) and the end of every item. Every
+            item starts where the previous one ended, so the whitespace and comments before it are included.
+    """
+    item_start, brace, depth, position = start, -1, 0, start
+    while position < end:
+        char = css[position]
+        if css.startswith("/*", position):
+            close = css.find("*/", position + 2, end)
+            position = end if close == -1 else close + 2
+            continue
+        if char in "\"'":
+            position = _skip_string(css, position, end)
+            continue
+        if char == "\\":
+            position += 2
+            continue
+
+        if char == "{":
+            brace = position if depth == 0 else brace
+            depth += 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield item_start, brace, position + 1
+                item_start, brace = position + 1, -1
+        elif char == ";" and depth == 0:
+            yield item_start, -1, position + 1
+            item_start = position + 1
+        position += 1
+
+    if item_start < end:
+        # Unterminated rules and trailing whitespace or comments are kept as they are
+        yield item_start, -1, end
+
+
+def _skip_string(css: str, position: int, end: int) -> int:
+    """Finds the end of the quoted string that starts at a position."""
+    quote = css[position]
+    position += 1
+    while position < end and css[position] != quote:
+        position += 2 if css[position] == "\\" else 1
+
+    return position + 1
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """Splits a selector list on the commas that are not inside parentheses, brackets or strings."""
+    selectors, depth, start, quote = [], 0, 0, ""
+    for position, char in enumerate(prelude):
+        if quote:
+            quote = "" if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:position])
+            start = position + 1
+
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+def _strip_selector(selector: str) -> str:
+    """Removes the parts of a selector that are not matched against the used tags, classes and ids.
+
+    These are attribute selectors, pseudo-classes, pseudo-elements and the arguments of functional pseudo-classes.
+    """
+    stripped, depth = [], 0
+    for char in selector:
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            stripped.append(char)
+
+    return re.sub(rf"(?<!\\)::?{_IDENTIFIER}", "", "".join(stripped).replace("*", " "))
+
+
+def _unescape(identifier: str) -> str:
+    """Resolves the escapes in a CSS identifier, like `md\\:flex` to `md:flex`."""
+    return _ESCAPE.sub(
+        lambda match: chr(int(match[1], 16)) if match[1] else match[2], identifier
+    )
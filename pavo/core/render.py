@@ -0,0 +1,145 @@
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Iterator, Optional, Union
+
+from jinja2 import Template
+
+from pavo.utils import cache, files
+from pavo.core import messages, minify
+from pavo.core.exceptions import RenderError
+from pavo.core.output import BuildOutput
+from pavo.ddl.build import Page, Post
+from pavo.ddl.hooks import Hook
+
+
+def render_chunks(
+    template: Template,
+    render_object: Union[Page, Post],
+    content: str,
+    post_render: tuple[Hook, ...] = (),
+    minify_html: bool = False,
+) -> Iterator[str]:
+    """Renders a page or post with a template, in parts. Nothing is rendered until the parts are consumed.
+
+    Args:
+        template (Template): The template to render with.
+        render_object (Union[Page, Post]): The page or post to render.
+        content (str): The content of the page or post.
+        post_render (tuple): The hooks that transform the rendered HTML, before it is minified.
+        minify_html (bool): Whether to minify the rendered HTML.
+
+    Returns:
+        Iterator: The parts of the rendered HTML.
+    """
+    chunks: Iterator[str] = template.generate(
+        content=content,
+        page=render_object.metadata,
+        paginator=render_object.paginator,
+    )
+    if post_render:
+        # Hooks receive the page as a whole, so it is only streamed when there are none
+        html = "".join(chunks)
+        for hook in post_render:
+            html = hook(render_object, html) or html
+        chunks = iter((html,))
+    if minify_html:
+        chunks = minify.minify_chunks(chunks)
+
+    yield from chunks
+
+
+def write_chunks(
+    output: BuildOutput,
+    rel_path: str,
+    chunks: Iterator[str],
+    copy: Optional[BinaryIO] = None,
+) -> str:
+    """Writes rendered HTML to the output in parts, so it is never held in memory as a whole.
+
+    Args:
+        output (BuildOutput): The output to write to.
+        rel_path (str): The path to write to, relative to the build directory.
+        chunks (Iterator): The parts of the rendered HTML.
+        copy (BinaryIO): A file to write a copy of the encoded HTML to, like an entry of a cache.
+
+    Returns:
+        str: The hash of the written content.
+    """
+    digest = files.content_hasher()
+
+    def encode() -> Iterator[bytes]:
+        for chunk in codecs.iterencode(chunks, "utf-8"):
+            digest.update(chunk)
+            if copy is not None:
+                copy.write(chunk)
+            yield chunk
+
+    output.write_stream(rel_path, encode())
+    return digest.hexdigest()
+
+
+def write_cached(
+    output: BuildOutput,
+    rel_path: str,
+    chunks: Iterator[str],
+    page_cache: cache.DiskCache,
+    key: str,
+) -> str:
+    """Writes a page from the cache, or renders it and stores it in the cache while it is written to the output.
+
+    Args:
+        output (BuildOutput): The output to write to.
+        rel_path (str): The path to write to, relative to the build directory.
+        chunks (Iterator): The parts of the rendered page, which are only rendered when the page is not cached.
+        page_cache (DiskCache): The pages that were rendered in previous builds.
+        key (str): The key of the page in the cache, which covers everything the page is rendered from.
+
+    Returns:
+        str: The hash of the written content.
+    """
+    cached = page_cache.get(key)
+    if cached is not None:
+        output.write(rel_path, cached)
+        return files.hash_content(cached)
+
+    with page_cache.writer(key) as copy:
+        return write_chunks(output, rel_path, chunks, copy)
+
+
+def render_all(
+    render_objects: list[Union[Page, Post]],
+    render: Callable[[Union[Page, Post]], None],
+    workers: int = 1,
+) -> None:
+    """Renders pages or posts concurrently over a thread pool, when there are workers to spread them over.
+
+    A failing render does not stop the others, the errors are collected and raised together once all renders are done.
+
+    Args:
+        render_objects (list): The pages or posts to render.
+        render (Callable): Renders a single page or post.
+        workers (int): The amount of threads to render with.
+
+    Raises:
+        RenderError: One or more of the pages or posts could not be rendered.
+    """
+    errors: list[tuple[Union[Page, Post], BaseException]] = []
+    if workers > 1 and len(render_objects) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(render, obj) for obj in render_objects]
+            for render_object, future in zip(render_objects, futures):
+                error = future.exception()
+                if error is not None:
+                    errors.append((render_object, error))
+    else:
+        for render_object in render_objects:
+            try:
+                render(render_object)
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append((render_object, err))
+
+    for render_object, error in errors:
+        messages.error(f"Failed to render {render_object.slug}.", error)
+
+    if errors:
+        raise RenderError(errors)
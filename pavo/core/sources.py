@@ -0,0 +1,219 @@
+import os
+import glob
+import time
+import itertools
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+import yaml
+import frontmatter
+
+from pavo.utils import cache, files
+from pavo.core import messages
+
+
+@dataclass
+class MarkdownSource:
+    """A markdown source file of which the frontmatter was read. The body is loaded on its own when it is rendered.
+
+    Attributes:
+        metadata: The frontmatter of the source.
+        hash: The hash of the raw source file.
+        signature: The modification time (in nanoseconds) and size of the source file when it was read.
+        load_time: The time it took to load the source, in seconds.
+    """
+
+    metadata: dict
+    hash: str
+    signature: tuple[int, int]
+    load_time: float = 0.0
+
+
+def find_data(directory: str) -> list[str]:
+    """Lists the data files in a directory.
+
+    Note:
+        This currently checks for both .yaml or .yml files. It is possible that we will move to only supporting
+        .yaml in a future release.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        list: The paths to the data files.
+    """
+    return [*glob.glob(f"{directory}*.yaml"), *glob.glob(f"{directory}*.yml")]
+
+
+def load_data(paths: list[str]) -> dict[str, Any]:
+    """Loads data files, by their file names without extension.
+
+    Args:
+        paths (list): The paths to the data files.
+
+    Returns:
+        dict: The data of every file. The site configuration is left out, since it is loaded on its own.
+    """
+    data = {}
+    for path in paths:
+        key = os.path.basename(path).split(".")[0]
+        if key != "site":
+            with open(path, "r", encoding="utf-8") as file:
+                data[key] = yaml.safe_load(file)
+
+    return data
+
+
+def find_sources(directory: str) -> list[str]:
+    """Lists the markdown sources in a directory.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        list: The sorted file names of the sources.
+    """
+    return [
+        name
+        for name in sorted(os.listdir(directory))
+        if name.endswith(".md") or name.endswith(".markdown")
+    ]
+
+
+def find_posts(directory: str) -> dict[str, datetime]:
+    """Lists the markdown sources of the posts in a directory that are published.
+
+    The publication date of a post is in the first ten characters of its file name, following the format
+    YYYY-MM-DD-<postname>. Posts with an invalid date, or with a date that has not passed yet, are left out.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        dict: The publication date of every published post, by the file name of its source, sorted by file name.
+    """
+    posts: dict[str, datetime] = {}
+    for post in find_sources(directory):
+        try:
+            date = datetime.strptime(post[:10], "%Y-%m-%d")
+            if datetime.now() > date:
+                posts[post] = date
+        except (IndexError, ValueError):
+            messages.warning(
+                f'Skipped indexing post "{post}". Invalid date format. Expected: YYYY-MM-DD.'
+            )
+
+    return posts
+
+
+def load_markdown_sources(
+    paths: list[str],
+    extras: Optional[list[str]] = None,
+    cache_directory: Optional[str] = None,
+    pool: Optional[Executor] = None,
+    chunksize: int = 1,
+) -> list[MarkdownSource]:
+    """Loads markdown sources, spread over a process pool when one is given.
+
+    Args:
+        paths (list): The paths to the markdown files.
+        extras (list): The markdown extras to convert with. When `None`, the configured extras are used.
+        cache_directory (str): The directory of the markdown cache, to convert the bodies into.
+        pool (Executor): The process pool to load the sources with. Defaults to loading them in this process.
+        chunksize (int): The amount of sources that a worker of the pool loads at once.
+
+    Returns:
+        list: The loaded sources, in the same order as the paths.
+    """
+    if pool is None:
+        return [load_markdown_source(path, extras, cache_directory) for path in paths]
+
+    return list(
+        pool.map(
+            load_markdown_source,
+            paths,
+            itertools.repeat(extras),
+            itertools.repeat(cache_directory),
+            chunksize=chunksize,
+        )
+    )
+
+
+def load_markdown_source(
+    path: str,
+    extras: Optional[list[str]] = None,
+    cache_directory: Optional[str] = None,
+) -> MarkdownSource:
+    """Reads a markdown file and parses its frontmatter.
+
+    When a cache directory is given, the body is converted to HTML as well, so `load_markdown_content` finds it in the
+    cache once the source is rendered. The converted body itself is not returned, to keep it out of memory.
+
+    This is a module level function, so that it can be executed by the workers of a process pool.
+
+    Args:
+        path (str): The path to the markdown file.
+        extras (list): The markdown extras to convert with. When `None`, the configured extras are used.
+        cache_directory (str): The directory of the markdown cache, to convert the body into.
+
+    Returns:
+        MarkdownSource: The loaded source.
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        stat = os.fstat(file.fileno())
+        raw = file.read()
+
+    data = frontmatter.loads(_decode(raw))
+    if cache_directory is not None:
+        files.convert_md_to_html(data.content, extras, cache.DiskCache(cache_directory))
+
+    return MarkdownSource(
+        metadata=data.metadata,
+        hash=files.hash_content(raw),
+        signature=(stat.st_mtime_ns, stat.st_size),
+        load_time=time.perf_counter() - start,
+    )
+
+
+def load_markdown_content(
+    path: str,
+    extras: Optional[list[str]] = None,
+    cache_directory: Optional[str] = None,
+) -> tuple[str, str]:
+    """Reads the body of a markdown file and converts it to HTML, without parsing the frontmatter again.
+
+    Args:
+        path (str): The path to the markdown file.
+        extras (list): The markdown extras to convert with. When `None`, the configured extras are used.
+        cache_directory (str): The directory of the markdown cache, to reuse previous conversions from.
+
+    Returns:
+        tuple: The body of the source converted to HTML, and the hash of the raw source file it was read from.
+    """
+    with open(path, "rb") as file:
+        raw = file.read()
+
+    text = _decode(raw).strip()
+
+    # Split the body from the frontmatter the same way frontmatter.loads does
+    handler = frontmatter.detect_format(text, frontmatter.handlers)
+    if handler is not None:
+        try:
+            text = handler.split(text)[1].strip()
+        except ValueError:
+            pass
+
+    content = files.convert_md_to_html(
+        text,
+        extras,
+        None if cache_directory is None else cache.DiskCache(cache_directory),
+    )
+    return content, files.hash_content(raw)
+
+
+def _decode(raw: bytes) -> str:
+    """Decodes a source the same way as reading the file in text mode would, including the translation of newlines."""
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
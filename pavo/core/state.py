@@ -0,0 +1,85 @@
+import os
+import json
+from typing import Optional, Any
+
+from pavo.utils import version
+from pavo.core import messages
+
+
+class StateFile:
+    """A JSON file that persists state between builds, like the build manifest or the template graph.
+
+    Every file records the format of its state, so state written in another format is discarded instead of misread.
+    Files are replaced atomically, so an interrupted build never leaves a partially written file behind.
+
+    Args:
+        path (str): The file to persist the state to. When `None`, nothing is persisted.
+        format_ (int): The format of the state.
+        description (str): What the state is, like `build manifest`. Used in warnings.
+        versioned (bool): Whether state written by another version of Pavo is discarded as well.
+
+    Attributes:
+        path (str): The file to persist the state to, or `None` when nothing is persisted.
+        format (int): The format of the state.
+        description (str): What the state is.
+        versioned (bool): Whether state written by another version of Pavo is discarded as well.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        format_: int,
+        description: str,
+        versioned: bool = False,
+    ) -> None:
+        self.path: Optional[str] = path
+        self.format: int = format_
+        self.description: str = description
+        self.versioned: bool = versioned
+
+    def load(self) -> dict[str, Any]:
+        """Loads the persisted state.
+
+        Returns:
+            dict: The state, without its format. Empty when the file is missing, unreadable or of another format.
+        """
+        if self.path is None or not os.path.isfile(self.path):
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError) as err:
+            messages.warning(f"Ignoring unreadable {self.description} at {self.path}.")
+            messages.debug(repr(err))
+            return {}
+
+        if not isinstance(state, dict) or state.pop("format", None) != self.format:
+            messages.debug(f"Ignoring {self.description} of another format.")
+            return {}
+
+        if self.versioned and state.pop("pavo", None) != str(
+            version.DISTRIBUTION_VERSION
+        ):
+            messages.debug(f"Ignoring {self.description} of another Pavo version.")
+            return {}
+
+        return state
+
+    def save(self, state: dict[str, Any]) -> None:
+        """Persists the state, replacing the previously persisted state atomically.
+
+        Args:
+            state (dict): The state to persist, which has to be serializable to JSON.
+        """
+        if self.path is None:
+            return
+
+        content: dict[str, Any] = {"format": self.format}
+        if self.versioned:
+            content["pavo"] = str(version.DISTRIBUTION_VERSION)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as file:
+            json.dump({**content, **state}, file, separators=(",", ":"))
+        os.replace(f"{self.path}.tmp", self.path)
@@ -0,0 +1,319 @@
+import os
+import re
+import itertools
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+import sass
+
+from pavo.utils import cache, files
+from pavo.core import messages
+
+# The extensions of the stylesheets that can be imported by sass.
+_STYLE_EXTENSIONS = (".scss", ".sass", ".css")
+
+# Matches the @import, @use and @forward rules of a stylesheet, up to the end of the rule or line.
+_IMPORT_RULE = re.compile(r"@(?:import|use|forward)\s+([^;\n]+)")
+
+# Matches the quoted targets of an import rule.
+_QUOTED = re.compile(r"""["']([^"']+)["']""")
+
+# Matches block comments, and line comments that take up a whole line.
+_COMMENTS = re.compile(r"/\*.*?\*/|^\s*//[^\n]*", re.DOTALL | re.MULTILINE)
+
+
+class StyleGraph:
+    """The dependency graph of the stylesheets in a directory, following `@import`, `@use` and `@forward` rules.
+
+    Stylesheets are only parsed again when their hash changes, so the graph can be kept up-to-date cheaply between
+    builds of the development server.
+
+    Args:
+        directory (str): The directory that contains the stylesheets.
+
+    Attributes:
+        directory (str): The directory that contains the stylesheets.
+        hashes (dict): The hash of every stylesheet in the directory, by path.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory: str = directory
+        self.hashes: dict[str, str] = {}
+        self._imports: dict[str, tuple[str, Optional[list[str]]]] = {}
+
+    def refresh(self, hash_source: Callable[[str], str]) -> None:
+        """Updates the graph to the current stylesheets, parsing the ones that changed since the previous refresh.
+
+        Args:
+            hash_source (Callable): Hashes the stylesheet at a path.
+        """
+        self.hashes = {
+            path: hash_source(path) for path in find_stylesheets(self.directory)
+        }
+        for path, digest in self.hashes.items():
+            known = self._imports.get(path)
+            if known is None or known[0] != digest:
+                self._imports[path] = (digest, self._find_imports(path))
+
+        for path in self._imports.keys() - self.hashes.keys():
+            del self._imports[path]
+
+    def dependencies(self, path: str) -> list[str]:
+        """Finds all stylesheets that are used when compiling a stylesheet, including the stylesheet itself.
+
+        Args:
+            path (str): The path to the stylesheet.
+
+        Returns:
+            list: The sorted paths of the stylesheets.
+        """
+        found: set[str] = set()
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            if current in found:
+                continue
+
+            found.add(current)
+            imports = self._imports.get(current, ("", []))[1]
+
+            # Imports that are only known at compile time could be any of the stylesheets.
+            pending.extend(self.hashes if imports is None else imports)
+
+        return sorted(found)
+
+    def input_hash(self, path: str, source_map: bool = False) -> str:
+        """Creates a hash over all stylesheets that are used when compiling a stylesheet, and the compile options.
+
+        Args:
+            path (str): The path to the stylesheet.
+            source_map (bool): Whether a source map is created when compiling.
+
+        Returns:
+            str: The hash, which changes whenever any of the used stylesheets changes, appears or disappears.
+        """
+        return files.hash_content(
+            "\n".join(
+                [
+                    sass.libsass_version,
+                    f"source_map={source_map}",
+                    *(
+                        f"{dependency}:{self.hashes.get(dependency, '')}"
+                        for dependency in self.dependencies(path)
+                    ),
+                ]
+            )
+        )
+
+    def entries(self, source_maps: bool = False) -> dict[str, tuple[str, str, bool]]:
+        """Lists the stylesheets that are compiled to the build, by the path they are written to.
+
+        Args:
+            source_maps (bool): Whether source maps are created for the stylesheets that are compiled from sass.
+
+        Returns:
+            dict: The path to the source, the input hash and whether a source map is created, of every stylesheet.
+        """
+        entries = {}
+        for file in itertools.chain(*find_entries(self.directory)):
+            path = f"{self.directory}/{file}"
+            source_map = source_maps and not file.endswith(".css")
+            entries[f"styles/{os.path.splitext(file)[0]}.css"] = (
+                path,
+                self.input_hash(path, source_map),
+                source_map,
+            )
+        return entries
+
+    def _find_imports(self, path: str) -> Optional[list[str]]:
+        """Finds the stylesheets that a stylesheet imports.
+
+        Args:
+            path (str): The path to the stylesheet.
+
+        Returns:
+            list: The paths of the imported stylesheets, or `None` when an import is only known at compile time.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            source = _COMMENTS.sub("", file.read())
+
+        imports = []
+        for rule in _IMPORT_RULE.findall(source):
+            targets = _QUOTED.findall(rule)
+            if not targets and not path.endswith(".sass"):
+                continue
+
+            # The indented syntax allows imports without quotes
+            for target in targets or [
+                target.strip() for target in rule.split(",") if target.strip()
+            ]:
+                if "#{" in target:
+                    return None
+
+                imports.extend(self._resolve(target, os.path.dirname(path)))
+
+        return imports
+
+    def _resolve(self, target: str, directory: str) -> list[str]:
+        """Finds the stylesheets an import refers to, relative to the importing stylesheet or the style directory.
+
+        Args:
+            target (str): The target of the import, like `base/variables`.
+            directory (str): The directory of the importing stylesheet.
+
+        Returns:
+            list: The paths of the stylesheets the import could refer to. Empty for plain CSS and built-in modules.
+        """
+        if target.startswith(("sass:", "http://", "https://", "//", "url(")):
+            return []
+
+        candidates = []
+        for base in (directory, self.directory):
+            stem, extension = os.path.splitext(os.path.join(base, target))
+            head, name = os.path.split(stem)
+            extensions = (
+                [extension] if extension in _STYLE_EXTENSIONS else _STYLE_EXTENSIONS
+            )
+            for extension_candidate in extensions:
+                candidates.append(os.path.join(head, f"{name}{extension_candidate}"))
+                candidates.append(os.path.join(head, f"_{name}{extension_candidate}"))
+                candidates.append(os.path.join(stem, f"_index{extension_candidate}"))
+                candidates.append(os.path.join(stem, f"index{extension_candidate}"))
+
+        return [
+            os.path.normpath(candidate).replace(os.sep, "/")
+            for candidate in candidates
+            if os.path.normpath(candidate).replace(os.sep, "/") in self.hashes
+        ]
+
+
+def find_entries(directory: str) -> tuple[list[str], list[str]]:
+    """Lists the stylesheets in a directory and its subdirectories that are written to the build.
+
+    Sass partials, whose names start with an underscore, are only compiled as part of the stylesheets that import
+    them, and so are the stylesheets in directories whose names start with an underscore. When a stylesheet exists
+    as both css and sass, the css file overrules the compiled sass.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        tuple: The sorted paths of the sass stylesheets to compile, and of the css stylesheets to copy, relative to
+            the directory and separated by forward slashes.
+    """
+    sass_files: list[str] = []
+    css_files: list[str] = []
+    for root, directories, file_names in os.walk(directory):
+        directories[:] = [name for name in directories if not name.startswith("_")]
+        prefix = os.path.relpath(root, directory).replace(os.sep, "/")
+        prefix = "" if prefix == "." else f"{prefix}/"
+        css_files.extend(
+            f"{prefix}{file}" for file in file_names if file.endswith(".css")
+        )
+        sass_files.extend(
+            f"{prefix}{file}"
+            for file in file_names
+            if file.endswith((".sass", ".scss"))
+            and not file.startswith("_")
+            and f"{os.path.splitext(file)[0]}.css" not in file_names
+        )
+
+    return sorted(sass_files), sorted(css_files)
+
+
+def find_stylesheets(directory: str) -> list[str]:
+    """Lists the stylesheets in a directory and its subdirectories.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        list: The sorted paths of the stylesheets, separated by '/'.
+    """
+    found = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(_STYLE_EXTENSIONS):
+                found.append(
+                    os.path.normpath(os.path.join(root, name)).replace(os.sep, "/")
+                )
+
+    return sorted(found)
+
+
+def compile_stylesheets(
+    stylesheets: dict[str, str],
+    source_maps: bool,
+    style_cache: cache.DiskCache,
+    executor: Optional[Executor] = None,
+) -> dict[str, tuple[bytes, Optional[bytes]]]:
+    """Compiles stylesheets, reusing the compiled CSS of stylesheets whose inputs were compiled before.
+
+    CSS stylesheets are not compiled, their content is read as it is.
+
+    Args:
+        stylesheets (dict): The hashes of the inputs of every stylesheet to compile, by path.
+        source_maps (bool): Whether to create source maps.
+        style_cache (DiskCache): The cache of compiled stylesheets.
+        executor (Executor): The executor to compile the stylesheets with. Defaults to compiling them one by one.
+
+    Returns:
+        dict: The compiled CSS and source map (or `None`) of every stylesheet, by path.
+    """
+    compiled: dict[str, tuple[bytes, Optional[bytes]]] = {}
+    to_compile = []
+    for path, digest in stylesheets.items():
+        css = style_cache.get(digest)
+        source_map = style_cache.get(f"{digest}.map") if source_maps else None
+        if path.endswith(".css") or css is None or (source_maps and source_map is None):
+            to_compile.append(path)
+        else:
+            compiled[path] = (css, source_map)
+
+    arguments = (to_compile, itertools.repeat(source_maps))
+    results = (
+        map(compile_stylesheet, *arguments)
+        if executor is None or len(to_compile) < 2
+        else executor.map(compile_stylesheet, *arguments)
+    )
+    for path, (css, source_map) in zip(to_compile, results):
+        if path.endswith(".css"):
+            compiled[path] = (css, source_map)
+            continue
+
+        messages.info(f"Compiled {path}.")
+        style_cache.set(stylesheets[path], css)
+        if source_map is not None:
+            style_cache.set(f"{stylesheets[path]}.map", source_map)
+        compiled[path] = (css, source_map)
+
+    return compiled
+
+
+def compile_stylesheet(path: str, source_map: bool) -> tuple[bytes, Optional[bytes]]:
+    """Compiles a stylesheet to CSS, or reads a stylesheet that is CSS already.
+
+    This is a module-level function, so it can be run in the worker processes of a process pool.
+
+    Args:
+        path (str): The path to the stylesheet.
+        source_map (bool): Whether to create a source map, which is referenced from the CSS as `<name>.css.map`.
+
+    Returns:
+        tuple: The compiled CSS, and the source map or `None`.
+    """
+    if path.endswith(".css"):
+        with open(path, "rb") as file:
+            return file.read(), None
+
+    if not source_map:
+        return sass.compile(filename=path).encode("utf-8"), None
+
+    name = f"{os.path.splitext(os.path.basename(path))[0]}.css"
+    css, source_map_content = sass.compile(
+        filename=path,
+        output_filename_hint=name,
+        source_map_filename=f"{name}.map",
+        source_map_contents=True,
+    )
+    return css.encode("utf-8"), source_map_content.encode("utf-8")
@@ -0,0 +1,346 @@
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Optional
+
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, meta, nodes
+from jinja2.defaults import DEFAULT_NAMESPACE
+
+from pavo.utils import cache, files
+from pavo.core import messages
+from pavo.core.state import StateFile
+
+# Bump this whenever the analysis changes, so analyses persisted by older versions are discarded.
+_GRAPH_FORMAT = 2
+
+# Keys of the site dictionary that contain the discovered pages and posts. Any other key comes from site.yaml.
+_SITE_INDEX_KEYS = {"pages", "posts"}
+
+# The inputs that outputs depend on when their templates read a variable of the render context, by variable.
+_CONTEXT_INPUTS = {
+    "data": "data",
+    "images": "images",
+    "asset": "assets",
+    "site": "site",
+}
+
+
+@dataclass
+class TemplateInfo:
+    """Describes what a single template depends on.
+
+    Attributes:
+        hash: The hash of the template source.
+        references: The templates that are extended, included or imported by this template.
+        dynamic: Whether the template references other templates by a name that is only known at render time.
+        variables: The context variables the template reads, like `site`, `data` or `images`.
+        site_keys: The keys of the `site` variable the template reads. Contains `*` when this is not known statically.
+    """
+
+    hash: str
+    references: list[str] = field(default_factory=list)
+    dynamic: bool = False
+    variables: list[str] = field(default_factory=list)
+    site_keys: list[str] = field(default_factory=list)
+
+
+class TemplateGraph:
+    """The dependency graph of the templates in a project, following `extends`, `include` and `import` statements.
+
+    The analysis of every template is persisted between builds, so only templates that changed are parsed again.
+
+    Args:
+        environment (Environment): The Jinja environment to parse templates with.
+        directory (str): The directory that contains the project templates.
+        path (str): The file to persist the graph to. When `None`, the graph only lives in memory.
+
+    Attributes:
+        environment (Environment): The Jinja environment to parse templates with.
+        directory (str): The directory that contains the project templates.
+        path (str): The file to persist the graph to, or `None` when the graph only lives in memory.
+        templates (dict): The analysis of every template in the directory, by template name.
+    """
+
+    def __init__(
+        self, environment: Environment, directory: str, path: Optional[str] = None
+    ) -> None:
+        self.environment: Environment = environment
+        self.directory: str = directory
+        self.path: Optional[str] = path
+        self.templates: dict[str, TemplateInfo] = {}
+        self._chains: dict[str, list[str]] = {}
+
+        # Analyse with the default globals only, the globals installed for rendering hide the variables they provide
+        self._analysis_environment: Environment = environment.overlay()
+        self._analysis_environment.globals = dict(DEFAULT_NAMESPACE)
+        self.load()
+
+    def load(self) -> None:
+        """Loads the persisted graph. A missing, corrupt or outdated graph results in an empty graph."""
+        try:
+            self.templates = {
+                name: TemplateInfo(**info)
+                for name, info in self._state_file().load().get("templates", {}).items()
+            }
+        except (TypeError, AttributeError) as err:
+            messages.warning(f"Ignoring unreadable template graph at {self.path}.")
+            messages.debug(repr(err))
+            self.templates = {}
+
+        self._chains = {}
+
+    def save(self) -> None:
+        """Persists the graph, replacing the previously persisted graph atomically."""
+        self._state_file().save(
+            {"templates": {name: asdict(info) for name, info in self.templates.items()}}
+        )
+
+    def _state_file(self) -> StateFile:
+        return StateFile(self.path, _GRAPH_FORMAT, "template graph")
+
+    def refresh(self) -> set[str]:
+        """Analyses the templates in the template directory that changed since they were last analysed.
+
+        Returns:
+            set: The names of the templates that were added, changed or removed.
+        """
+        previous = self.templates
+        self.templates = {}
+        for name in self._template_names():
+            path = os.path.join(self.directory, name)
+            with open(path, "r", encoding="utf-8") as file:
+                source = file.read()
+
+            digest = files.hash_content(source)
+            known = previous.get(name)
+            self.templates[name] = (
+                known
+                if known is not None and known.hash == digest
+                else self._analyse(source, digest)
+            )
+
+        changed = {
+            name
+            for name in {*previous, *self.templates}
+            if previous.get(name) != self.templates.get(name)
+        }
+        if changed:
+            messages.debug(f"Changed templates: {', '.join(sorted(changed))}.")
+            self._chains = {}
+            self.save()
+
+        return changed
+
+    def _template_names(self) -> list[str]:
+        """Lists the templates in the template directory and its subdirectories, by the names the loader uses."""
+        names = []
+        for root, _, file_names in os.walk(self.directory):
+            rel_root = os.path.relpath(root, self.directory)
+            for name in file_names:
+                rel_path = name if rel_root == "." else os.path.join(rel_root, name)
+                names.append(rel_path.replace(os.sep, "/"))
+
+        return sorted(names)
+
+    def dependents(self, names: set[str]) -> set[str]:
+        """Finds the templates whose chain contains any of the given templates.
+
+        Args:
+            names (set): The names of the templates to find the dependents of.
+
+        Returns:
+            set: The names of the templates that use any of the given templates, including the templates themselves.
+        """
+        return {
+            template
+            for template in {*self.templates, *names}
+            if not names.isdisjoint(self.chain(template))
+        }
+
+    def chain(self, name: str) -> list[str]:
+        """Finds all templates that are used when rendering a template, including the template itself.
+
+        Args:
+            name (str): The name of the template.
+
+        Returns:
+            list: The sorted names of the templates in the chain. Unknown templates are included as well.
+        """
+        if name in self._chains:
+            return self._chains[name]
+
+        chain: set[str] = set()
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            if current in chain:
+                continue
+
+            chain.add(current)
+            info = self.templates.get(current)
+            if info is None:
+                continue
+
+            # A template that is referenced dynamically could be any of the templates.
+            pending.extend(self.templates if info.dynamic else info.references)
+
+        self._chains[name] = sorted(chain)
+        return self._chains[name]
+
+    def chain_hash(self, name: str) -> str:
+        """Creates a hash over all templates that are used when rendering a template.
+
+        Args:
+            name (str): The name of the template.
+
+        Returns:
+            str: The hash, which changes whenever any template in the chain changes, appears or disappears.
+        """
+        return files.hash_content(
+            "\n".join(
+                f"{template}:{self.templates[template].hash if template in self.templates else ''}"
+                for template in self.chain(name)
+            )
+        )
+
+    def variables(self, name: str) -> set[str]:
+        """Finds the context variables that are used when rendering a template.
+
+        Args:
+            name (str): The name of the template.
+
+        Returns:
+            set: The variables read by any template in the chain. Reads of `site` are reported per key, like
+                `site.title`, with `site.*` meaning that any key could be read.
+        """
+        variables: set[str] = set()
+        for template in self.chain(name):
+            info = self.templates.get(template)
+            if info is not None:
+                variables.update(info.variables)
+                variables.update(f"site.{key}" for key in info.site_keys)
+
+        return variables
+
+    def uses_site_index(self, name: str) -> bool:
+        """Checks whether rendering a template could read the list of pages or posts.
+
+        Args:
+            name (str): The name of the template.
+
+        Returns:
+            bool: Whether the template depends on the pages and posts of the whole website.
+        """
+        return any(
+            variable in ("site.*", *(f"site.{key}" for key in _SITE_INDEX_KEYS))
+            for variable in self.variables(name)
+        )
+
+    def inputs(self, template_name: str, hashes: dict[str, str]) -> dict[str, str]:
+        """Finds the hashes of the inputs that every output rendered with a template depends on.
+
+        Args:
+            template_name (str): The name of the template, without extension.
+            hashes (dict): The hashes of the `config`, `data`, `images`, `assets`, `site` and `index` inputs.
+
+        Returns:
+            dict: The hashes of the template chain and the parts of the context the templates read.
+        """
+        template_file = f"{template_name}.html"
+        variables = self.variables(template_file)
+        inputs = {
+            "template": template_name,
+            "templates": self.chain_hash(template_file),
+            "config": hashes["config"],
+        }
+
+        # Only depend on the parts of the context that the templates actually read
+        for variable, name in _CONTEXT_INPUTS.items():
+            if variable in variables:
+                inputs[name] = hashes[name]
+        if self.uses_site_index(template_file):
+            inputs["index"] = hashes["index"]
+
+        return inputs
+
+    def _analyse(self, source: str, digest: str) -> TemplateInfo:
+        """Parses a template and finds its references and the variables it uses.
+
+        Args:
+            source (str): The source of the template.
+            digest (str): The hash of the source of the template.
+
+        Returns:
+            TemplateInfo: The analysis of the template.
+        """
+        ast = self._analysis_environment.parse(source)
+        references = list(meta.find_referenced_templates(ast))
+        return TemplateInfo(
+            hash=digest,
+            references=sorted(ref for ref in references if ref is not None),
+            dynamic=None in references,
+            variables=sorted(meta.find_undeclared_variables(ast)),
+            site_keys=sorted(_find_site_keys(ast)),
+        )
+
+
+def _find_site_keys(ast: nodes.Template) -> set[str]:
+    """Finds the keys of the `site` variable that a template reads.
+
+    Args:
+        ast (nodes.Template): The parsed template.
+
+    Returns:
+        set: The keys that are read, like `title` for `site.title` or `site['title']`. When `site` is used in any
+            other way (passed to a macro, looped over, indexed by a variable), `*` is added to the keys.
+    """
+    keys: dict[int, str] = {}
+    for getattr_node in ast.find_all(nodes.Getattr):
+        if _is_site(getattr_node.node):
+            keys[id(getattr_node.node)] = getattr_node.attr
+
+    for getitem_node in ast.find_all(nodes.Getitem):
+        if (
+            _is_site(getitem_node.node)
+            and isinstance(getitem_node.arg, nodes.Const)
+            and isinstance(getitem_node.arg.value, str)
+        ):
+            keys[id(getitem_node.node)] = getitem_node.arg.value
+
+    return {
+        keys.get(id(name), "*")
+        for name in ast.find_all(nodes.Name)
+        if _is_site(name) and name.ctx == "load"
+    }
+
+
+def _is_site(node: nodes.Node) -> bool:
+    """Checks whether a node reads the `site` variable."""
+    return isinstance(node, nodes.Name) and node.name == "site"
+
+
+def create_environment(
+    directory: str, filters: dict[str, Callable], cache_size: int
+) -> Environment:
+    """Creates the Jinja environment to render the templates of a project with.
+
+    Compiled templates are persisted in the project cache, and compiled again when the template source changes.
+
+    Args:
+        directory (str): The directory of the templates.
+        filters (dict): Additional Jinja filters to render with, by name.
+        cache_size (int): The amount of compiled templates to keep in memory.
+
+    Returns:
+        Environment: The environment that was configured.
+    """
+    environment = Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=FileSystemBytecodeCache(cache.ensure_cache_directory("jinja")),
+        line_statement_prefix=">>",
+        line_comment_prefix="#",
+        trim_blocks=True,
+        lstrip_blocks=True,
+        cache_size=cache_size,
+    )
+    environment.filters.update(filters)
+    return environment
@@ -1,40 +1,164 @@
 import os
-import shutil
-import time
-import glob
-from datetime import datetime
-from typing import Optional, Union
-
-import sass
-import frontmatter
+import json
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Optional, Union, Any, Iterator, Callable
+
 import yaml
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment
 
-from pavo.utils import config, context, files
+from pavo.utils import cache, config, context, files
 from pavo.core import messages
-from pavo.ddl.build import Post, Page
-
-
-class WebsiteBuilder:
+from pavo.core.assets import AssetManifest, ASSET_MANIFEST
+from pavo.core.dispatch import Dispatcher, write_changes
+from pavo.core.manifest import BuildManifest
+from pavo.core.output import BuildOutput, DiskOutput
+from pavo.core.profiler import BuildProfiler
+from pavo.core.hooks import HookManager
+from pavo.core.discovery import Discovery
+from pavo.core.sources import MarkdownSource
+from pavo.core.templates import TemplateGraph, create_environment
+from pavo.core import images as image_optimizer
+from pavo.core import compress, pagination, purge, render, sources, styles
+from pavo.ddl.build import Post, Page, ImageReference, ImageVariant
+from pavo.ddl.hooks import HookTypes, Hook, Invoker
+
+# The minimum amount of sources to load before it is worth starting a process pool.
+_PARALLEL_THRESHOLD = 16
+
+# The invokers of the build stages, in the order they run, which plugins can hook into with `Invoker.for_stage`.
+_STAGES = {
+    stage: Invoker.for_stage(stage)
+    for stage in (
+        "templates",
+        "public",
+        "data",
+        "discovery",
+        "images",
+        "styles",
+        "pages",
+        "posts",
+        "purge",
+        "compress",
+        "manifest",
+        "dispatch",
+    )
+}
+
+# The project directories that a rebuild can handle on their own, without building the whole website again.
+_REBUILD_DIRECTORIES = (
+    "_data/",
+    "_pages/",
+    "_posts/",
+    "_static/templates/",
+    "_static/styles/",
+    "_static/images/",
+    "_static/public/",
+)
+
+
+class WebsiteBuilder:  # pylint: disable=too-many-instance-attributes
     """Builder class for Pavo projects. Builds a website from project files.
 
     Args:
         tmp_dir (str): The location of the temporary directory to write build files to.
+        manifest_path (str): The file to persist the build manifest to. When `None`, the manifest is kept in memory.
+        jobs (int): The amount of processes to spread work over. Defaults to the amount of CPUs.
+        render_workers (int): The amount of threads to render pages and posts with. Defaults to the amount of jobs.
+        output (BuildOutput): Where to write the built website to. Defaults to the temporary directory.
+        profile (bool): Whether to measure the time and memory every build stage and file takes.
+        hooks (HookManager): The hooks to execute during the build. Defaults to no hooks.
+        filters (dict): Additional Jinja filters to render with, by name.
 
     Attributes:
         tmp_dir (str): The location of the temporary directory to write build files to.
+        output (BuildOutput): Where the built website is written to.
+        jobs (int): The amount of processes to spread work over.
+        render_workers (int): The amount of threads to render pages and posts with.
         jinja_environment (Environment): The Jinja environment to use when building.
+        manifest (BuildManifest): The inputs of every output in the build directory, used to skip unchanged outputs.
+        template_graph (TemplateGraph): The dependencies between the templates of the project.
+        style_graph (StyleGraph): The dependencies between the stylesheets of the project.
+        markdown_cache (DiskCache): Markdown that was converted to HTML in previous builds.
+        image_cache (DiskCache): Images that were optimized in previous builds.
+        style_cache (DiskCache): Stylesheets that were compiled in previous builds.
+        compress_cache (DiskCache): Outputs that were compressed in previous builds, by the hash of the output.
+        minify_cache (DiskCache): Pages that were minified in previous builds, by their path and render inputs.
+        assets (AssetManifest): The paths the assets are written to, which are fingerprinted when enabled.
+        profiler (BuildProfiler): Measures the time and memory used by the build, when profiling is enabled.
+        hooks (HookManager): The hooks that are executed around the build stages and for every page and post.
+        discovery (Discovery): The pages and posts that were found, which are kept between builds.
+        filters (dict): The additional Jinja filters that are rendered with, by name.
     """
 
-    def __init__(self, tmp_dir: str) -> None:
-        self.images: dict[str, str] = {}
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        tmp_dir: str,
+        manifest_path: Optional[str] = None,
+        *,
+        jobs: Optional[int] = None,
+        render_workers: Optional[int] = None,
+        output: Optional[BuildOutput] = None,
+        profile: bool = False,
+        hooks: Optional[HookManager] = None,
+        filters: Optional[dict[str, Callable]] = None,
+    ) -> None:
+        self.images: dict[str, ImageReference] = {}
+        self.assets: AssetManifest = AssetManifest()
         self.data: dict[str, Union[str, int]] = {}
         self.site: dict[str, list[Union[Page, Post]]] = {}
 
         # Create a temporary folder to write the build to, so we can roll back at any time
         self.tmp_dir: str = tmp_dir
-        messages.echo(f"Created temporary directory at {self.tmp_dir}")
-        self.jinja_environment: Environment = self._create_jinja_env()
+        messages.echo(f"Using build directory at {self.tmp_dir}")
+        self.output: BuildOutput = output or DiskOutput(tmp_dir)
+        self.profiler: BuildProfiler = BuildProfiler(enabled=profile)
+        self.hooks: HookManager = hooks or HookManager()
+        self.filters: dict[str, Callable] = filters or {}
+        # The environment lives as long as the builder, so compiled templates are reused between builds
+        self.jinja_environment: Environment = create_environment(
+            "./_static/templates/",
+            self.filters,
+            config.get_config_value("build.max_template_cache"),
+        )
+        self.manifest: BuildManifest = BuildManifest(manifest_path)
+        self.template_graph: TemplateGraph = TemplateGraph(
+            self.jinja_environment,
+            "./_static/templates/",
+            cache.cache_path("templates.json"),
+        )
+        self.style_graph: styles.StyleGraph = styles.StyleGraph("_static/styles")
+
+        # Hashes of the inputs that outputs depend on, used to decide which outputs need to be built again
+        self._input_hashes: dict[str, str] = {}
+
+        # The outputs of the pages after the first page of paginated listings, to remove the ones that are gone
+        self._paginated: set[str] = set()
+
+        self.markdown_cache: cache.DiskCache = cache.DiskCache(
+            cache.cache_path("markdown")
+        )
+        self.image_cache: cache.DiskCache = cache.DiskCache(cache.cache_path("images"))
+        self.style_cache: cache.DiskCache = cache.DiskCache(cache.cache_path("styles"))
+        self.compress_cache: cache.DiskCache = cache.DiskCache(
+            cache.cache_path("compress")
+        )
+        self.minify_cache: cache.DiskCache = cache.DiskCache(cache.cache_path("minify"))
+        self.discovery: Discovery = Discovery(
+            self._load_sources, self.markdown_cache.directory
+        )
+
+        # The source and inputs of every stylesheet in the build by output path, so they can be purged after rendering
+        self.stylesheets: dict[str, tuple[str, dict[str, str]]] = {}
+        self._purge_styles: bool = False
+        self._minify_html: bool = False
+        self._precompress_outputs: bool = False
+
+        self.jobs: int = max(1, jobs or os.cpu_count() or 1)
+        self.render_workers: int = max(1, render_workers or self.jobs)
+        self._pool: Optional[ProcessPoolExecutor] = None
 
     def build(self, optimized: bool = True) -> None:
         """Public build function. Call to this function builds the project directory to _website.
@@ -43,33 +167,147 @@ class WebsiteBuilder:
             optimized (bool): Should we optimize images, stylesheets and others. Takes more time, reduces build size.
         """
         self._reset()
+        settings = config.get_config()
+        self.assets.enabled = optimized and settings.get_as(
+            "build.fingerprint.enabled", bool, False
+        )
+        self._purge_styles = optimized and settings.get_as(
+            "build.styles.purge.enabled", bool, False
+        )
+        self._minify_html = optimized and settings.get_as(
+            "build.minify.enabled", bool, False
+        )
+        self._precompress_outputs = optimized and settings.get_as(
+            "build.compress.enabled", bool, False
+        )
         messages.header("Time to build a website!")
 
-        # Load all templates and set up a jinja environment
-        self._load_templates()
-        self.jinja_environment = self._create_jinja_env()
-
-        # Copy all files from the public folder directly to the build directory
-        for file in files.load_files("./_static/public/"):
-            self._copy_to_tmp(f"./_static/public/{file}")
+        # Find the templates that changed since the previous build
+        with self._stage("templates"):
+            self.template_graph.refresh()
 
         # Build commands
-        try:
-            self._get_site_data()
-            self._discover_pages()
-            self._discover_posts()
-            self._build_images()
-            self._build_pages()
-            self._build_posts()
-            self._build_styles()
+        with self._building():
+            # Copy all files from the public folder directly to the build directory
+            with self._stage("public"):
+                self._copy_public()
+            with self._stage("data"):
+                self._get_site_data()
+            with self._stage("discovery"):
+                self._discover_pages()
+                self._discover_posts()
+                self._prune_caches()
+                self._input_hashes["index"] = self.discovery.index_hash(self.site)
+            with self._stage("images"):
+                self._build_images(optimize=optimized)
+            with self._stage("styles"):
+                self._build_styles()
+            with self._stage("pages"):
+                self._install_globals()
+                self._build_pages()
+            with self._stage("posts"):
+                self._build_posts()
+
+            if self._purge_styles:
+                with self._stage("purge"):
+                    self._optimize_styles()
+
+            self.assets.write(self.manifest, self.output)
+            if self._precompress_outputs:
+                with self._stage("compress"):
+                    self._precompress()
+
+            with self._stage("manifest"):
+                self.manifest.finish(self.output)
+
+    def rebuild(self, changed_paths: set[str]) -> None:
+        """Builds the website again after project files changed, only running the build stages that they affect.
+
+        Changed pages and posts are loaded again while the other sources are reused, and only the outputs whose
+        inputs changed are rendered again. Changed styles, images and public files are compiled or copied on their own.
 
-            if optimized:
-                # This is temporarily deprecated, will be fixed in a new release
-                # TODO: Fix in the Treeshake project.  pylint: disable=fixme
-                # self._optimize_styles()
-                pass
+        Args:
+            changed_paths (set): The paths of the project files that were added, changed or removed. Paths that end
+                with a separator are directories that were removed as a whole, which builds the whole website again.
+        """
+        if any(path.endswith(("/", os.sep)) for path in changed_paths):
+            # The sources that were in a removed directory are unknown, so none of them can be relied on
+            self.build(False)
+            return
+
+        changed = {os.path.relpath(path).replace(os.sep, "/") for path in changed_paths}
+        stages = {
+            directory: {path for path in changed if path.startswith(directory)}
+            for directory in _REBUILD_DIRECTORIES
+        }
+        if not self.site or changed - set().union(*stages.values()):
+            # Files outside of the known directories, like the configuration, could affect any output
+            self.build(False)
+            return
+
+        messages.header(f"Rebuilding {len(changed)} changed file(s).")
+        images_hash = self._input_hashes.get("images")
+        assets = dict(self.assets.assets)
+        with self._building():
+            if stages["_data/"]:
+                with self._stage("data"):
+                    self._load_site()
+                    self._get_site_data()
+            if stages["_pages/"] or stages["_posts/"]:
+                with self._stage("discovery"):
+                    if stages["_pages/"]:
+                        self._discover_pages(stages["_pages/"])
+                    if stages["_posts/"]:
+                        self._discover_posts(stages["_posts/"])
+                    self._input_hashes["index"] = self.discovery.index_hash(self.site)
+            if stages["_static/templates/"]:
+                with self._stage("templates"):
+                    self.template_graph.refresh()
+            if stages["_static/images/"]:
+                with self._stage("images"):
+                    self._build_images(stages["_static/images/"])
+            if stages["_static/public/"]:
+                with self._stage("public"):
+                    self._copy_public(stages["_static/public/"])
+            if stages["_static/styles/"]:
+                with self._stage("styles"):
+                    self._build_styles()
+            if assets != self.assets.assets:
+                self.assets.write(self.manifest, self.output)
+
+            # The manifest limits rendering to the pages and posts whose inputs changed
+            render_stages = ("_static/templates/", "_data/", "_pages/", "_posts/")
+            if (
+                any(stages[directory] for directory in render_stages)
+                or images_hash != self._input_hashes.get("images")
+                or assets != self.assets.assets
+            ):
+                with self._stage("pages"):
+                    self._install_globals()
+                    self._build_pages()
+                with self._stage("posts"):
+                    self._build_posts()
+
+            self.manifest.save()
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        """Runs a build stage between the hooks registered before and after it, and measures it when profiling.
 
-            self._clean_tmp()
+        Args:
+            name (str): The name of the stage, which hooks are registered to with `Invoker.for_stage`.
+        """
+        invoker = _STAGES[name]
+        self.hooks.execute(HookTypes.BEFORE, invoker, self)
+        with self.profiler.stage(name):
+            yield
+        self.hooks.execute(HookTypes.AFTER, invoker, self)
+
+    @contextmanager
+    def _building(self) -> Iterator[None]:
+        """Reports errors of the build stages that run inside it, and releases the pool and page contents afterwards."""
+        try:
+            yield
 
         except Exception as err:  # pylint: disable=broad-except
             messages.error(
@@ -78,10 +316,45 @@ class WebsiteBuilder:
             )
             raise err
 
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            # The content of pages and posts is only needed while rendering, the next build loads it again
+            self.discovery.release()
+
     def _reset(self) -> None:
         """Resets the builder class to the initial state."""
+        self.assets = AssetManifest(
+            previous=self.assets.assets
+            or AssetManifest.parse(self.output.read(ASSET_MANIFEST))
+        )
         self.images = {}
         self.data = {}
+        self._input_hashes = {
+            "config": files.hash_content(
+                json.dumps(
+                    [
+                        config.get_config_value("build.markdown.extras"),
+                        config.get_config_value("public"),
+                        self.hooks.signature(),
+                        [
+                            f"{name}={function.__module__}.{function.__qualname__}"
+                            for name, function in sorted(self.filters.items())
+                        ],
+                    ],
+                    sort_keys=True,
+                    default=str,
+                )
+            )
+        }
+        self.manifest.begin()
+        self.site = {}
+        self.discovery.reset()
+        self._load_site()
+
+    def _load_site(self) -> None:
+        """Loads the website configuration into the site dictionary, keeping the pages and posts that were found."""
         site_meta_path = config.get_config_value("build.paths.site_config")
         if (
             not isinstance(site_meta_path, str)
@@ -92,14 +365,57 @@ class WebsiteBuilder:
             raise FileNotFoundError("Missing website configuration file.")
 
         with open("./_data/site.yaml", "r", encoding="utf-8") as file:
-            self.site = yaml.safe_load(file)
-            self.site["pages"] = []
-            self.site["posts"] = []
+            site = yaml.safe_load(file)
+            site["pages"] = self.site.get("pages", [])
+            site["posts"] = self.site.get("posts", [])
+            self.site = site
+        self._input_hashes["site"] = self.manifest.hash_source("./_data/site.yaml")
+
+    def _copy_public(self, changed: Optional[set[str]] = None) -> None:
+        """Copies the files in the public folder directly to the build directory.
+
+        Args:
+            changed (set): The paths of the public files that changed. When given, only these files are copied or
+                removed. Defaults to all public files.
+        """
+        public_files = files.load_files("./_static/public/")
+        patterns = config.get_config().get_as("build.fingerprint.public", list, [])
+        for file in public_files:
+            if changed is None or f"_static/public/{file}" in changed:
+                self._copy_if_changed(
+                    f"./_static/public/{file}",
+                    file,
+                    asset=any(fnmatch.fnmatch(file, pattern) for pattern in patterns),
+                )
+
+        for path in changed or ():
+            file = path[len("_static/public/") :]
+            if file not in public_files:
+                self.manifest.forget(self.assets.assets.pop(file, file), self.output)
 
     def _render(
-        self, render_object: Union[Page, Post], template_name: str, rel_path: str
-    ) -> None:
-        if render_object.content is None:
+        self,
+        render_object: Union[Page, Post],
+        template_name: str,
+        rel_path: str,
+        inputs: dict[str, str],
+        post_render: tuple[Hook, ...] = (),
+    ) -> str:
+        """Renders a page or post to the build directory.
+
+        Args:
+            render_object (Union[Page, Post]): The page or post to render.
+            template_name (str): The name of the template to render with, without extension.
+            rel_path (str): The path to write the result to, relative to the build directory.
+            inputs (dict): The hashes of the inputs of the output. The hash of the source is updated to the content
+                that is rendered.
+            post_render (tuple): The hooks that transform the rendered HTML, before it is minified.
+
+        Returns:
+            str: The hash of the rendered output.
+        """
+        content = render_object.content
+        if content is None:
             raise NotImplementedError
 
         if render_object.metadata is None:
@@ -108,143 +424,539 @@ class WebsiteBuilder:
         if template_name == "":
             raise NotImplementedError
 
+        # The source can change after it was discovered, so the output is recorded with the source it shows
+        inputs["source"] = self.discovery.source_hash(render_object)
+
         # TODO: Swap this out for .html.jinja, because it is safer. pylint: disable=fixme
         template = self.jinja_environment.get_template(f"{template_name}.html")
-        with open(f"{self.tmp_dir}/{rel_path}", "wb") as file:
-            file.write(
-                template.render(
-                    content=render_object.content,
-                    site=self.site,
-                    data=self.data,
-                    page=render_object.metadata,
-                    public=config.get_config_value("public"),
-                    images=self.images,
-                ).encode("utf-8")
+        chunks = render.render_chunks(
+            template, render_object, content, post_render, self._minify_html
+        )
+        if not self._minify_html:
+            return render.write_chunks(self.output, rel_path, chunks)
+
+        # Minifying is slow, so minified pages are kept for builds that write them again, like after a development build
+        key = self.minify_cache.key(rel_path, json.dumps(inputs, sort_keys=True))
+        return render.write_cached(
+            self.output, rel_path, chunks, self.minify_cache, key
+        )
+
+    def _render_all(
+        self,
+        render_objects: list[Union[Page, Post]],
+        default_template: str,
+        stage: str,
+    ) -> None:
+        """Renders pages or posts concurrently, skipping the ones whose output is still up-to-date.
+
+        All renders share the site-wide environment globals. A failing render does not stop the others, the errors are
+        collected and raised together once all renders are done.
+
+        Args:
+            render_objects (list): The pages or posts to render.
+            default_template (str): The template to render with, when the object does not specify a template.
+            stage (str): The build stage that renders the objects, of which the `POST_RENDER` hooks are executed.
+
+        Raises:
+            RenderError: One or more of the pages or posts could not be rendered.
+        """
+        template_inputs: dict[str, dict[str, str]] = {}
+        for render_object in render_objects:
+            template = render_object.metadata.get("template", default_template)
+            if template not in template_inputs:
+                template_inputs[template] = self._template_inputs(template)
+
+        post_render = self.hooks.hooks_for(HookTypes.POST_RENDER, _STAGES[stage])
+
+        def render_one(render_object: Union[Page, Post]) -> None:
+            template = render_object.metadata.get("template", default_template)
+            self._render_if_changed(
+                render_object, template, template_inputs[template], post_render
             )
 
-    def _get_site_data(self) -> None:
-        """Retrieves all data from yaml files in ./_data/
+        render.render_all(render_objects, render_one, self.render_workers)
 
-        Note:
-            This currently checks for both .yaml or .yml files. It is possible that we will move to only supporting
-            .yaml in a future release.
+    def _install_globals(self) -> None:
+        """Installs the site-wide template variables as read-only globals of the jinja environment.
+
+        The globals are shared by all pages and posts, so they are installed once before rendering instead of being
+        passed to every render.
         """
-        data_files = [*glob.glob("./_data/*.yaml"), *glob.glob("./_data/*.yml")]
+        site: dict[str, Any] = dict(self.site)
+        site["pages"] = tuple(self.site["pages"])
+        site["posts"] = tuple(self.site["posts"])
+        self.jinja_environment.globals.update(
+            site=MappingProxyType(site),
+            data=MappingProxyType(self.data),
+            images=MappingProxyType(self.images),
+            public=config.get_config_value("public"),
+            asset=self.assets.resolve,
+        )
+        self._input_hashes["assets"] = files.hash_content(self.assets.to_json())
 
-        for file_path in data_files:
-            key = os.path.basename(file_path).split(".")[0]
-            with open(file_path, "r", encoding="utf-8") as file:
-                if key == "site":
-                    # Since the site data is loaded earlier, there is no reason to make it available as data.
-                    continue
+    def _template_inputs(self, template_name: str) -> dict[str, str]:
+        """Finds the hashes of the inputs that every output rendered with a template depends on.
 
-                self.data[key] = yaml.safe_load(file)
+        Args:
+            template_name (str): The name of the template, without extension.
 
-    def _copy_to_tmp(self, path: str, sub_folder: Optional[str] = None) -> None:
-        """Copies a file to the temporary working directory.
+        Returns:
+            dict: The hashes of the template chain and the parts of the context the templates read.
+        """
+        inputs = self.template_graph.inputs(template_name, self._input_hashes)
+        if self._minify_html:
+            inputs["minify"] = "minified"
+
+        return inputs
+
+    def _render_if_changed(
+        self,
+        render_object: Union[Page, Post],
+        template_name: str,
+        template_inputs: dict[str, str],
+        post_render: tuple[Hook, ...] = (),
+    ) -> None:
+        """Renders a page or post, unless its output is still up-to-date with all of its inputs.
 
         Args:
-            path (str): The relative path to the file to copy.
-            sub_folder (str): The directory in the temporary directory to copy the file to. Defaults to ''.
+            render_object (Union[Page, Post]): The page or post to render.
+            template_name (str): The name of the template to render with, without extension.
+            template_inputs (dict): The hashes of the inputs that come with the template.
+            post_render (tuple): The hooks that transform the rendered HTML.
         """
-        if sub_folder is not None:
-            if not os.path.exists(f"{self.tmp_dir}/{sub_folder}"):
-                os.mkdir(f"{self.tmp_dir}/{sub_folder}/")
-            shutil.copy(path, f"{self.tmp_dir}/{sub_folder}")
-        else:
-            shutil.copy(path, f"{self.tmp_dir}/")
+        inputs = {
+            "source": self.discovery.source_hash(render_object),
+            **template_inputs,
+        }
+        if render_object.paginator is not None:
+            # The slice of posts on every page of a listing changes with the posts of the website
+            inputs["index"] = self._input_hashes["index"]
+        rel_path = render_object.slug.lstrip("/")
+        if self.manifest.is_fresh(rel_path, inputs, self.output):
+            return
+
+        with self.profiler.file("render", rel_path, template_name):
+            digest = self._render(
+                render_object, template_name, rel_path, inputs, post_render
+            )
+        self.manifest.record(rel_path, inputs, digest)
 
-    def _build_images(self) -> None:
-        """Copies images to the temporary folder.
+    def _copy_if_changed(self, path: str, rel_path: str, asset: bool = False) -> str:
+        """Copies a file to the build directory, unless the copy from a previous build is still up-to-date.
 
-        TODO: We should add some image optimization in here, because this can be improved. pylint: disable=fixme
+        Args:
+            path (str): The path to the file to copy.
+            rel_path (str): The path to copy the file to, relative to the build directory.
+            asset (bool): Whether the file is an asset, which is copied under a fingerprinted name when enabled.
+
+        Returns:
+            str: The path the file was copied to, relative to the build directory.
+        """
+        digest = self.manifest.hash_source(path)
+        if asset:
+            rel_path = self._asset_path(rel_path, digest)
+
+        inputs = {"source": digest}
+        if self.manifest.is_fresh(rel_path, inputs, self.output):
+            return rel_path
+
+        self.output.copy(path, rel_path)
+        self.manifest.record(rel_path, inputs, digest)
+        return rel_path
+
+    def _asset_path(self, rel_path: str, digest: str) -> str:
+        """Finds the path to write an asset to, which contains its content hash when fingerprinting is enabled.
+
+        Args:
+            rel_path (str): The original path of the asset, relative to the build directory.
+            digest (str): The hash of the content of the asset.
+
+        Returns:
+            str: The path to write the asset to, relative to the build directory.
+        """
+        path, replaced = self.assets.path(rel_path, digest)
+        if replaced is not None:
+            # The content changed since the asset was written, so the old version is not used anymore
+            self.manifest.forget(replaced, self.output)
+
+        return path
+
+    def _get_site_data(self) -> None:
+        """Retrieves all data from yaml files in ./_data/"""
+        data_files = sources.find_data("./_data/")
+        self._input_hashes["data"] = files.hash_content(
+            "\n".join(
+                f"{path}:{self.manifest.hash_source(path)}"
+                for path in sorted(data_files)
+            )
+        )
+        self.data = sources.load_data(data_files)
+
+    def _build_images(
+        self, changed: Optional[set[str]] = None, optimize: bool = False
+    ) -> None:
+        """Copies images to the temporary folder, or optimizes them when image optimization is enabled.
+
+        Args:
+            changed (set): The paths of the images that changed. When given, only these images are copied or
+                removed. Defaults to all images.
+            optimize (bool): Optimize the images, if enabled in the configuration and Pillow is installed.
         """
-        files.force_create_empty_directory(f"{self.tmp_dir}/images/")
         images = files.load_files("_static/images/")
         messages.info(f"Found {len(images)} image(s) in _static/images/.")
+        if optimize and config.get_config().get_as(
+            "build.images.optimize", bool, False
+        ):
+            optimize = image_optimizer.is_available()
+            if not optimize:
+                messages.warning(
+                    "Image optimization requires Pillow, copying images without optimizing them."
+                )
+        else:
+            optimize = False
+
+        previous_images = self.images
+        self.images = {}
+        to_optimize = []
         for image in images:
+            process = changed is None or f"_static/images/{image}" in changed
             image = image.lower()
-            self._copy_to_tmp(f"_static/images/{image}", "images/")
-            self.images[image] = f"./images/{image}"
+            if optimize and image_optimizer.can_optimize(image):
+                if process or image not in previous_images:
+                    to_optimize.append(image)
+                else:
+                    self.images[image] = previous_images[image]
+                continue
+
+            if not process and image in previous_images:
+                self.images[image] = previous_images[image]
+                continue
+
+            rel_path = self._copy_if_changed(
+                f"_static/images/{image}", f"images/{image}", asset=True
+            )
+            self.images[image] = ImageReference(f"./{rel_path}")
             messages.info(
                 f"Added {image} to build directory and created a URI reference."
             )
 
+        self._optimize_images(to_optimize)
+
+        for image in previous_images.keys() - self.images.keys():
+            self.manifest.forget(previous_images[image][2:], self.output)
+            for variant in previous_images[image].variants:
+                self.manifest.forget(variant.url[2:], self.output)
+
+        self._input_hashes["images"] = image_optimizer.hash_references(self.images)
+
+    def _optimize_images(self, images: list[str]) -> None:
+        """Optimizes images into the build directory, spread over a process pool when there are enough of them.
+
+        Images are encoded once for every source and set of settings. The encoded variants are kept in the image
+        cache, so unchanged images are never encoded again.
+
+        Args:
+            images (list): The file names of the images in _static/images/ to optimize.
+        """
+        settings = {
+            "widths": config.get_config().get_as(
+                "build.images.widths", list, [480, 960, 1920]
+            ),
+            "quality": config.get_config().get_as("build.images.quality", int, 82),
+            "webp": config.get_config().get_as("build.images.webp", bool, True),
+        }
+        settings_hash = files.hash_content(json.dumps(settings, sort_keys=True))
+        digests = {
+            image: self.manifest.hash_source(f"_static/images/{image}")
+            for image in images
+        }
+
+        variants = image_optimizer.encode_images(
+            {image: f"_static/images/{image}" for image in images},
+            digests,
+            settings,
+            self.image_cache,
+            self._process_pool() if self.jobs > 1 and len(images) > 1 else None,
+        )
+        for image in images:
+            inputs = {"source": digests[image], "settings": settings_hash}
+            references = []
+            for variant in variants[image]:
+                # The cache key is derived from the source and the settings, so it can fingerprint the variant as well
+                rel_path = self._asset_path(f"images/{variant.name}", variant.key)
+                references.append(
+                    ImageVariant(
+                        f"./{rel_path}", variant.width, variant.height, variant.format
+                    )
+                )
+                if self.manifest.is_fresh(rel_path, inputs, self.output):
+                    continue
+
+                content = self.image_cache.get(variant.key)
+                if content is None:
+                    raise FileNotFoundError(
+                        f"Optimized image {variant.name} is missing from the image cache."
+                    )
+
+                self.output.write(rel_path, content)
+                self.manifest.record(rel_path, inputs, files.hash_content(content))
+
+            # The first variant is the optimized image at its original size
+            self.images[image] = ImageReference(references[0].url, references)
+
     def _build_styles(self) -> None:
         """Copies .css to the temporary folder and builds .sass and .scss to .css to the temp folder.
 
         Note:
             In case of naming collision between .css and sass, will build sass on top of css. CSS overrules sass.
         """
-        files.force_create_empty_directory(f"{self.tmp_dir}/styles")
-        if glob.glob("_static/styles/*.sass") or glob.glob("_static/styles/*.scss"):
-            sass.compile(dirname=("_static/styles/", f"{self.tmp_dir}/styles/"))
-            messages.info("Found and compiled sass files to build directory.")
-        for file in os.listdir("_static/styles/"):
-            if file.endswith(".css"):
-                self._copy_to_tmp(f"_static/styles/{file}", "styles")
-                messages.info(f"Copied {file} from _static/styles/ to build directory.")
-
-    def _discover_pages(self) -> None:
-        """Finds all pages that should be built and adds them to the site dictionary."""
-        for page in os.listdir("_pages/"):
-            if page.endswith(".md") or page.endswith(".markdown"):
-                self._copy_to_tmp(f"_pages/{page}")
-
-                with open(f"_pages/{page}", encoding="utf-8") as file:
-                    data = frontmatter.load(file)
-
-                slug_title = page.split(".")[0]
-                self.site["pages"].append(
-                    Page(
-                        content=files.convert_md_to_html(data.content),
-                        metadata=data.metadata,
-                        title=data.get("title", slug_title),
-                        slug=f"/{slug_title}.html",
-                    )
+        # Every compiled stylesheet only depends on the stylesheets it imports, directly or through other imports
+        source_maps = config.get_config().get_as(
+            "build.styles.source_maps", bool, False
+        )
+        safelist = config.get_config().get_as("build.styles.purge.safelist", list, [])
+        self.style_graph.refresh(self.manifest.hash_source)
+        self.stylesheets = {}
+        stale: dict[str, tuple[str, str, dict[str, str]]] = {}
+        for output, (path, digest, source_map) in self.style_graph.entries(
+            source_maps
+        ).items():
+            inputs = {"styles": digest}
+            if self._purge_styles:
+                # Purged stylesheets are never up-to-date for builds that do not purge, or purge with another safelist
+                inputs["purge"] = files.hash_content(json.dumps(safelist))
+
+            self.stylesheets[output] = (path, inputs)
+            previous = output
+            if self.assets.enabled:
+                # The fingerprinted name is only known after compiling, so check the name of the previous build
+                previous = self.assets.previous.get(output, "")
+
+            outputs = [previous, f"{output}.map"] if source_map else [previous]
+            if all(self.manifest.is_fresh(out, inputs, self.output) for out in outputs):
+                if self.assets.enabled:
+                    self.assets.assets[output] = previous
+                continue
+
+            stale[path] = (output, previous, inputs)
+
+        compiled = styles.compile_stylesheets(
+            {path: inputs["styles"] for path, (_, _, inputs) in stale.items()},
+            source_maps,
+            self.style_cache,
+            self._process_pool() if self.jobs > 1 and len(stale) > 1 else None,
+        )
+        for path, (output, previous, inputs) in stale.items():
+            css, source_map_content = compiled[path]
+            written = self._asset_path(output, files.hash_content(css))
+            if previous not in ("", written):
+                self.manifest.forget(previous, self.output)
+
+            self.output.write(written, css)
+            self.manifest.record(written, inputs, files.hash_content(css))
+            if source_map_content is not None:
+                # The compiled stylesheet refers to its source map by its original name, next to it
+                self.output.write(f"{output}.map", source_map_content)
+                self.manifest.record(
+                    f"{output}.map", inputs, files.hash_content(source_map_content)
                 )
+            messages.info(f"Wrote {path} to {written} in the build directory.")
+
+    def _optimize_styles(self) -> None:
+        """Removes the style rules that none of the HTML in the build uses from the stylesheets.
+
+        The rules are removed from the stylesheets as they were built, so rules that pages start using again are
+        restored. When fingerprinting is enabled, purged stylesheets get new names and the pages are rendered again.
+        Nothing is purged when no page and no stylesheet changed since the previous build.
+        """
+        if not any(
+            path.endswith((".html", ".css")) for path in self.manifest.changed()
+        ):
+            messages.debug(
+                "Skipped purging the stylesheets, no page or stylesheet changed."
+            )
+            return
+
+        settings = config.get_config()
+        pool = self._process_pool() if self.jobs > 1 else None
+        used = purge.collect_selectors(
+            [path for path in self.manifest.produced() if path.endswith(".html")],
+            self.output,
+            pool,
+        )
+        safelist = settings.get_as("build.styles.purge.safelist", list, [])
+        compiled = styles.compile_stylesheets(
+            {path: inputs["styles"] for path, inputs in self.stylesheets.values()},
+            settings.get_as("build.styles.source_maps", bool, False),
+            self.style_cache,
+            pool,
+        )
+
+        renamed = False
+        for output, (path, inputs) in self.stylesheets.items():
+            css = compiled[path][0].decode("utf-8")
+            purged = purge.purge_stylesheet(css, used, safelist).encode("utf-8")
+            digest = files.hash_content(purged)
+            rendered = self.assets.assets.get(output, output)
+            written = self._asset_path(output, digest)
+            renamed = renamed or written != rendered
+            if self.manifest.output_hash(written) != digest:
+                self.output.write(written, purged)
+                self.manifest.record(written, inputs, digest)
+                messages.info(
+                    f"Purged {written} from {len(css)} to {len(purged)} bytes."
+                )
+
+        if renamed:
+            messages.info("Rendering pages again to refer to the purged stylesheets.")
+            self._install_globals()
+            self._build_pages()
+            self._build_posts()
+
+    def _precompress(self) -> None:
+        """Writes gzip and brotli compressed variants next to the text outputs, for hosts that serve them directly."""
+        settings = config.get_config()
+        encodings = settings.get_as("build.compress.formats", list, ["gzip", "brotli"])
+        if "brotli" in encodings and not compress.is_available("brotli"):
+            messages.warning(
+                "Brotli is not installed, only writing gzip variants. Install the compression extra to fix this."
+            )
+        min_size = settings.get_as("build.compress.min_size", int, 1024)
+
+        pending = compress.find_stale_variants(
+            self.manifest, self.output, encodings, min_size
+        )
+        compressed = compress.compress_outputs(
+            {key: inputs["source"] for key, inputs in pending.items()},
+            self.output,
+            self.compress_cache,
+            min_size,
+            self._process_pool() if self.jobs > 1 and len(pending) > 1 else None,
+        )
+        compress.write_variants(compressed, pending, self.manifest, self.output)
 
-    def _discover_posts(self) -> None:
+    def _discover_pages(self, changed: Optional[set[str]] = None) -> None:
+        """Finds all pages that should be built and adds them to the site dictionary.
+
+        Args:
+            changed (set): The paths of the page sources that changed. When given, only these sources are loaded
+                again and the previously found pages are reused. Defaults to loading all pages.
+        """
+        post_parse = self.hooks.hooks_for(HookTypes.POST_PARSE, _STAGES["discovery"])
+        self.site["pages"], removed = self.discovery.find_pages(changed, post_parse)
+        self._forget_removed(removed)
+
+    def _discover_posts(self, changed: Optional[set[str]] = None) -> None:
         """Finds all posts that should be built and adds them to the site dictionary.
 
-        This method filters all posts that have an invalid date or which date has not yet passed.
-        This way, the posts that are not ready yet, are not built and therefore not visible to visitors.
+        Posts that have an invalid date or which date has not yet passed are left out. This way, the posts that are
+        not ready yet, are not built and therefore not visible to visitors.
+
+        Args:
+            changed (set): The paths of the post sources that changed. When given, only these sources are loaded
+                again and the previously found posts are reused. Defaults to loading all posts.
         """
-        for post in os.listdir("_posts/"):
-            if post.endswith(".md") or post.endswith(".markdown"):
-                try:
-                    date = datetime.strptime(post[:10], "%Y-%m-%d")
-                    if datetime.now() > date:
-                        self._copy_to_tmp(f"_posts/{post}", "posts")
-
-                        with open(f"_posts/{post}", encoding="utf-8") as file:
-                            data = frontmatter.load(file)
-
-                        slug_title = post.split(".")[0]
-                        self.site["posts"].append(
-                            Post(
-                                content=files.convert_md_to_html(data.content),
-                                metadata=data.metadata,
-                                title=data.metadata.get("title", slug_title),
-                                slug=f"/posts/{slug_title}.html",
-                                date=date.strftime("%B %d, %Y"),
-                            )
-                        )
-                except (IndexError, ValueError):
-                    messages.warning(
-                        f'Skipped indexing post "{post}". Invalid date format. Expected: YYYY-MM-DD.'
-                    )
+        post_parse = self.hooks.hooks_for(HookTypes.POST_PARSE, _STAGES["discovery"])
+        self.site["posts"], removed = self.discovery.find_posts(changed, post_parse)
+        self._forget_removed(removed)
+
+    def _forget_removed(self, removed: list[Union[Page, Post]]) -> None:
+        """Removes the outputs of the pages or posts whose source is gone."""
+        for render_object in removed:
+            self.manifest.forget(render_object.slug.lstrip("/"), self.output)
+
+    def _prune_caches(self) -> None:
+        """Evicts the least recently used entries from the caches that outgrew their configured size."""
+        settings = config.get_config()
+        for name, disk_cache, max_size, default in (
+            ("markdown", self.markdown_cache, "build.markdown.cache_size", 256),
+            ("images", self.image_cache, "build.images.cache_size", 1024),
+            ("styles", self.style_cache, "build.styles.cache_size", 64),
+            ("compress", self.compress_cache, "build.compress.cache_size", 256),
+            ("minify", self.minify_cache, "build.minify.cache_size", 256),
+        ):
+            disk_cache.max_size = settings.get_as(max_size, int, default) * 1024 * 1024
+            evicted = disk_cache.prune()
+            if evicted:
+                messages.debug(f"Evicted {evicted} entries from the {name} cache.")
 
-        self.site["posts"].sort(key=lambda x: x.title[:10])
-        self.site["posts"].reverse()
+    def _load_sources(self, directory: str, names: list[str]) -> list[MarkdownSource]:
+        """Reads, parses and converts markdown sources, spread over a process pool when there are enough of them.
+
+        Args:
+            directory (str): The directory that contains the sources.
+            names (list): The file names of the sources to load.
+
+        Returns:
+            list: The loaded sources, in the same order as the names.
+        """
+        paths = [f"{directory}{name}" for name in names]
+        parallel = self.jobs > 1 and len(paths) >= _PARALLEL_THRESHOLD
+        loaded = sources.load_markdown_sources(
+            paths,
+            config.get_config_value("build.markdown.extras"),
+            self.markdown_cache.directory,
+            self._process_pool() if parallel else None,
+            chunksize=max(1, len(paths) // (self.jobs * 4)),
+        )
+        for path, source in zip(paths, loaded):
+            self.manifest.remember_source(path, source.signature, source.hash)
+            self.profiler.record_file("markdown", path, source.load_time)
+
+        return loaded
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Retrieves the process pool of the current build, starting it when it is used for the first time.
+
+        Returns:
+            ProcessPoolExecutor: The process pool, with one worker per job.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+
+        return self._pool
 
     def _build_pages(self) -> None:
         """Builds all the pages in the /_pages directory."""
-        for page in self.site["pages"]:
-            template = page.metadata.get(
-                "template", config.get_config_value("build.default_templates.page")
-            )
-            self._render(page, template, page.slug)
+        self._render_all(
+            self._paginate(self.site["pages"]),
+            config.get_config_value("build.default_templates.page"),
+            "pages",
+        )
+
+    def _paginate(self, pages: list[Page]) -> list[Page]:
+        """Splits the pages that list the posts of the website into multiple pages, when they set a page size.
+
+        Args:
+            pages (list): The pages of the website.
+
+        Returns:
+            list: The pages to render, with a page per slice of posts for every paginated page.
+        """
+        posts = tuple(self.site["posts"])
+        expanded: list[Page] = []
+        paginated: set[str] = set()
+        for page in pages:
+            per_page = pagination.page_size(page)
+            if per_page is None:
+                expanded.append(page)
+                continue
+
+            # Load the content before copying the page, so all of its pages share it and the hash of its source
+            _ = page.content
+            listing = pagination.paginate(page, posts, per_page)
+            expanded.extend(listing)
+            for paginated_page in listing[1:]:
+                self.discovery.source_hashes[paginated_page.slug] = (
+                    self.discovery.source_hash(page)
+                )
+                paginated.add(paginated_page.slug.lstrip("/"))
+
+        for output in sorted(self._paginated - paginated):
+            self.manifest.forget(output, self.output)
+        self._paginated = paginated
+
+        return expanded
 
     def _build_posts(self) -> None:
         """Builds all posts in the /_posts directory when they should be published.
@@ -253,70 +965,34 @@ class WebsiteBuilder:
         Following the format: YYYY-MM-DD-<postname>. If the date has passed or the date is today, the post will be built
         to the output directory, else this will not occur and the post is skipped.
         """
-        files.force_create_empty_directory(f"{self.tmp_dir}/posts")
-        for post in self.site["posts"]:
-            template = post.metadata.get(
-                "template", config.get_config_value("build.default_templates.post")
-            )
-            self._render(post, template, post.slug)
-
-    def _clean_tmp(self) -> None:
-        """Cleans the temporary directory for any remaining artifacts.
+        self._render_all(
+            self.site["posts"],
+            config.get_config_value("build.default_templates.post"),
+            "posts",
+        )
 
-        To clean the temporary directory, we will remove all folders that start with an underscore (_), as well as
-        all original markdown files (.md / .markdown) in both the original directory, as in the posts directory.
+    def dispatch_build(self, atomic: bool = False) -> None:
+        """Dispatches the latest build into the output directory, and lists the changes in out.changes.json.
 
-        TODO: Make this more readable, this is a bit cluttered code. pylint: disable=fixme
+        Args:
+            atomic (bool): Replace the output directory as a whole, instead of only writing the files that were added
+                or changed and removing the files that were removed.
         """
-        messages.info("Cleaning out the temporary folder before dispatch.")
-        for file in os.listdir(f"{self.tmp_dir}"):
-            if os.path.isdir(f"{self.tmp_dir}/{file}") and file.startswith("_"):
-                shutil.rmtree(f"{self.tmp_dir}/{file}")
-                messages.info(f"Removed directory: {self.tmp_dir}/{file}.")
-            elif file.endswith(".md") or file.endswith(".markdown"):
-                os.remove(f"{self.tmp_dir}/{file}")
-                messages.info(f"Removed Markdown page: {self.tmp_dir}/{file}.")
-        for file in os.listdir(f"{self.tmp_dir}/posts"):
-            if file.endswith(".md") or file.endswith(".markdown"):
-                os.remove(f"{self.tmp_dir}/posts/{file}")
-                messages.info(f"Removed Markdown post: {self.tmp_dir}/posts/{file}.")
-
-    def dispatch_build(self) -> None:
-        """Safely clears the output directory and dispatches the latest build into this directory."""
-        files.force_create_empty_directory(".pavobuild")
-        messages.info("Done initializing an empty build directory.")
-
         # Make sure that the output directory actually exists
         with context.Expects([FileExistsError]):
             os.mkdir("out")
 
-        shutil.copytree(self.tmp_dir, ".pavobuild/", dirs_exist_ok=True)
-        messages.info("Dispatched build to build directory.")
-        shutil.rmtree("out")
-        os.rename(".pavobuild/", "out/")
-        messages.success("Build dispatched successfully to output directory.")
-
-    def _create_jinja_env(self) -> Environment:
-        """Creates a jinja2 environment with a PackageLoader.
-
-        Returns:
-            Environment: The environment that was configured.
-        """
-        return Environment(
-            loader=FileSystemLoader(f"{self.tmp_dir}/_templates"),
-            line_statement_prefix=">>",
-            line_comment_prefix="#",
-            trim_blocks=True,
-            lstrip_blocks=True,
-            cache_size=config.get_config_value("build.max_template_cache"),
+        dispatcher = Dispatcher(
+            self.tmp_dir,
+            "out",
+            cache.cache_path("dispatch.json"),
+            self.manifest.output_hash,
         )
+        with self._stage("dispatch"):
+            diff = dispatcher.dispatch(atomic)
 
-    def _load_templates(self) -> None:
-        """Loads templates into the temporary template directory."""
-        messages.info("Loading templates into temporary template directory.")
-        start = time.time()
-        for file in os.listdir("./_static/templates/"):
-            self._copy_to_tmp(f"_static/templates/{file}", "_templates/")
-        messages.echo(
-            f"Done loading templates in {round(time.time() - start, 5)} seconds."
+        write_changes(diff, "out.changes.json")
+        messages.info(
+            f"Added {len(diff.added)}, changed {len(diff.changed)} and removed {len(diff.removed)} file(s)."
         )
+        messages.success("Build dispatched successfully to output directory.")
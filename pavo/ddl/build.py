@@ -1,18 +1,146 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from typing import Callable, Iterable, Optional, Any
 
 
 @dataclass
+class Paginator:
+    """Defines the slice of a paginated listing that is rendered on a single page, with links to its neighbours."""
+
+    items: tuple[Any, ...]
+    page: int
+    pages: int
+    total: int
+    per_page: int
+    previous_url: Optional[str] = None
+    next_url: Optional[str] = None
+
+
+@dataclass(eq=False, slots=True)
 class Page:
-    """Defines the data a Page needs to contain, before rendering."""
+    """Defines the data a Page needs to contain, before rendering.
+
+    The content of a page that was discovered from a source file is only read and converted when it is first accessed,
+    and it is kept until it is released once the page is rendered. This way the pages of a website do not hold all of
+    their HTML in memory between builds.
+
+    Pages compare equal when their fields are equal. Their content is only compared when both pages have it in memory,
+    so comparing pages never loads it.
 
-    content: str
+    Args:
+        content (str): The content of the page, when it is known up front.
+        title (str): The title of the page.
+        metadata (dict): The frontmatter of the page.
+        slug (str): The URL of the page.
+        paginator (Paginator): The slice of posts that the page lists, when the page is paginated.
+        loader (Callable): Loads the content of the page when it is accessed, instead of keeping it in memory.
+    """
+
+    content: Optional[str] = field(compare=False)
     title: str
     metadata: dict
     slug: str
+    paginator: Optional[Paginator] = field(default=None, kw_only=True)
+    loader: Optional[Callable[[], str]] = field(
+        default=None, kw_only=True, repr=False, compare=False
+    )
 
+    def release(self) -> None:
+        """Releases the loaded content of the page, which is loaded again when it is accessed next."""
+        if self.loader is not None:
+            _store_content(self, None)
 
-@dataclass
+    def has_content(self) -> bool:
+        """Checks whether the content of the page is in memory, so accessing it does not load it.
+
+        Returns:
+            bool: Whether the content is loaded, or the page has no loader.
+        """
+        return _stored_content(self) is not None or self.loader is None
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+
+        names = [item.name for item in fields(self) if item.compare]
+        if self.has_content() and other.has_content():  # type: ignore[attr-defined]
+            names.append("content")
+
+        return all(getattr(self, name) == getattr(other, name) for name in names)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(title={self.title!r}, slug={self.slug!r})"
+
+
+# The slot that holds the content of a page, behind a property that loads the content when it is first accessed.
+_CONTENT: Any = Page.__dict__["content"]
+_stored_content: Callable[[Page], Optional[str]] = _CONTENT.__get__
+_store_content: Callable[[Page, Optional[str]], None] = _CONTENT.__set__
+
+
+def _get_content(page: Page) -> Optional[str]:
+    if not page.has_content():
+        _store_content(page, page.loader())  # type: ignore[misc]
+
+    return _stored_content(page)
+
+
+def _set_content(page: Page, content: Optional[str]) -> None:
+    # Content that is set explicitly is kept, instead of being loaded from the source again
+    _store_content(page, content)
+    page.loader = None
+
+
+Page.content = property(_get_content, _set_content)  # type: ignore[assignment, misc]
+
+
+@dataclass(eq=False, repr=False, slots=True)
 class Post(Page):
     """Extends the PageObject with certain aspects only necessary for post rendering."""
 
     date: str
+
+
+@dataclass
+class ImageVariant:
+    """Defines a resized or re-encoded version of an image in the build."""
+
+    url: str
+    width: int
+    height: int
+    format: str
+
+
+class ImageReference(str):
+    """The URL of an image in the build, which also knows the optimized variants of the image.
+
+    It renders as the URL of the image, so templates can keep using `{{ images['photo.jpg'] }}`. Templates that
+    support responsive images can use `srcset` and `webp_srcset` as well.
+    """
+
+    variants: tuple[ImageVariant, ...]
+
+    def __new__(
+        cls, url: str, variants: Iterable[ImageVariant] = ()
+    ) -> "ImageReference":
+        reference = super().__new__(cls, url)
+        reference.variants = tuple(variants)
+        return reference
+
+    @property
+    def srcset(self) -> str:
+        """The `srcset` of the image in its original format, or just its URL when there are no variants."""
+        return self._srcset(lambda variant: variant.format != "webp") or str(self)
+
+    @property
+    def webp_srcset(self) -> str:
+        """The `srcset` of the WebP variants of the image. Empty when there are no WebP variants."""
+        return self._srcset(lambda variant: variant.format == "webp")
+
+    def _srcset(self, include: Callable[[ImageVariant], bool]) -> str:
+        return ", ".join(
+            f"{variant.url} {variant.width}w"
+            for variant in self.variants
+            if include(variant)
+        )
@@ -1,18 +1,30 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import cached_property
 from typing import Callable, Type, TypeVar, Any
 
 # TypeVar for the generation methods in the Invoker class.
 _T = TypeVar("_T", bound="Invoker")
 
 
+# The module of the invokers of the build stages, see `Invoker.for_stage`.
+BUILD_STAGES_MODULE = "pavo.build"
+
+
 class HookTypes(Enum):
-    """Enum that contains the different types of Pavo hooks."""
+    """Enum that contains the different types of Pavo hooks.
+
+    `BEFORE` and `AFTER` hooks run around a build stage and receive the builder. `POST_PARSE` hooks receive every page
+    and post after it was discovered, and `POST_RENDER` hooks receive every page and post with its rendered HTML. Both
+    can return a replacement, or `None` to keep the value they received.
+    """
 
     BEFORE = auto()
     AFTER = auto()
     CUSTOM = auto()
+    POST_PARSE = auto()
+    POST_RENDER = auto()
 
 
 @dataclass
@@ -34,7 +46,19 @@ class Invoker:
         """
         return cls(module=func.__module__, name=func.__qualname__)
 
-    @property
+    @classmethod
+    def for_stage(cls: Type[_T], stage: str) -> _T:
+        """Creates the Invoker of a build stage, to hook into the build.
+
+        Args:
+            stage (str): The name of the stage, like `discovery`, `images`, `styles`, `pages` or `posts`.
+
+        Returns:
+            Invoker: the Invoker that the hooks of the stage are executed for.
+        """
+        return cls(module=BUILD_STAGES_MODULE, name=stage)
+
+    @cached_property
     def unique_name(self) -> str:
         """Returns the unique name that is given to the Invoker."""
         return f"{self.module}.{self.name}"
@@ -49,7 +73,7 @@ class Hook:
     invoker: Invoker
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
-        self.func(*args, **kwargs)
+        return self.func(*args, **kwargs)
 
 
 class HookManagerInterface(ABC):
@@ -58,15 +82,18 @@ class HookManagerInterface(ABC):
     def __init__(self) -> None:
         self._hooks: dict[str, dict[str, list[Hook]]] = {}
 
+        # The registered hooks by invoker and type, so executing hooks takes a single lookup
+        self._dispatch_table: dict[tuple[str, HookTypes], tuple[Hook, ...]] = {}
+
     @property
     def hooks(self) -> dict[str, dict[str, list[Hook]]]:
         """Getter for the _hooks class variable."""
         return self._hooks
 
     @abstractmethod
-    def register(self, hook: Hook) -> bool:
-        ...
+    def register(self, hook: Hook) -> bool: ...
 
     @abstractmethod
-    def execute(self, type_: HookTypes, invoker: Invoker) -> None:
-        ...
+    def execute(
+        self, type_: HookTypes, invoker: Invoker, *args: Any, **kwargs: Any
+    ) -> None: ...
@@ -1,2 +1,89 @@
-class PluginManagerInterface:
-    pass
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Callable
+
+from pavo.ddl.commands import CommandInterface
+from pavo.ddl.hooks import HookManagerInterface
+
+
+@dataclass
+class PluginCommand:
+    """Describes a command that a plugin provides, so it can be listed without importing the plugin.
+
+    Attributes:
+        name: The name of the command.
+        help: The help text for the command.
+        cls: The name of the CommandInterface class in the plugin module that implements the command.
+        allow_outside_project: Whether the command can be called from outside a project.
+    """
+
+    name: str
+    help: str
+    cls: str
+    allow_outside_project: bool = False
+
+
+@dataclass
+class PluginHook:
+    """Describes a hook that a plugin provides.
+
+    Attributes:
+        type: The name of the HookTypes member of the hook, like `BEFORE` or `POST_RENDER`.
+        stage: The name of the build stage the hook is executed for, see `Invoker.for_stage`.
+        function: The name of the function in the plugin module that implements the hook.
+    """
+
+    type: str
+    stage: str
+    function: str
+
+
+@dataclass
+class Plugin:
+    """Describes a discovered plugin, as declared by the `PAVO_PLUGIN` dictionary in its module.
+
+    Attributes:
+        name: The name of the plugin.
+        module: The name to import the plugin module by.
+        path: The path to the source of the plugin module.
+        hash: The hash of the source of the plugin module.
+        commands: The commands the plugin provides.
+        hooks: The hooks the plugin provides.
+        filters: The Jinja filters the plugin provides, mapping filter names to function names in the plugin module.
+    """
+
+    name: str
+    module: str
+    path: str
+    hash: str
+    commands: list[PluginCommand] = field(default_factory=list)
+    hooks: list[PluginHook] = field(default_factory=list)
+    filters: dict[str, str] = field(default_factory=dict)
+
+
+class PluginManagerInterface(ABC):
+    """Interface for the plugin manager, that discovers plugins and provides their commands, hooks and filters."""
+
+    def __init__(self) -> None:
+        self._plugins: dict[str, Plugin] = {}
+
+    @property
+    def plugins(self) -> dict[str, Plugin]:
+        """Getter for the _plugins class variable."""
+        return self._plugins
+
+    @abstractmethod
+    def discover(self) -> None:
+        """Finds the plugins and reads their declarations."""
+
+    @abstractmethod
+    def commands(self) -> list[CommandInterface]:
+        """Creates the commands that the plugins provide."""
+
+    @abstractmethod
+    def hooks(self) -> HookManagerInterface:
+        """Registers the hooks that the plugins provide to a hook manager."""
+
+    @abstractmethod
+    def filters(self) -> dict[str, Callable]:
+        """Collects the Jinja filters that the plugins provide, by name."""
@@ -4,3 +4,4 @@ The Pavo development server is an internal development server. Do not use in pro
 fixme: This docstring should be extended.
 """
 from pavo.server._server import LocalServer
+from pavo.server._filewatcher import DEFAULT_SETTLE_TIME
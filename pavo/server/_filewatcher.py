@@ -1,28 +1,56 @@
-import time
-from typing import Callable, Any
+import os
+import threading
+from typing import Callable, Any, Optional
 
 import watchdog.events
 
+# The default amount of seconds without new events before the collected changes are handled.
+DEFAULT_SETTLE_TIME = 0.3
+
+# The events that change files. Other events, like files being opened or closed without writing, are ignored.
+_CHANGE_EVENTS = (
+    watchdog.events.EVENT_TYPE_CREATED,
+    watchdog.events.EVENT_TYPE_MODIFIED,
+    watchdog.events.EVENT_TYPE_DELETED,
+    watchdog.events.EVENT_TYPE_MOVED,
+)
+
 
 class FileWatcher(watchdog.events.FileSystemEventHandler):
-    """Inherits from watchdog, watches for any event.
+    """Inherits from watchdog, collects the paths of changed files and handles them once the changes settle.
 
     Args:
-        callback: The callback function to call on any event.
+        callback: The callback function to call with the paths of the files that changed.
+        settle_time (float): The amount of seconds without new events before the callback is called.
 
     Attributes:
-        callback: The callback function to call on any event.
-        last_handled_event: The float of the time the last event was handled.
+        callback: The callback function to call with the paths of the files that changed.
+        settle_time (float): The amount of seconds without new events before the callback is called.
 
     Note:
-        Any event fired within a second of the last event will be backed-off and ignored.
-        This watcher might need a rework with caching in the future.
+        Every event restarts the quiet period, so a burst of events (like a `git checkout`) results in a single call
+        with all changed paths. Events that arrive while the callback runs are kept, and handled in the next call.
+
+        Only events that create, modify, delete or move files are collected. Reading a file, which the build itself
+        does, is not a change.
+
+        Directories that are created or moved in are expanded into the files in them. Directories that are deleted or
+        moved away are reported as their path with a trailing separator, because the files that were in them can no
+        longer be listed.
     """
 
-    def __init__(self, callback: Callable[[], None]) -> None:
+    def __init__(
+        self,
+        callback: Callable[[set[str]], None],
+        settle_time: float = DEFAULT_SETTLE_TIME,
+    ) -> None:
         super().__init__()
-        self.callback: Callable[[], None] = callback
-        self.last_handled_event: float = time.time()
+        self.callback: Callable[[set[str]], None] = callback
+        self.settle_time: float = settle_time
+        self._pending: set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._running: bool = False
+        self._lock: threading.Lock = threading.Lock()
 
     def on_any_event(self, event: Any) -> None:
         """
@@ -31,9 +59,62 @@ class FileWatcher(watchdog.events.FileSystemEventHandler):
         Args:
             event: The event that is being caught.
         """
-        now = time.time()
-        if now - self.last_handled_event < 1:
+        if event.event_type not in _CHANGE_EVENTS:
             return
 
-        self.last_handled_event = now
-        self.callback()
+        if event.is_directory:
+            paths = _directory_paths(event)
+        else:
+            paths = {event.src_path, getattr(event, "dest_path", "")}
+
+        with self._lock:
+            self._pending.update(path for path in paths if path)
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """(Re)starts the quiet period. Must be called while holding the lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        self._timer = threading.Timer(self.settle_time, self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self) -> None:
+        """Calls the callback with all pending paths, unless the callback is still handling earlier changes."""
+        with self._lock:
+            if self._running or not self._pending:
+                # A running callback schedules the pending paths itself once it is done
+                return
+
+            paths, self._pending = self._pending, set()
+            self._timer = None
+            self._running = True
+
+        try:
+            self.callback(paths)
+        finally:
+            with self._lock:
+                self._running = False
+                if self._pending:
+                    self._schedule()
+
+
+def _directory_paths(event: Any) -> set[str]:
+    """Lists the paths that changed because of an event of a directory."""
+    if event.event_type == watchdog.events.EVENT_TYPE_MODIFIED:
+        # Changes to the files in a directory are reported on their own
+        return set()
+
+    paths = set()
+    if event.event_type in (
+        watchdog.events.EVENT_TYPE_DELETED,
+        watchdog.events.EVENT_TYPE_MOVED,
+    ):
+        paths.add(os.path.join(event.src_path, ""))
+
+    directory = getattr(event, "dest_path", "") or event.src_path
+    for root, _, names in os.walk(directory):
+        paths.update(os.path.join(root, name) for name in names)
+
+    return paths
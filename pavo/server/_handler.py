@@ -1,14 +1,55 @@
+import mimetypes
 from typing import Optional, Awaitable
 
 import tornado.web
 
+from pavo.core.output import MemoryOutput
+
+
+class MemoryFileHandler(tornado.web.RequestHandler):
+    """Serves the files of a build that is kept in memory.
+
+    Args:
+        output (MemoryOutput): The output of the build to serve.
+        default_filename (str): The file to serve when a directory is requested.
+    """
+
+    def initialize(  # pylint: disable=arguments-differ
+        self, output: MemoryOutput, default_filename: str = "index.html"
+    ) -> None:
+        """Sets up the handler for a request, with the arguments it was registered with.
+
+        Args:
+            output (MemoryOutput): The output of the build to serve.
+            default_filename (str): The file to serve when a directory is requested.
+        """
+        # pylint: disable=attribute-defined-outside-init
+        self.output: MemoryOutput = output
+        self.default_filename: str = default_filename
 
-class StaticFileHandler(tornado.web.StaticFileHandler):
     def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
         raise NotImplementedError("Intentionally not implemented")
 
-    def set_extra_headers(self, path: str) -> None:
+    def get(self, path: str) -> None:  # pylint: disable=arguments-differ
+        """Serves a file from the build.
+
+        Args:
+            path (str): The requested path, relative to the root of the website.
+        """
+        if path == "" or path.endswith("/"):
+            path = f"{path}{self.default_filename}"
+
+        content = self.output.read(path)
+        if content is None:
+            content = self.output.read(f"{path}/{self.default_filename}")
+            if content is None:
+                raise tornado.web.HTTPError(404)
+
+        content_type, _ = mimetypes.guess_type(path)
+        self.set_header("Content-Type", content_type or "application/octet-stream")
+
         # Disallow any form of caching
         self.set_header(
             "Cache-Control", "no-store, no-cache, must-revalidate, max-age=0"
         )
+        self.write(content)
@@ -3,6 +3,7 @@ import atexit
 import threading
 import asyncio
 import webbrowser
+from typing import Optional
 
 import tornado.ioloop
 import tornado.web
@@ -10,38 +11,62 @@ import tornado.autoreload
 import watchdog.observers
 
 from pavo.core import messages
+from pavo.core.output import MemoryOutput
+from pavo.core.plugins import PluginManager
 from pavo.core.website_builder import WebsiteBuilder
 
 from ._websocket import RefreshWebSocket
-from ._filewatcher import FileWatcher
-from ._handler import StaticFileHandler
+from ._filewatcher import FileWatcher, DEFAULT_SETTLE_TIME
+from ._handler import MemoryFileHandler
 
 
 class LocalServer:
     """Containing class for the development server used in Pavo projects.
 
     Args:
-        build_directory (str): The directory to temporarily keep the build in.
+        build_directory (str): The directory to temporarily keep the working files of the build in.
+        jobs (int): The amount of processes to spread builds over. Defaults to the amount of CPUs.
+        render_workers (int): The amount of threads to render with. Defaults to the amount of jobs.
+        settle_time (float): The amount of seconds without file changes before a rebuild starts.
+        plugin_manager (PluginManager): The plugins to build with. Defaults to no plugins.
 
     Attributes:
         builder (WebsiteBuilder): The builder that is used to build the website that will be served to the user.
+        output (MemoryOutput): The in-memory output the website is built to, used to serve files from.
         project_directory (str): The project directory to monitor for changes.
-        directory (str): The location of the temporary directory of the builder, used to serve files from.
         paths_to_watch (set): The paths to watch for any changes in files.
+        settle_time (float): The amount of seconds without file changes before a rebuild starts.
         server (tornado.web.Application): The actual server that does the heavy work, serving content to the user.
     """
 
-    def __init__(self, build_directory: str) -> None:
-        self.builder: WebsiteBuilder = WebsiteBuilder(build_directory)
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        build_directory: str,
+        jobs: Optional[int] = None,
+        render_workers: Optional[int] = None,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        plugin_manager: Optional[PluginManager] = None,
+    ) -> None:
+        self.output: MemoryOutput = MemoryOutput()
+        self.builder: WebsiteBuilder = WebsiteBuilder(
+            build_directory,
+            jobs=jobs,
+            render_workers=render_workers,
+            output=self.output,
+            hooks=plugin_manager.hooks() if plugin_manager else None,
+            filters=plugin_manager.filters() if plugin_manager else None,
+        )
         self.project_directory: str = os.getcwd()
-        self.directory: str = self.builder.tmp_dir
         self.paths_to_watch: set[str] = {
             f"{self.project_directory}/_data/",
             f"{self.project_directory}/_pages/",
             f"{self.project_directory}/_posts/",
             f"{self.project_directory}/_static/templates/",
             f"{self.project_directory}/_static/styles/",
+            f"{self.project_directory}/_static/images/",
+            f"{self.project_directory}/_static/public/",
         }
+        self.settle_time: float = settle_time
 
         atexit.register(messages.success, "Shut down development server.")
 
@@ -50,8 +75,8 @@ class LocalServer:
                 (r"/ws$", RefreshWebSocket),
                 (
                     r"/(.*)$",
-                    StaticFileHandler,
-                    {"path": self.directory, "default_filename": "index.html"},
+                    MemoryFileHandler,
+                    {"output": self.output, "default_filename": "index.html"},
                 ),
             ]
         )
@@ -73,11 +98,20 @@ class LocalServer:
             messages.warning("Detected request to stop server. Please wait.")
             tornado.ioloop.IOLoop().stop()
 
-    def _rebuild_website(self) -> None:
-        """Triggers a build to the temporary directory on detection of changes to the project."""
+    def _rebuild_website(self, paths: set[str]) -> None:
+        """Triggers a rebuild to the temporary directory on detection of changes to the project.
+
+        Args:
+            paths (set): The paths of the files that changed.
+        """
         asyncio.set_event_loop(asyncio.new_event_loop())
         messages.header("Detected changes, rebuilding project.")
-        self.builder.build(False)
+        try:
+            self.builder.rebuild(paths)
+        except Exception:  # pylint: disable=broad-except
+            # The builder already reported the error, keep watching so the next save can fix it
+            return
+
         asyncio.run(RefreshWebSocket.refresh())
 
     def _run_tornado(self) -> None:
@@ -88,9 +122,12 @@ class LocalServer:
 
     def _run_watcher(self) -> None:
         observer = watchdog.observers.Observer()
-        event_handler = FileWatcher(self._rebuild_website)
+        event_handler = FileWatcher(self._rebuild_website, self.settle_time)
 
         for path in self.paths_to_watch:
+            if not os.path.isdir(path):
+                continue
+
             observer.schedule(event_handler, path, True)
 
         observer.start()
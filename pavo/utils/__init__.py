@@ -3,6 +3,7 @@ These helper methods are used throughout the Pavo ecosystem to help the process
 You could use these in your plugins or custom scripts. To do so, it is highly recommended importing the
 used types of utils from the __init__.py.
 """
+import pavo.utils._cache as cache
 import pavo.utils._config as config
 import pavo.utils._context as context
 import pavo.utils._files as files
@@ -0,0 +1,165 @@
+import os
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional
+
+from . import _context as context
+
+# All caches that Pavo keeps between builds live in this directory, relative to the project root.
+CACHE_DIRECTORY = ".pavocache"
+
+# The directories in the cache directory that only hold reusable build artifacts. Clearing them is always safe, unlike
+# clearing the state next to them, such as the build manifest and the previous build.
+ARTIFACT_CACHES = ("markdown", "images", "styles", "compress", "minify", "jinja")
+
+
+def cache_path(*parts: str) -> str:
+    """Builds a path inside the project cache directory.
+
+    Args:
+        *parts (str): The path components inside the cache directory.
+
+    Returns:
+        str: The path inside the cache directory.
+    """
+    return os.path.join(CACHE_DIRECTORY, *parts)
+
+
+def ensure_cache_directory(*parts: str) -> str:
+    """Creates a directory inside the project cache directory, if it does not exist yet.
+
+    Args:
+        *parts (str): The path components of the directory inside the cache directory.
+
+    Returns:
+        str: The path to the directory.
+    """
+    path = cache_path(*parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class DiskCache:
+    """A persistent, size-bounded store for build artifacts, that evicts the least recently used entries.
+
+    Every entry is stored in its own file, named after its key. Entries are written atomically, so the cache can be
+    shared by the worker processes of a build.
+
+    Args:
+        directory (str): The directory to store the entries in.
+        max_size (int): The maximum total size of the entries in bytes. When 0, the size is not bounded.
+
+    Attributes:
+        directory (str): The directory to store the entries in.
+        max_size (int): The maximum total size of the entries in bytes.
+    """
+
+    def __init__(self, directory: str, max_size: int = 0) -> None:
+        self.directory: str = directory
+        self.max_size: int = max_size
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Creates a cache key from all values that influence the cached artifact.
+
+        Args:
+            *parts (str): The values the artifact depends on, like the hash of the source and the build settings.
+
+        Returns:
+            str: The key for the artifact.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retrieves an entry from the cache, and marks it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            bytes: The cached content, or `None` when the entry is not in the cache.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return content
+
+    def set(self, key: str, content: bytes) -> None:
+        """Stores an entry in the cache.
+
+        Args:
+            key (str): The key of the entry.
+            content (bytes): The content to store.
+        """
+        with self.writer(key) as file:
+            file.write(content)
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        """Opens an entry of the cache to write its content in parts. The entry is only stored when writing succeeds.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Iterator: The file to write the content of the entry to.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary_path, "wb") as file:
+                yield file
+            os.replace(temporary_path, path)
+        finally:
+            with context.Expects([FileNotFoundError]):
+                os.remove(temporary_path)
+
+    def prune(self) -> int:
+        """Evicts the least recently used entries, until the cache fits its maximum size.
+
+        Returns:
+            int: The amount of evicted entries.
+        """
+        if self.max_size <= 0 or not os.path.isdir(self.directory):
+            return 0
+
+        entries = []
+        total_size = 0
+        for directory, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                stat = os.stat(os.path.join(directory, file_name))
+                entries.append((stat.st_mtime_ns, stat.st_size, file_name, directory))
+                total_size += stat.st_size
+
+        evicted = 0
+        for _, size, file_name, directory in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            with context.Expects([FileNotFoundError]):
+                os.remove(os.path.join(directory, file_name))
+            total_size -= size
+            evicted += 1
+
+        return evicted
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, key: str) -> str:
+        """Finds the file of an entry. Entries are spread over subdirectories, to keep directories small."""
+        return os.path.join(self.directory, key[:2], key)
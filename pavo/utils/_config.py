@@ -1,7 +1,172 @@
+import os
+import threading
 from functools import reduce
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Optional, Type, TypeVar
+
 import yaml
 
+# TypeVar for the typed lookups in the Config class.
+_T = TypeVar("_T")
+
+# The libyaml bindings are a lot faster than the pure Python loader, but are not available on every installation.
+_Loader = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+CONFIG_FILE = "pavoconfig.yaml"
+
+# Sentinel to distinguish missing keys from keys that are explicitly set to a falsy value.
+_MISSING = object()
+
+# The read-only types that the containers of the configuration are returned as, by the type they are parsed as.
+_FROZEN_TYPES: dict[type, type] = {dict: MappingProxyType, list: tuple}
+
+
+class Config:
+    """In-memory view of a Pavo configuration file, that is only parsed again when the file changes on disk.
+
+    Args:
+        path (str): The path to the configuration file.
+
+    Attributes:
+        path (str): The absolute path to the configuration file.
+
+    Note:
+        The file is checked for changes (by modification time and size) on every lookup, so that long-running
+        processes like the development server pick up edits. Lookups themselves are served from memory.
+
+        Lookups are shared by every caller, so dictionaries and lists are returned as read-only mappings and tuples.
+        Use `thaw` to get a copy that can be modified, which is what `get_config_value` returns.
+    """
+
+    def __init__(self, path: str = CONFIG_FILE) -> None:
+        self.path: str = os.path.abspath(path)
+        self._signature: Optional[tuple[int, int]] = None
+        self._values: Any = None
+        self._lookups: dict[str, Any] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, keys: str, default: Any = "") -> Any:
+        """Retrieves a (nested) value from the configuration.
+
+        Args:
+            keys (str): The string of (nested) dictionary values, separated by '.'.
+            default (Any): The value to return when the key could not be found. Defaults to an empty string.
+
+        Raises:
+            FileNotFoundError: The configuration file does not exist.
+
+        Returns:
+            The value in the configuration, or the default if not found in the configuration.
+        """
+        self._refresh()
+        try:
+            value = self._lookups[keys]
+        except KeyError:
+            # Look up under the lock, so a reload can not leave a lookup of the previous file behind
+            with self._lock:
+                value = _freeze(
+                    reduce(
+                        lambda d, key: (
+                            d.get(key, _MISSING) if isinstance(d, dict) else _MISSING
+                        ),
+                        keys.split("."),
+                        self._values,
+                    )
+                )
+                self._lookups[keys] = value
+
+        return default if value is _MISSING else value
+
+    def get_as(self, keys: str, type_: Type[_T], default: _T) -> _T:
+        """Retrieves a (nested) value from the configuration, if it is of the expected type.
+
+        Dictionaries and lists are of the expected type when they are expected as `dict` or `list`, but are returned
+        as read-only mappings and tuples.
+
+        Args:
+            keys (str): The string of (nested) dictionary values, separated by '.'.
+            type_ (Type): The type the value is expected to be.
+            default: The value to return when the key is missing or the value is of another type.
+
+        Returns:
+            The value in the configuration, or the default if missing or of an unexpected type.
+        """
+        value = self.get(keys, default)
+
+        # Booleans are integers in Python, but a boolean is never a valid value for a numeric setting.
+        if isinstance(value, bool) and type_ is not bool:
+            return default
+
+        expected = isinstance(value, (type_, _FROZEN_TYPES.get(type_, type_)))
+        return value if expected else default
+
+    def _refresh(self) -> None:
+        """Parses the configuration file again, if it has changed since it was last loaded."""
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        with self._lock:
+            if signature == self._signature:
+                return
+
+            with open(self.path, "r", encoding="utf-8") as file:
+                values = yaml.load(file, Loader=_Loader)
+
+            self._values = values
+            self._lookups = {}
+            self._signature = signature
+
+
+def _freeze(value: Any) -> Any:
+    """Converts the dictionaries and lists in a value to read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Copies a value of the configuration into dictionaries and lists that can be modified.
+
+    Args:
+        value (Any): The value, as returned by a lookup.
+
+    Returns:
+        The value with its read-only mappings and tuples converted to dictionaries and lists.
+    """
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+
+    return value
+
+
+_configs: dict[str, Config] = {}
+
+
+def get_config(path: str = CONFIG_FILE) -> Config:
+    """Retrieves the shared Config object for a configuration file, creating it when necessary.
+
+    Args:
+        path (str): The path to the configuration file. Defaults to the file in the current directory.
+
+    Returns:
+        Config: The configuration object belonging to the file.
+    """
+    absolute_path = os.path.abspath(path)
+    config = _configs.get(absolute_path)
+    if config is None:
+        config = _configs.setdefault(absolute_path, Config(absolute_path))
+
+    return config
+
 
 def get_config_value(keys: str) -> Any:
     """Retrieves a configuration value from the Pavo configuration file.
@@ -14,14 +179,9 @@ def get_config_value(keys: str) -> Any:
         foo.bar will be looked up as: `config[foo][bar]`.
         A value can have any default Yaml scalar type and will be loaded as its Python equivalent.
 
+        Dictionaries and lists are returned as copies, which can be modified and serialized.
+
     Returns:
         The value in the configuration, empty string if not found in the configuration.
     """
-    with open("pavoconfig.yaml", "r", encoding="utf-8") as file:
-        config = yaml.load(file, Loader=yaml.FullLoader)
-
-    return reduce(
-        lambda d, key: d.get(key, "") if isinstance(d, dict) else "",
-        keys.split("."),
-        config,
-    )
+    return thaw(get_config().get(keys))
@@ -1,8 +1,13 @@
 import os
+import json
 import shutil
+import hashlib
+from typing import Optional, Any
+
 import markdown2
 
-from ._config import get_config_value
+from . import _config
+from ._cache import DiskCache
 
 
 def set_dir(directory: str) -> bool:
@@ -63,7 +68,11 @@ def load_files(path: str) -> dict[str, str]:
     return files
 
 
-def convert_md_to_html(markdown: str) -> str:
+def convert_md_to_html(
+    markdown: str,
+    extras: Optional[list[str]] = None,
+    cache: Optional[DiskCache] = None,
+) -> str:
     """Translates raw markdown into ready html code.
 
     This method uses the markdown build configuration value in the pavoconfig.yaml file, which tells this method
@@ -71,13 +80,87 @@ def convert_md_to_html(markdown: str) -> str:
 
     Args:
         markdown (str): The Markdown code to be translated to HTML.
+        extras (list): The markdown extras to use. When `None`, the extras are read from the configuration.
+        cache (DiskCache): The cache to reuse previous translations from. The cache is keyed by the markdown, the
+            extras and the version of the markdown engine.
 
     Returns:
         str: The html that was built from the markdown.
     """
-    html = markdown2.markdown(
-        markdown, extras=get_config_value("build.markdown.extras")
-    )
+    if extras is None:
+        extras = _config.get_config_value("build.markdown.extras")
+
+    key = ""
+    if cache is not None:
+        key = cache.key(markdown, json.dumps(extras), markdown2.__version__)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached.decode("utf-8")
+
+    html = markdown2.markdown(markdown, extras=extras)
     html = html.replace("\n\n", "\n").rstrip()
 
+    if cache is not None:
+        cache.set(key, html.encode("utf-8"))
+
     return str(html)
+
+
+def hash_content(content: bytes | str) -> str:
+    """Creates a hexadecimal digest of a piece of content, used to detect changes between builds.
+
+    Args:
+        content (bytes | str): The content to hash. Strings are encoded as UTF-8 first.
+
+    Returns:
+        str: The digest of the content.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    digest = content_hasher()
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def content_hasher() -> "hashlib.blake2b":
+    """Creates a hash object to digest content that arrives in parts, like a page that is rendered in chunks.
+
+    Returns:
+        hashlib.blake2b: The hash object, of which the hexadecimal digest equals `hash_content` of the same bytes.
+    """
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_file_signature(path: str, known: Optional[list[Any]] = None) -> list[Any]:
+    """Hashes a file, unless its modification time and size still match those of a previous hash.
+
+    Args:
+        path (str): The path to the file to hash.
+        known (list): The result of hashing the file before, if any.
+
+    Returns:
+        list: The modification time (in nanoseconds), size and digest of the file, to pass as `known` next time.
+    """
+    stat = os.stat(path)
+    if known is not None and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+        return known
+
+    return [stat.st_mtime_ns, stat.st_size, hash_file(path)]
+
+
+def hash_file(path: str) -> str:
+    """Creates a hexadecimal digest of the contents of a file, without loading the whole file in memory.
+
+    Args:
+        path (str): The path to the file to hash.
+
+    Returns:
+        str: The digest of the file contents, equal to `hash_content` of the same bytes.
+    """
+    digest = content_hasher()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
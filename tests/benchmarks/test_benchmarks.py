@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from benchmarks import run
+from benchmarks.generate import SCALES, generate_project
+
+
+def test_generated_project(tmp_path) -> None:
+    generate_project(str(tmp_path), SCALES["tiny"])
+    assert len(os.listdir(tmp_path / "_posts")) == 10
+    assert len(os.listdir(tmp_path / "_pages")) == 4
+    assert (tmp_path / "_static/templates/layout-1.html").exists()
+    assert (tmp_path / "_static/images/image-0.png").read_bytes().startswith(b"\x89PNG")
+
+
+def test_benchmarks_compare_to_baselines() -> None:
+    timings = run.run_benchmarks("tiny", repeat=1, jobs=1)
+    assert {"build_cold", "build_warm", "dispatch_cold", "rebuild_post"} <= set(timings)
+
+    baseline = {name: seconds * 2 for name, seconds in timings.items()}
+    assert not run.compare(timings, baseline, 0.25)
+    baseline["build_cold"] = timings["build_cold"] / 2
+    assert run.compare(timings, baseline, 0.25) == ["build_cold"]
+
+
+def test_baselines_are_only_compared_on_the_same_machine(tmp_path) -> None:
+    path = str(tmp_path / "baselines.json")
+    machine = run.fingerprint(jobs=1)
+    assert not run.load_baseline("tiny", machine, path)
+
+    run.store_baseline("tiny", machine, {"build_cold": 1.23456}, path)
+    assert run.load_baseline("tiny", machine, path) == {"build_cold": 1.2346}
+    assert not run.load_baseline("small", machine, path)
+    with pytest.raises(ValueError):
+        run.load_baseline("tiny", run.fingerprint(jobs=2), path)
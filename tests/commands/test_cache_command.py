@@ -0,0 +1,25 @@
+import argparse
+
+from pavo.commands import Cache
+from pavo.utils import cache
+
+
+def test_cache_clear_keeps_the_build_state(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    for name in cache.ARTIFACT_CACHES:
+        cache.DiskCache(cache.cache_path(name)).set("key", b"artifact")
+    cache.ensure_cache_directory("build")
+    for name in ("manifest.json", "dispatch.json", "build/index.html"):
+        with open(cache.cache_path(name), "w", encoding="utf-8") as file:
+            file.write("{}")
+
+    Cache().run(argparse.Namespace(action="clear"))
+
+    for name in cache.ARTIFACT_CACHES:
+        assert cache.DiskCache(cache.cache_path(name)).get("key") is None
+    assert sorted(path.name for path in (tmp_path / ".pavocache").iterdir()) == [
+        "build",
+        "dispatch.json",
+        "manifest.json",
+    ]
+    assert (tmp_path / ".pavocache" / "build" / "index.html").exists()
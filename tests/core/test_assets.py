@@ -0,0 +1,44 @@
+from pavo.core.assets import AssetManifest, ASSET_MANIFEST
+from pavo.core.manifest import BuildManifest
+from pavo.core.output import MemoryOutput
+
+
+def test_asset_manifest() -> None:
+    assets = AssetManifest(enabled=True)
+
+    assert assets.path("styles/main.css", "3f9a1c04e2ffff") == (
+        "styles/main.3f9a1c04e2.css",
+        None,
+    )
+    assert assets.path("styles/main.css", "0123456789ffff") == (
+        "styles/main.0123456789.css",
+        "styles/main.3f9a1c04e2.css",
+    )
+    assert assets.resolve("/styles/main.css") == "/styles/main.0123456789.css"
+    assert assets.resolve("styles/main.css") == "styles/main.0123456789.css"
+    assert assets.resolve("./robots.txt") == "./robots.txt"
+    assert AssetManifest.parse(assets.to_json()) == assets.assets
+
+
+def test_disabled_asset_manifest() -> None:
+    assets = AssetManifest()
+
+    assert assets.path("styles/main.css", "3f9a1c04e2") == ("styles/main.css", None)
+    assert assets.resolve("styles/main.css") == "styles/main.css"
+    assert assets.resolve("/styles/main.css") == "/styles/main.css"
+    assert AssetManifest.parse(b"not json") == {}
+    assert AssetManifest.parse(None) == {}
+
+
+def test_write_asset_manifest() -> None:
+    output = MemoryOutput()
+    manifest = BuildManifest()
+    AssetManifest().write(manifest, output)
+    assert not output.exists(ASSET_MANIFEST)
+
+    assets = AssetManifest(enabled=True)
+    assets.path("styles/main.css", "3f9a1c04e2ffff")
+    assets.write(manifest, output)
+
+    assert AssetManifest.parse(output.read(ASSET_MANIFEST)) == assets.assets
+    assert manifest.output_hash(ASSET_MANIFEST) is not None
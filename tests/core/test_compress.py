@@ -0,0 +1,39 @@
+import gzip
+
+import pytest
+
+from pavo.core import compress
+from pavo.core.output import MemoryOutput
+from pavo.utils import cache
+
+
+def test_compress_outputs(tmp_path) -> None:
+    output = MemoryOutput()
+    output.write("index.html", b"<p>Hello</p>" * 200)
+    output.write("small.css", b"a{}")
+    compress_cache = cache.DiskCache(str(tmp_path))
+    outputs = {("index.html", "gzip"): "large", ("small.css", "gzip"): "small"}
+
+    compressed = compress.compress_outputs(outputs, output, compress_cache, 100)
+    assert gzip.decompress(compressed[("index.html", "gzip")]) == output.read(
+        "index.html"
+    )
+    assert compressed[("small.css", "gzip")] is None
+
+    # Variants of content that was compressed before are reused from the cache
+    output.remove("index.html")
+    output.remove("small.css")
+    assert compress.compress_outputs(outputs, output, compress_cache, 100) == compressed
+
+
+def test_gzip_variants_are_reproducible() -> None:
+    content = b"body { color: red; }" * 100
+    assert compress.compress_content(content, "gzip") == compress.compress_content(
+        content, "gzip"
+    )
+
+
+def test_brotli_variants() -> None:
+    brotli = pytest.importorskip("brotli")
+    content = b"body { color: red; }" * 100
+    assert brotli.decompress(compress.compress_content(content, "brotli")) == content
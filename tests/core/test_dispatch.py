@@ -0,0 +1,52 @@
+import os
+import json
+import pathlib
+
+from pavo.core.dispatch import Dispatcher, write_changes
+
+
+def _write(directory: pathlib.Path, files: dict[str, str]) -> None:
+    for path, content in files.items():
+        (directory / path).parent.mkdir(parents=True, exist_ok=True)
+        (directory / path).write_text(content, encoding="utf-8")
+
+
+def test_dispatch_only_writes_differences(tmp_path) -> None:
+    build, out = tmp_path / "build", tmp_path / "out"
+    _write(build, {"index.html": "new", "same.html": "same", "posts/a.html": "a"})
+    _write(out, {"index.html": "old", "same.html": "same", "gone/b.html": "b"})
+    os.utime(out / "same.html", ns=(0, 0))
+
+    state = str(tmp_path / "dispatch.json")
+    dispatcher = Dispatcher(str(build), str(out), state)
+    diff = dispatcher.diff()
+    assert diff.added == ["posts/a.html"]
+    assert diff.changed == ["index.html"]
+    assert diff.removed == ["gone/b.html"]
+
+    dispatcher.apply(diff)
+    assert (out / "index.html").read_text() == "new"
+    assert (out / "posts/a.html").read_text() == "a"
+    assert not (out / "gone").exists()
+    assert os.stat(out / "same.html").st_mtime_ns == 0
+
+    # The hashes of the output directory are persisted, so nothing differs on the next dispatch
+    diff = Dispatcher(str(build), str(out), state).diff()
+    assert not diff.added and not diff.changed and not diff.removed
+
+    write_changes(diff, str(tmp_path / "changes.json"))
+    assert json.loads((tmp_path / "changes.json").read_text()) == {
+        "added": [],
+        "changed": [],
+        "removed": [],
+    }
+
+
+def test_atomic_dispatch(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    build, out = tmp_path / "build", tmp_path / "out"
+    _write(build, {"index.html": "new"})
+    _write(out, {"old.html": "old"})
+
+    Dispatcher(str(build), str(out)).swap()
+    assert sorted(os.listdir(out)) == ["index.html"]
@@ -0,0 +1,31 @@
+import pytest
+
+from pavo.core.exceptions import FunctionAlreadyRegisteredException
+from pavo.core.hooks import HookManager
+from pavo.ddl.hooks import Hook, HookTypes, Invoker
+
+
+def test_hooks_are_executed_with_arguments() -> None:
+    calls = []
+    manager = HookManager()
+    invoker = Invoker.for_stage("pages")
+    hook = Hook(lambda builder: calls.append(builder), HookTypes.BEFORE, invoker)
+    manager.register(hook)
+
+    manager.execute(HookTypes.BEFORE, invoker, "builder")
+    manager.execute(HookTypes.AFTER, invoker, "builder")
+    manager.execute(HookTypes.BEFORE, Invoker.for_stage("posts"), "builder")
+    assert calls == ["builder"]
+    assert manager.hooks_for(HookTypes.BEFORE, Invoker.for_stage("pages")) == (hook,)
+    assert manager.hooks_for(HookTypes.AFTER, invoker) == ()
+
+    with pytest.raises(FunctionAlreadyRegisteredException):
+        manager.register(hook)
+
+
+def test_hooks_return_their_result() -> None:
+    def upper(html: str) -> str:
+        return html.upper()
+
+    hook = Hook(upper, HookTypes.CUSTOM, Invoker.from_callable(upper))
+    assert hook("html") == "HTML"
@@ -0,0 +1,47 @@
+import pytest
+
+from pavo.core import images
+from pavo.ddl.build import ImageReference, ImageVariant
+from pavo.utils import cache
+
+
+def test_image_reference() -> None:
+    reference = ImageReference(
+        "./images/photo.jpg",
+        [
+            ImageVariant("./images/photo.jpg", 1000, 500, "jpeg"),
+            ImageVariant("./images/photo.webp", 1000, 500, "webp"),
+            ImageVariant("./images/photo-480w.jpg", 480, 240, "jpeg"),
+        ],
+    )
+
+    assert reference == "./images/photo.jpg"
+    assert f"{reference}" == "./images/photo.jpg"
+    assert reference.srcset == "./images/photo.jpg 1000w, ./images/photo-480w.jpg 480w"
+    assert reference.webp_srcset == "./images/photo.webp 1000w"
+    assert ImageReference("./images/logo.svg").srcset == "./images/logo.svg"
+
+
+def test_optimize_image(tmp_path) -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    image_module.new("RGB", (1000, 500), (255, 0, 0)).save(tmp_path / "photo.jpg")
+    image_cache = cache.DiskCache(str(tmp_path / "cache"))
+    settings = {"widths": [480, 2000], "quality": 80, "webp": True}
+
+    assert images.cached_variants(image_cache, "digest", settings) is None
+    variants = images.optimize_image(
+        str(tmp_path / "photo.jpg"),
+        "photo.jpg",
+        "digest",
+        settings,
+        image_cache.directory,
+    )
+
+    assert [(variant.name, variant.width, variant.height) for variant in variants] == [
+        ("photo.jpg", 1000, 500),
+        ("photo.webp", 1000, 500),
+        ("photo-480w.jpg", 480, 240),
+        ("photo-480w.webp", 480, 240),
+    ]
+    assert images.cached_variants(image_cache, "digest", settings) == variants
+    assert all(image_cache.get(variant.key) for variant in variants)
@@ -0,0 +1,45 @@
+from pavo.core import minify
+from pavo.core.minify import HTMLMinifier
+
+
+def test_minify_html() -> None:
+    html = (
+        "<!DOCTYPE html>\n<html>\n  <head>\n    <!-- comment -->\n"
+        "    <title> Title </title>\n"
+        "    <script>\n      if (a <  b) { x('  </div>'); }\n    </script>\n"
+        "  </head>\n  <body class='a   b'>\n"
+        "    <ul>\n      <li>One</li>\n      <li>Two <a href='#'>link</a> <em>em</em></li>\n    </ul>\n"
+        "    <p>Fish &amp; chips</p>\n    <p>Second</p>\n    <div>Block</div>\n"
+        "    <pre>\n  keep   this\n</pre>\n"
+        "    <textarea> a\n  b </textarea>\n"
+        "  </body>\n</html>\n"
+    )
+
+    assert minify.minify_html(html) == (
+        "<!DOCTYPE html><html><head><title>Title</title>"
+        "<script>\n      if (a <  b) { x('  </div>'); }\n    </script>"
+        "</head><body class='a   b'>"
+        "<ul><li>One<li>Two <a href='#'>link</a> <em>em</em></ul>"
+        "<p>Fish &amp; chips<p>Second<div>Block</div>"
+        "<pre>\n  keep   this\n</pre> <textarea> a\n  b </textarea></body></html>"
+    )
+
+    # Feeding the HTML in chunks gives the same result
+    minifier = HTMLMinifier()
+    chunks = [
+        minifier.minify(html[start : start + 5]) for start in range(0, len(html), 5)
+    ]
+    assert "".join(chunks) + minifier.finish() == minify.minify_html(html)
+
+
+def test_optional_end_tags_are_kept_before_text() -> None:
+    assert (
+        minify.minify_html("<p>One</p>Two<p>Three</p>") == "<p>One</p>Two<p>Three</p>"
+    )
+    assert minify.minify_html("<a><p>One</p></a>") == "<a><p>One</p></a>"
+
+
+def test_minified_chunks() -> None:
+    html = "<ul>\n  <li>One</li>\n  <li>Two</li>\n</ul>\n<pre>  Kept  </pre>"
+    chunks = [html[start : start + 3] for start in range(0, len(html), 3)]
+    assert "".join(minify.minify_chunks(chunks)) == minify.minify_html(html)
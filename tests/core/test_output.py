@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from pavo.core.output import DiskOutput, MemoryOutput
+
+
+def test_streamed_outputs(tmp_path) -> None:
+    disk_output = DiskOutput(str(tmp_path))
+    memory_output = MemoryOutput()
+    for output in (disk_output, memory_output):
+        output.write_stream("posts/post.html", iter([b"<p>", b"Hello", b"</p>"]))
+        assert output.read("posts/post.html") == b"<p>Hello</p>"
+
+
+def test_failed_stream_keeps_previous_output(tmp_path) -> None:
+    output = DiskOutput(str(tmp_path))
+    output.write("index.html", b"Previous")
+
+    def chunks():
+        yield b"Partial"
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        output.write_stream("index.html", chunks())
+    assert output.read("index.html") == b"Previous"
+    assert os.listdir(tmp_path) == ["index.html"]
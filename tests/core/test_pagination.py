@@ -0,0 +1,49 @@
+from pavo.core import pagination
+from pavo.ddl.build import Page
+
+
+def test_pagination_urls() -> None:
+    assert pagination.pagination_urls("/index.html", 3) == [
+        "/index.html",
+        "/page/2.html",
+        "/page/3.html",
+    ]
+    assert pagination.pagination_urls("/blog.html", 2) == [
+        "/blog.html",
+        "/blog/page/2.html",
+    ]
+    assert pagination.pagination_urls("/blog.html", 1) == ["/blog.html"]
+
+
+def test_paginate() -> None:
+    page = Page(content="", title="Blog", metadata={"paginate": 2}, slug="/blog.html")
+    posts = ("a", "b", "c", "d", "e")
+
+    pages = pagination.paginate(page, posts, pagination.page_size(page) or 0)
+
+    assert [item.slug for item in pages] == [
+        "/blog.html",
+        "/blog/page/2.html",
+        "/blog/page/3.html",
+    ]
+    assert [item.paginator.items for item in pages] == [("a", "b"), ("c", "d"), ("e",)]
+    assert pages[1].paginator.previous_url == "/blog.html"
+    assert pages[1].paginator.next_url == "/blog/page/3.html"
+    assert pages[0].paginator.previous_url is None
+    assert pages[2].paginator.next_url is None
+    assert page.paginator is None
+
+
+def test_invalid_page_size_is_ignored() -> None:
+    for per_page in (0, -1, True, "2"):
+        page = Page(
+            content="", title="Blog", metadata={"paginate": per_page}, slug="/blog.html"
+        )
+        assert pagination.page_size(page) is None
+
+    assert (
+        pagination.page_size(
+            Page(content="", title="Blog", metadata={}, slug="/blog.html")
+        )
+        is None
+    )
@@ -0,0 +1,121 @@
+import argparse
+import pathlib
+import sys
+
+import pytest
+from jinja2 import Environment
+
+from pavo.core import plugins
+from pavo.core.plugins import PluginManager, PROJECT_PACKAGE
+from pavo.ddl.hooks import HookTypes, Invoker
+
+PLUGIN = """
+import dataclasses
+
+from pavo.ddl.commands import CommandInterface
+
+PAVO_PLUGIN = {
+    "name": "shout",
+    "commands": [{"name": "shout", "help": "Shouts a word.", "class": "Shout"}],
+    "hooks": [{"type": "POST_RENDER", "stage": "pages", "function": "mark"}],
+    "filters": {"shout": "shout"},
+}
+
+IMPORTS = []
+IMPORTS.append(__name__)
+
+
+@dataclasses.dataclass
+class Shout(CommandInterface):
+    name: str = "shout"
+    help: str = "Shouts a word."
+    allow_outside_project: bool = True
+
+    def run(self, args):
+        IMPORTS.append(args.word.upper())
+
+    def setup_parser(self, parser):
+        parser.add_argument("--word", default="hi")
+
+
+def mark(page, html):
+    return f"{html}<!-- {page} -->"
+
+
+def shout(value):
+    return str(value).upper()
+"""
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path) -> pathlib.Path:
+    monkeypatch.chdir(tmp_path)
+    pathlib.Path("_plugins/helpers").mkdir(parents=True)
+    pathlib.Path("_plugins/shout.py").write_text(PLUGIN, encoding="utf-8")
+    pathlib.Path("_plugins/helpers/__init__.py").write_text("VALUE = 1\n")
+    yield tmp_path
+    for name in list(sys.modules):
+        if name.startswith(PROJECT_PACKAGE):
+            del sys.modules[name]
+
+
+def test_plugins_are_discovered_without_importing(project, monkeypatch) -> None:
+    manager = PluginManager(manifest_path=".pavocache/plugins.json", entry_points=False)
+    manager.discover()
+
+    assert list(manager.plugins) == ["shout"]
+    assert manager.plugins["shout"].module == f"{PROJECT_PACKAGE}.shout"
+    assert [command.name for command in manager.commands()] == ["shout"]
+    assert list(manager.filters()) == ["shout"]
+    assert manager.hooks().hooks_for(HookTypes.POST_RENDER, Invoker.for_stage("pages"))
+    assert f"{PROJECT_PACKAGE}.shout" not in sys.modules
+
+    # Unchanged plugins are discovered from the manifest, without reading their source again
+    def read_declaration(*args):
+        raise AssertionError("The declaration should be cached.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(plugins, "_read_declaration", read_declaration)
+        cached = PluginManager(
+            manifest_path=".pavocache/plugins.json", entry_points=False
+        )
+        cached.discover()
+        assert cached.plugins == manager.plugins
+
+    pathlib.Path("_plugins/shout.py").write_text(
+        PLUGIN.replace('"name": "shout"', '"name": "loud"'), encoding="utf-8"
+    )
+    cached.discover()
+    assert list(cached.plugins) == ["loud"]
+
+
+def test_plugins_are_imported_once_used(project) -> None:
+    manager = PluginManager(entry_points=False)
+    manager.discover()
+    hooks = manager.hooks()
+    environment = Environment()
+    environment.filters.update(manager.filters())
+    (command,) = manager.commands()
+
+    (hook,) = hooks.hooks_for(HookTypes.POST_RENDER, Invoker.for_stage("pages"))
+    assert hook("index", "<p>") == "<p><!-- index -->"
+    assert environment.from_string("{{ 'hi' | shout }}").render() == "HI"
+
+    parser = argparse.ArgumentParser()
+    command.setup_parser(parser)
+    command.run(parser.parse_args(["--word", "hey"]))
+
+    module = sys.modules[f"{PROJECT_PACKAGE}.shout"]
+    assert module.IMPORTS == [f"{PROJECT_PACKAGE}.shout", "HEY"]
+
+
+def test_invalid_plugins_are_ignored(project) -> None:
+    pathlib.Path("_plugins/shout.py").write_text(
+        PLUGIN.replace('"type": "POST_RENDER"', '"type": "SOMETIMES"'),
+        encoding="utf-8",
+    )
+    pathlib.Path("_plugins/broken.py").write_text("PAVO_PLUGIN = dict(name=1)\n")
+    manager = PluginManager(entry_points=False)
+    manager.discover()
+
+    assert not manager.plugins
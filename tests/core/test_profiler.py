@@ -0,0 +1,38 @@
+import json
+
+from pavo.core.profiler import BuildProfiler
+
+
+def test_disabled_profiler_measures_nothing() -> None:
+    profiler = BuildProfiler()
+    with profiler.stage("pages"):
+        with profiler.file("render", "index.html", "index"):
+            pass
+    profiler.record_file("markdown", "_pages/index.md", 0.1)
+
+    assert not profiler.stages
+    assert not profiler.files
+
+
+def test_profile_report_and_trace(tmp_path) -> None:
+    profiler = BuildProfiler(enabled=True)
+    with profiler.stage("pages"):
+        with profiler.file("render", "index.html", "index"):
+            bytearray(1024 * 1024)
+    profiler.record_file("markdown", "_pages/index.md", 0.1)
+    profiler.stop()
+
+    assert [stage.name for stage in profiler.stages] == ["pages"]
+    assert profiler.stages[0].peak_memory >= 1024 * 1024
+    report_path, trace_path = profiler.write(str(tmp_path))
+    with open(report_path, encoding="utf-8") as file:
+        report = json.load(file)
+    with open(trace_path, encoding="utf-8") as file:
+        trace = json.load(file)
+
+    assert [timing["name"] for timing in report["files"]] == [
+        "_pages/index.md",
+        "index.html",
+    ]
+    assert report["templates"]["index"]["renders"] == 1
+    assert [event["name"] for event in trace["traceEvents"]] == ["pages", "index.html"]
@@ -0,0 +1,53 @@
+from pavo.core import purge
+from pavo.core.output import DiskOutput, MemoryOutput
+from pavo.core.purge import UsedSelectors
+
+
+def test_collect_selectors(tmp_path) -> None:
+    html = '<div id="main" class="card  is-active"><P class="lead">Text</P><br/></div>'
+    output = DiskOutput(str(tmp_path))
+    output.write("index.html", html.encode("utf-8"))
+    memory = MemoryOutput()
+    memory.write("index.html", html.encode("utf-8"))
+
+    for used in (
+        purge.collect_selectors(["index.html"], output),
+        purge.collect_selectors(["index.html"], memory),
+    ):
+        assert used.classes == {"card", "is-active", "lead"}
+        assert used.ids == {"main"}
+        assert {"div", "p", "br", "html", "body"} <= used.tags
+
+
+def test_purge_stylesheet() -> None:
+    used = UsedSelectors(
+        tags={"html", "body", "a", "p"},
+        classes={"btn", "md:flex"},
+        ids={"main"},
+    )
+    css = (
+        '@charset "utf-8";\n'
+        ".btn, .unused { color: red; }\n"
+        ".unused { color: blue; }\n"
+        'a:hover > .btn::after { content: "}"; }\n'
+        ".md\\:flex { display: flex; }\n"
+        "#main:not(.other) { margin: 0; }\n"
+        "table td { padding: 0; }\n"
+        "@media print {\n  .unused { color: black; }\n}\n"
+        "@media screen {\n  p { color: black; }\n  .gone { color: black; }\n}\n"
+        "@font-face { font-family: Custom; }\n"
+        ".is-open { display: block; }\n"
+        "* { box-sizing: border-box; }\n"
+    )
+
+    assert purge.purge_stylesheet(css, used, ["is-*"]) == (
+        '@charset "utf-8";\n'
+        ".btn, .unused { color: red; }\n"
+        'a:hover > .btn::after { content: "}"; }\n'
+        ".md\\:flex { display: flex; }\n"
+        "#main:not(.other) { margin: 0; }\n"
+        "@media screen {\n  p { color: black; }\n}\n"
+        "@font-face { font-family: Custom; }\n"
+        ".is-open { display: block; }\n"
+        "* { box-sizing: border-box; }\n"
+    )
@@ -0,0 +1,25 @@
+import json
+
+from pavo.core.state import StateFile
+
+
+def test_state_file_round_trip(tmp_path) -> None:
+    path = f"{tmp_path}/cache/state.json"
+    StateFile(path, 1, "test state", versioned=True).save({"files": {"a": 1}})
+
+    assert StateFile(path, 1, "test state", versioned=True).load() == {
+        "files": {"a": 1}
+    }
+    assert StateFile(path, 2, "test state").load() == {}
+    assert StateFile(None, 1, "test state").load() == {}
+
+
+def test_state_file_ignores_other_versions_and_corrupt_files(tmp_path) -> None:
+    path = f"{tmp_path}/state.json"
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"format": 1, "pavo": "0.0.0", "files": {}}, file)
+    assert StateFile(path, 1, "test state", versioned=True).load() == {}
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+    assert StateFile(path, 1, "test state").load() == {}
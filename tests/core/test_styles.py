@@ -0,0 +1,81 @@
+import pathlib
+
+from pavo.core import styles
+from pavo.core.styles import StyleGraph
+from pavo.utils import files
+
+
+def _create_styles(tmp_path, stylesheets: dict[str, str]) -> StyleGraph:
+    for name, source in stylesheets.items():
+        path = pathlib.Path(f"{tmp_path}/{name}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+
+    graph = StyleGraph(str(tmp_path).replace("\\", "/"))
+    graph.refresh(files.hash_file)
+    return graph
+
+
+def test_style_graph(tmp_path) -> None:
+    root = str(tmp_path).replace("\\", "/")
+    graph = _create_styles(
+        tmp_path,
+        {
+            "main.scss": '@use "sass:math";\n@import "base/variables", "mixins";\n',
+            "print.scss": "// @import 'mixins';\n@import 'print.css';\na { color: red; }\n",
+            "legacy.sass": "@import reset\n",
+            "_reset.sass": "html\n  margin: 0\n",
+            "_mixins.scss": "@forward 'base/variables';\n",
+            "base/_variables.scss": "$color: red;\n",
+        },
+    )
+
+    assert graph.dependencies(f"{root}/main.scss") == [
+        f"{root}/_mixins.scss",
+        f"{root}/base/_variables.scss",
+        f"{root}/main.scss",
+    ]
+    assert graph.dependencies(f"{root}/print.scss") == [f"{root}/print.scss"]
+    assert graph.dependencies(f"{root}/legacy.sass") == [
+        f"{root}/_reset.sass",
+        f"{root}/legacy.sass",
+    ]
+
+    # Changing a partial only changes the hashes of the stylesheets that import it
+    main_hash = graph.input_hash(f"{root}/main.scss")
+    print_hash = graph.input_hash(f"{root}/print.scss")
+    pathlib.Path(f"{tmp_path}/base/_variables.scss").write_text("$color: blue;")
+    graph.refresh(files.hash_file)
+    assert graph.input_hash(f"{root}/main.scss") != main_hash
+    assert graph.input_hash(f"{root}/print.scss") == print_hash
+    assert graph.input_hash(f"{root}/print.scss", True) != print_hash
+
+
+def test_dynamic_imports_depend_on_all_stylesheets(tmp_path) -> None:
+    root = str(tmp_path).replace("\\", "/")
+    graph = _create_styles(
+        tmp_path,
+        {"main.scss": '@import "themes/#{$theme}";\n', "_other.scss": ""},
+    )
+
+    assert graph.dependencies(f"{root}/main.scss") == [
+        f"{root}/_other.scss",
+        f"{root}/main.scss",
+    ]
+
+
+def test_find_entries(tmp_path) -> None:
+    for name in ("main.scss", "_partial.scss", "theme.sass", "theme.css", "a.css"):
+        pathlib.Path(f"{tmp_path}/{name}").write_text("", encoding="utf-8")
+
+    assert styles.find_entries(str(tmp_path)) == (["main.scss"], ["a.css", "theme.css"])
+
+    # Stylesheets in subdirectories are written to the build as well, except in partial directories
+    for name in ("pages/blog.scss", "pages/_partial.scss", "_partials/mixins.scss"):
+        pathlib.Path(f"{tmp_path}/{name}").parent.mkdir(exist_ok=True)
+        pathlib.Path(f"{tmp_path}/{name}").write_text("", encoding="utf-8")
+
+    assert styles.find_entries(str(tmp_path)) == (
+        ["main.scss", "pages/blog.scss"],
+        ["a.css", "theme.css"],
+    )
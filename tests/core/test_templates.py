@@ -0,0 +1,128 @@
+import pathlib
+
+from jinja2 import Environment
+
+from pavo.core.templates import TemplateGraph
+
+
+def _create_templates(tmp_path, templates: dict[str, str]) -> TemplateGraph:
+    for name, source in templates.items():
+        pathlib.Path(f"{tmp_path}/{name}").write_text(source, encoding="utf-8")
+
+    graph = TemplateGraph(Environment(), str(tmp_path))
+    graph.refresh()
+    return graph
+
+
+def test_template_chain(tmp_path) -> None:
+    graph = _create_templates(
+        tmp_path,
+        {
+            "base.html": "{{ site.title }}{% block body %}{% endblock %}{% include 'footer.html' %}",
+            "footer.html": "{{ data.nav }}",
+            "post.html": "{% extends 'base.html' %}{% block body %}{{ content }}{% endblock %}",
+            "index.html": "{% for post in site.posts %}{{ post.title }}{% endfor %}",
+        },
+    )
+
+    assert graph.chain("post.html") == ["base.html", "footer.html", "post.html"]
+    assert graph.chain("index.html") == ["index.html"]
+    assert {"site", "data", "content", "site.title"} <= graph.variables("post.html")
+    assert graph.uses_site_index("post.html") is False
+    assert graph.uses_site_index("index.html") is True
+
+    # Changing a partial only changes the hash of the chains that include it
+    post_hash, index_hash = graph.chain_hash("post.html"), graph.chain_hash(
+        "index.html"
+    )
+    pathlib.Path(f"{tmp_path}/footer.html").write_text("changed", encoding="utf-8")
+    graph.refresh()
+    assert graph.chain_hash("post.html") != post_hash
+    assert graph.chain_hash("index.html") == index_hash
+
+
+def test_template_unknown_usage(tmp_path) -> None:
+    graph = _create_templates(
+        tmp_path,
+        {
+            "macro.html": "{% set everything = site %}{{ everything.posts }}",
+            "dynamic.html": "{% include page.partial %}",
+            "partial.html": "{{ site['pages'] }}",
+        },
+    )
+
+    assert graph.uses_site_index("macro.html") is True
+    assert graph.chain("dynamic.html") == ["dynamic.html", "macro.html", "partial.html"]
+    assert graph.chain("missing.html") == ["missing.html"]
+
+
+def test_template_graph_persistence(tmp_path, monkeypatch) -> None:
+    pathlib.Path(f"{tmp_path}/templates").mkdir()
+    graph = _create_templates(
+        f"{tmp_path}/templates",
+        {
+            "base.html": "{% include 'post_footer.html' %}",
+            "post_footer.html": "{{ page.author }}",
+            "post.html": "{% extends 'base.html' %}",
+            "page.html": "{{ content }}",
+        },
+    )
+    graph.path = f"{tmp_path}/templates.json"
+    graph.save()
+
+    assert graph.dependents({"post_footer.html"}) == {
+        "base.html",
+        "post.html",
+        "post_footer.html",
+    }
+
+    # A persisted graph only parses the templates that changed
+    restored = TemplateGraph(Environment(), f"{tmp_path}/templates", graph.path)
+    assert restored.templates == graph.templates
+
+    parsed = []
+    original_parse = Environment.parse
+    monkeypatch.setattr(
+        Environment,
+        "parse",
+        lambda self, source: parsed.append(source) or original_parse(self, source),
+    )
+    pathlib.Path(f"{tmp_path}/templates/page.html").write_text(
+        "{{ data.nav }}", encoding="utf-8"
+    )
+    assert restored.refresh() == {"page.html"}
+    assert parsed == ["{{ data.nav }}"]
+    assert "data" in restored.variables("page.html")
+
+
+def test_globals_do_not_hide_variables(tmp_path) -> None:
+    environment = Environment()
+    environment.globals.update(site={}, asset=str)
+    pathlib.Path(f"{tmp_path}/page.html").write_text(
+        "{{ asset('main.css') }}{{ site.title }}{% for i in range(2) %}{% endfor %}",
+        encoding="utf-8",
+    )
+    graph = TemplateGraph(environment, str(tmp_path))
+    graph.refresh()
+
+    assert graph.variables("page.html") == {"asset", "site", "site.title"}
+
+
+def test_nested_templates(tmp_path) -> None:
+    pathlib.Path(f"{tmp_path}/partials").mkdir()
+    graph = _create_templates(
+        tmp_path,
+        {
+            "page.html": "{% include 'partials/nav.html' %}{{ content }}",
+            "partials/nav.html": "{{ data.nav }}",
+        },
+    )
+    nav_hash = graph.chain_hash("page.html")
+
+    assert "partials/nav.html" in graph.templates
+    assert graph.dependents({"partials/nav.html"}) == {"page.html", "partials/nav.html"}
+    assert "data" in graph.variables("page.html")
+
+    pathlib.Path(f"{tmp_path}/partials/nav.html").write_text("{{ data.menu }}")
+    assert graph.refresh() == {"partials/nav.html"}
+    assert graph.chain_hash("page.html") != nav_hash
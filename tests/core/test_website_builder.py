@@ -0,0 +1,553 @@
+import gzip
+import os
+import pathlib
+
+import pytest
+
+from pavo.core import minify, purge, sources, styles, website_builder
+from pavo.core.exceptions import RenderError
+from pavo.core.hooks import HookManager
+from pavo.core.output import MemoryOutput
+from pavo.core.website_builder import WebsiteBuilder
+from pavo.ddl.hooks import Hook, HookTypes, Invoker
+
+
+@pytest.fixture
+def project(monkeypatch, tmp_path) -> pathlib.Path:
+    monkeypatch.chdir(tmp_path)
+    for directory in (
+        "_data",
+        "_pages",
+        "_posts",
+        "_static/public",
+        "_static/templates",
+        "_static/styles",
+        "_static/images",
+        "build",
+    ):
+        pathlib.Path(f"{tmp_path}/{directory}").mkdir(parents=True)
+
+    files = {
+        "pavoconfig.yaml": (
+            "build:\n"
+            "  default_templates: {page: page, post: post}\n"
+            "  max_template_cache: 50\n"
+            "  markdown: {extras: [fenced-code-blocks]}\n"
+            "  paths: {site_config: ./_data/site.yaml}\n"
+        ),
+        "_data/site.yaml": "title: Test\n",
+        "_static/templates/page.html": "{{ site.title }}: {{ content }}",
+        "_static/templates/post.html": "{{ page.title }} {{ content }}",
+        "_static/templates/index.html": (
+            "{% for post in site.posts %}{{ post.slug }}\n{% endfor %}"
+        ),
+        "_pages/index.md": "---\ntemplate: index\n---\n",
+    }
+    for number in range(12):
+        files[f"_pages/page-{number}.md"] = (
+            f"---\ntitle: Page {number}\n---\n# {number}\r\n"
+        )
+        files[f"_posts/2020-01-{number + 10}-post.md"] = f"Post *{number}*\n"
+
+    for path, content in files.items():
+        pathlib.Path(f"{tmp_path}/{path}").write_text(content, encoding="utf-8")
+
+    return tmp_path
+
+
+def test_parallel_discovery_matches_serial(project, monkeypatch) -> None:
+    monkeypatch.setattr(website_builder, "_PARALLEL_THRESHOLD", 0)
+
+    serial = WebsiteBuilder(f"{project}/build", jobs=1)
+    serial.build(False)
+    parallel = WebsiteBuilder(f"{project}/build", jobs=2)
+    parallel.build(False)
+
+    assert len(serial.site["pages"]) == 13
+    assert serial.site["pages"] == parallel.site["pages"]
+    assert serial.site["posts"] == parallel.site["posts"]
+    assert serial.site["pages"][1].content == "<h1>0</h1>"
+
+
+def test_incremental_build(project) -> None:
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+    assert (
+        pathlib.Path(f"{project}/build/page-0.html").read_text() == "Test: <h1>0</h1>"
+    )
+    assert not [
+        path
+        for path in pathlib.Path(f"{project}/build").rglob("*")
+        if path.suffix == ".md" or path.name.startswith("_")
+    ]
+
+    # Unchanged outputs are left alone, but listing pages follow changes to the posts
+    os.utime(f"{project}/build/page-0.html", ns=(0, 0))
+    os.utime(f"{project}/build/index.html", ns=(0, 0))
+    os.remove(f"{project}/_posts/2020-01-10-post.md")
+    builder.build(False)
+
+    assert os.stat(f"{project}/build/page-0.html").st_mtime_ns == 0
+    assert os.stat(f"{project}/build/index.html").st_mtime_ns != 0
+    assert not os.path.exists(f"{project}/build/posts/2020-01-10-post.html")
+    assert "2020-01-10" not in pathlib.Path(f"{project}/build/index.html").read_text()
+
+
+def test_render_errors_are_collected(project) -> None:
+    for number in (3, 7):
+        pathlib.Path(f"{project}/_pages/page-{number}.md").write_text(
+            "---\ntemplate: missing\n---\n", encoding="utf-8"
+        )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1, render_workers=4)
+    with pytest.raises(RenderError) as error:
+        builder.build(False)
+
+    assert [page.slug for page, _ in error.value.errors] == [
+        "/page-3.html",
+        "/page-7.html",
+    ]
+    assert os.path.isfile(f"{project}/build/page-8.html")
+
+
+def test_rebuild_only_runs_affected_stages(project) -> None:
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+    os.utime(f"{project}/build/page-0.html", ns=(0, 0))
+    os.utime(f"{project}/build/posts/2020-01-11-post.html", ns=(0, 0))
+
+    pathlib.Path(f"{project}/_posts/2020-01-10-post.md").write_text(
+        "Edited\n", encoding="utf-8"
+    )
+    os.remove(f"{project}/_posts/2020-01-12-post.md")
+    pathlib.Path(f"{project}/_static/images/logo.png").write_bytes(b"png")
+    builder.rebuild(
+        {
+            f"{project}/_posts/2020-01-10-post.md",
+            f"{project}/_posts/2020-01-12-post.md",
+            f"{project}/_static/images/logo.png",
+        }
+    )
+
+    assert (
+        "Edited"
+        in pathlib.Path(f"{project}/build/posts/2020-01-10-post.html").read_text()
+    )
+    assert not os.path.exists(f"{project}/build/posts/2020-01-12-post.html")
+    assert "2020-01-12" not in pathlib.Path(f"{project}/build/index.html").read_text()
+    assert os.path.isfile(f"{project}/build/images/logo.png")
+    assert len(builder.site["posts"]) == 11
+    assert os.stat(f"{project}/build/page-0.html").st_mtime_ns == 0
+    assert os.stat(f"{project}/build/posts/2020-01-11-post.html").st_mtime_ns == 0
+
+
+def test_rebuild_after_removing_a_directory(project) -> None:
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+
+    # The files of a removed directory are unknown, so the whole website is built again
+    os.remove(f"{project}/_posts/2020-01-12-post.md")
+    builder.rebuild({f"{project}/_posts/drafts/"})
+    assert not os.path.exists(f"{project}/build/posts/2020-01-12-post.html")
+    assert len(builder.site["posts"]) == 11
+
+
+def test_nested_template_changes_render_again(project) -> None:
+    pathlib.Path(f"{project}/_static/templates/partials").mkdir()
+    pathlib.Path(f"{project}/_static/templates/partials/nav.html").write_text("Nav")
+    pathlib.Path(f"{project}/_static/templates/page.html").write_text(
+        "{% include 'partials/nav.html' %}: {{ content }}"
+    )
+    WebsiteBuilder(f"{project}/build", ".pavocache/manifest.json", jobs=1).build(False)
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text().startswith("Nav")
+
+    pathlib.Path(f"{project}/_static/templates/partials/nav.html").write_text("Menu")
+    WebsiteBuilder(f"{project}/build", ".pavocache/manifest.json", jobs=1).build(False)
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text().startswith("Menu")
+
+
+def test_build_to_memory(project) -> None:
+    output = MemoryOutput()
+    builder = WebsiteBuilder(f"{project}/build", jobs=1, output=output)
+    builder.build(False)
+
+    assert output.read("page-0.html") == b"Test: <h1>0</h1>"
+    assert output.exists("posts/2020-01-10-post.html")
+    assert not os.path.exists(f"{project}/build/page-0.html")
+
+    os.remove(f"{project}/_pages/page-0.md")
+    builder.rebuild({f"{project}/_pages/page-0.md"})
+    assert not output.exists("page-0.html")
+
+
+def test_templates_are_compiled_once(project, monkeypatch) -> None:
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+    assert os.listdir(f"{project}/.pavocache/jinja")
+
+    compiled = []
+    original = builder.jinja_environment.compile
+    monkeypatch.setattr(
+        builder.jinja_environment,
+        "compile",
+        lambda *args, **kwargs: compiled.append(args) or original(*args, **kwargs),
+    )
+    pathlib.Path(f"{project}/_pages/page-0.md").write_text("Edited", encoding="utf-8")
+    builder.build(False)
+
+    assert compiled == []
+    assert (
+        pathlib.Path(f"{project}/build/page-0.html").read_text()
+        == "Test: <p>Edited</p>"
+    )
+
+
+def test_fingerprinted_assets(project) -> None:
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("  fingerprint: {enabled: true}\n")
+    pathlib.Path(f"{project}/_static/styles/main.css").write_text("a {}")
+    pathlib.Path(f"{project}/_static/templates/page.html").write_text(
+        "{{ asset('styles/main.css') }}"
+    )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build()
+    stylesheet = builder.assets.assets["styles/main.css"]
+
+    assert os.path.isfile(f"{project}/build/{stylesheet}")
+    assert not os.path.exists(f"{project}/build/styles/main.css")
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == stylesheet
+    assert os.path.isfile(f"{project}/build/asset-manifest.json")
+
+    # Root-absolute asset paths resolve from pages in subdirectories as well
+    pathlib.Path(f"{project}/_static/templates/post.html").write_text(
+        '<link rel="stylesheet" href="{{ asset(\'/styles/main.css\') }}">'
+    )
+    builder.build()
+    assert pathlib.Path(f"{project}/build/posts/2020-01-10-post.html").read_text() == (
+        f'<link rel="stylesheet" href="/{stylesheet}">'
+    )
+
+    # A development build does not fingerprint assets
+    builder.build(False)
+    assert os.path.isfile(f"{project}/build/styles/main.css")
+    assert not os.path.exists(f"{project}/build/{stylesheet}")
+
+
+def test_only_affected_stylesheets_are_compiled(project, monkeypatch) -> None:
+    styles_directory = pathlib.Path(f"{project}/_static/styles")
+    (styles_directory / "_colors.scss").write_text("$color: red;")
+    (styles_directory / "main.scss").write_text(
+        "@import 'colors';\na { color: $color; }"
+    )
+    (styles_directory / "print.scss").write_text("b { color: black; }")
+
+    compiled = []
+    compile_stylesheet = styles.compile_stylesheet
+    monkeypatch.setattr(
+        styles,
+        "compile_stylesheet",
+        lambda path, source_map: compiled.append(path)
+        or compile_stylesheet(path, source_map),
+    )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build()
+    assert sorted(compiled) == ["_static/styles/main.scss", "_static/styles/print.scss"]
+
+    # Changing a partial only compiles the stylesheets that import it
+    compiled.clear()
+    (styles_directory / "_colors.scss").write_text("$color: blue;")
+    builder.rebuild({"_static/styles/_colors.scss"})
+    assert compiled == ["_static/styles/main.scss"]
+    assert "blue" in pathlib.Path(f"{project}/build/styles/main.css").read_text()
+
+    # Compiled stylesheets are reused from the style cache
+    compiled.clear()
+    (styles_directory / "_colors.scss").write_text("$color: red;")
+    builder.rebuild({"_static/styles/_colors.scss"})
+    assert not compiled
+    assert "red" in pathlib.Path(f"{project}/build/styles/main.css").read_text()
+
+    # Source maps are written next to the stylesheets when enabled
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("  styles: {source_maps: true}\n")
+    builder.build()
+    assert os.path.isfile(f"{project}/build/styles/main.css.map")
+    assert (
+        "main.css.map" in pathlib.Path(f"{project}/build/styles/main.css").read_text()
+    )
+
+
+def test_nested_stylesheets_are_compiled(project) -> None:
+    styles_directory = pathlib.Path(f"{project}/_static/styles")
+    (styles_directory / "_partials").mkdir()
+    (styles_directory / "_partials" / "colors.scss").write_text("$color: red;")
+    (styles_directory / "pages").mkdir()
+    (styles_directory / "pages" / "blog.scss").write_text(
+        "@import '../_partials/colors';\na { color: $color; }"
+    )
+
+    WebsiteBuilder(f"{project}/build", jobs=1).build()
+    assert "red" in pathlib.Path(f"{project}/build/styles/pages/blog.css").read_text()
+    assert not os.path.exists(f"{project}/build/styles/_partials")
+
+
+def test_unused_styles_are_purged(project, monkeypatch) -> None:
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("  styles: {purge: {enabled: true, safelist: [is-*]}}\n")
+        file.write("  fingerprint: {enabled: true}\n")
+    pathlib.Path(f"{project}/_static/styles/main.scss").write_text(
+        ".used { color: red; }\n.unused { color: blue; }\n.is-open { color: green; }\n"
+    )
+    template = pathlib.Path(f"{project}/_static/templates/page.html")
+    template.write_text('<p class="used">{{ asset("styles/main.css") }}</p>')
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build()
+    stylesheet = builder.assets.assets["styles/main.css"]
+    purged = pathlib.Path(f"{project}/build/{stylesheet}").read_text()
+    assert ".used" in purged and ".is-open" in purged and ".unused" not in purged
+    assert stylesheet in pathlib.Path(f"{project}/build/page-0.html").read_text()
+
+    # Nothing is purged again when no page and no stylesheet changed
+    def collect_selectors(*_) -> None:
+        raise AssertionError("The stylesheets were purged again.")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(purge, "collect_selectors", collect_selectors)
+        builder.build()
+    assert builder.assets.assets["styles/main.css"] == stylesheet
+    assert ".unused" not in pathlib.Path(f"{project}/build/{stylesheet}").read_text()
+
+    # Rules come back under a new name when a page starts using them
+    template.write_text('<p class="used unused">{{ asset("styles/main.css") }}</p>')
+    builder.build()
+    assert builder.assets.assets["styles/main.css"] != stylesheet
+    stylesheet = builder.assets.assets["styles/main.css"]
+    assert ".unused" in pathlib.Path(f"{project}/build/{stylesheet}").read_text()
+    assert stylesheet in pathlib.Path(f"{project}/build/page-0.html").read_text()
+
+    # A development build does not purge
+    builder.build(False)
+    assert ".unused" in pathlib.Path(f"{project}/build/styles/main.css").read_text()
+
+
+def test_html_is_minified_in_optimized_builds(project, monkeypatch) -> None:
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("  minify: {enabled: true}\n")
+    pathlib.Path(f"{project}/_static/templates/page.html").write_text(
+        "<div>\n  <!-- title -->\n  {{ site.title }}\n</div>\n"
+    )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build()
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == "<div>Test</div>"
+
+    # A development build keeps the HTML as it was rendered
+    builder.build(False)
+    assert "<!-- title -->" in pathlib.Path(f"{project}/build/page-0.html").read_text()
+
+    # The next optimized build takes the minified pages from the cache
+    monkeypatch.setattr(minify, "minify_chunks", lambda chunks: pytest.fail())
+    builder.build()
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == "<div>Test</div>"
+
+
+def test_precompressed_variants(project) -> None:
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("  compress: {enabled: true, formats: [gzip], min_size: 100}\n")
+    pathlib.Path(f"{project}/_pages/page-0.md").write_text("Long " * 100)
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build()
+    assert (
+        gzip.decompress(pathlib.Path(f"{project}/build/page-0.html.gz").read_bytes())
+        == pathlib.Path(f"{project}/build/page-0.html").read_bytes()
+    )
+    assert not os.path.exists(f"{project}/build/page-1.html.gz")
+
+    # Variants are removed when their output becomes too small
+    pathlib.Path(f"{project}/_pages/page-0.md").write_text("Short")
+    builder.build()
+    assert not os.path.exists(f"{project}/build/page-0.html.gz")
+
+
+def test_paginated_listing(project) -> None:
+    pathlib.Path(f"{project}/_pages/index.md").write_text(
+        "---\ntemplate: listing\npaginate: 5\n---\n"
+    )
+    pathlib.Path(f"{project}/_static/templates/listing.html").write_text(
+        "{{ paginator.page }}/{{ paginator.pages }}"
+        "{% for post in paginator.items %} {{ post.slug }}{% endfor %}"
+        " {{ paginator.previous_url }} {{ paginator.next_url }}"
+    )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+    pages = [
+        pathlib.Path(f"{project}/build/{path}").read_text()
+        for path in ("index.html", "page/2.html", "page/3.html")
+    ]
+    assert pages[0].startswith("1/3 /posts/2020-01-21-post.html")
+    assert pages[0].endswith(" None /page/2.html")
+    assert pages[1].endswith(" /index.html /page/3.html")
+    assert pages[2] == (
+        "3/3 /posts/2020-01-11-post.html /posts/2020-01-10-post.html /page/2.html None"
+    )
+
+    # Pages that are no longer needed are removed when posts are removed
+    for number in range(10):
+        os.remove(f"{project}/_posts/2020-01-{number + 10}-post.md")
+    builder.rebuild({f"{project}/_posts/2020-01-10-post.md"})
+    assert not os.path.exists(f"{project}/build/page/2.html")
+    assert pathlib.Path(f"{project}/build/index.html").read_text() == (
+        "1/1 /posts/2020-01-21-post.html /posts/2020-01-20-post.html None None"
+    )
+
+
+def test_content_is_loaded_on_demand(project, monkeypatch) -> None:
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    builder.build(False)
+    page = builder.site["pages"][1]
+    assert not hasattr(page, "__dict__")
+    assert page.title == "Page 0"
+
+    loaded = []
+    load_markdown_content = sources.load_markdown_content
+    monkeypatch.setattr(
+        sources,
+        "load_markdown_content",
+        lambda path, *args: loaded.append(path) or load_markdown_content(path, *args),
+    )
+
+    # The content is loaded once, and comparing pages does not load it at all
+    assert page == builder.site["pages"][1]
+    assert not loaded
+    assert page.content == "<h1>0</h1>"
+    assert page.content == "<h1>0</h1>"
+    assert loaded == ["_pages/page-0.md"]
+
+    # The content is kept until it is released, after which it is loaded again from the source
+    source = pathlib.Path(f"{project}/_pages/page-0.md")
+    source.write_text("---\ntitle: Page 0\n---\nNew")
+    assert page.content == "<h1>0</h1>"
+    page.release()
+    assert page.content == "<p>New</p>"
+
+
+def test_sources_changed_while_building_are_rendered_again(project) -> None:
+    source = pathlib.Path(f"{project}/_pages/page-0.md")
+    original = source.read_bytes()
+    changes = ["---\ntitle: Page 0\n---\nNew"]
+
+    hooks = HookManager()
+    hooks.register(
+        Hook(
+            lambda builder: changes and source.write_text(changes.pop()),
+            HookTypes.BEFORE,
+            Invoker.for_stage("pages"),
+        )
+    )
+    builder = WebsiteBuilder(f"{project}/build", jobs=1, hooks=hooks)
+    builder.build(False)
+    assert "<p>New</p>" in pathlib.Path(f"{project}/build/page-0.html").read_text()
+
+    # The output is recorded with the source it was rendered from, not the one that was discovered
+    source.write_bytes(original)
+    builder.build(False)
+    assert "<h1>0</h1>" in pathlib.Path(f"{project}/build/page-0.html").read_text()
+
+
+def test_hooks(project) -> None:
+    stages = []
+
+    def post_parse(render_object):
+        render_object.metadata["parsed"] = True
+
+    hooks = HookManager()
+    for stage in ("discovery", "posts"):
+        for type_ in (HookTypes.BEFORE, HookTypes.AFTER):
+            hooks.register(
+                Hook(
+                    lambda builder, stage=stage, type_=type_: stages.append(
+                        (stage, type_.name, isinstance(builder, WebsiteBuilder))
+                    ),
+                    type_,
+                    Invoker.for_stage(stage),
+                )
+            )
+    hooks.register(
+        Hook(post_parse, HookTypes.POST_PARSE, Invoker.for_stage("discovery"))
+    )
+    hooks.register(
+        Hook(
+            lambda render_object, html: f"{html}!" * render_object.metadata["parsed"],
+            HookTypes.POST_RENDER,
+            Invoker.for_stage("posts"),
+        )
+    )
+
+    builder = WebsiteBuilder(f"{project}/build", jobs=1, render_workers=4, hooks=hooks)
+    builder.build(False)
+    assert stages == [
+        ("discovery", "BEFORE", True),
+        ("discovery", "AFTER", True),
+        ("posts", "BEFORE", True),
+        ("posts", "AFTER", True),
+    ]
+    assert all(post.metadata["parsed"] for post in builder.site["posts"])
+    assert pathlib.Path(f"{project}/build/posts/2020-01-10-post.html").read_text() == (
+        " <p>Post <em>0</em></p>!"
+    )
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == (
+        "Test: <h1>0</h1>"
+    )
+
+
+def test_filters(project) -> None:
+    pathlib.Path(f"{project}/_static/templates/page.html").write_text(
+        "{{ site.title | shout }}: {{ content }}"
+    )
+    builder = WebsiteBuilder(
+        f"{project}/build", jobs=1, filters={"shout": lambda value: value.upper()}
+    )
+    builder.build(False)
+
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == (
+        "TEST: <h1>0</h1>"
+    )
+
+
+def test_public_configuration_is_serializable(project) -> None:
+    with open(f"{project}/pavoconfig.yaml", "a", encoding="utf-8") as file:
+        file.write("public: {links: [a, b]}\n")
+    pathlib.Path(f"{project}/_static/templates/page.html").write_text(
+        "{{ public|tojson }}"
+    )
+    WebsiteBuilder(f"{project}/build", jobs=1).build(False)
+
+    assert pathlib.Path(f"{project}/build/page-0.html").read_text() == (
+        '{"links": ["a", "b"]}'
+    )
+
+
+def test_caches_are_pruned(project) -> None:
+    pathlib.Path(f"{project}/pavoconfig.yaml").write_text(
+        "build:\n"
+        "  default_templates: {page: page, post: post}\n"
+        "  max_template_cache: 50\n"
+        "  images: {cache_size: 1}\n"
+        "  styles: {cache_size: 1}\n"
+        "  paths: {site_config: ./_data/site.yaml}\n"
+    )
+    builder = WebsiteBuilder(f"{project}/build", jobs=1)
+    for disk_cache in (builder.image_cache, builder.style_cache):
+        disk_cache.set("old", b"x" * 768 * 1024)
+        os.utime(disk_cache._path("old"), ns=(0, 0))
+        disk_cache.set("new", b"x" * 768 * 1024)
+
+    builder.build(False)
+    for disk_cache in (builder.image_cache, builder.style_cache):
+        assert disk_cache.get("old") is None
+        assert disk_cache.get("new") is not None
@@ -0,0 +1,50 @@
+import copy
+import dataclasses
+
+from pavo.ddl.build import Page, Post
+
+
+def _lazy_post(content: str, loads: list[str]) -> Post:
+    def load() -> str:
+        loads.append(content)
+        return content
+
+    return Post(None, "Title", {}, "/post.html", "2021-01-01", loader=load)
+
+
+def test_equality_compares_loaded_content() -> None:
+    loads: list[str] = []
+    post = _lazy_post("<p>a</p>", loads)
+
+    assert post == Post("<p>b</p>", "Title", {}, "/post.html", "2021-01-01")
+    assert post != Post("<p>a</p>", "Other", {}, "/post.html", "2021-01-01")
+    assert post != Page("<p>a</p>", "Title", {}, "/post.html")
+    assert not loads
+
+    assert post.content == "<p>a</p>"
+    assert post == Post("<p>a</p>", "Title", {}, "/post.html", "2021-01-01")
+    assert post != Post("<p>b</p>", "Title", {}, "/post.html", "2021-01-01")
+    assert Page("<p>a</p>", "Title", {}, "/a.html") != Page(
+        None, "Title", {}, "/a.html"
+    )
+
+
+def test_pages_can_be_copied() -> None:
+    loads: list[str] = []
+    post = _lazy_post("<p>a</p>", loads)
+
+    replaced = dataclasses.replace(post, slug="/other.html")
+    assert replaced.slug == "/other.html"
+    assert replaced.content == "<p>a</p>"
+    assert dataclasses.asdict(post)["content"] == "<p>a</p>"
+    assert copy.copy(post) == post
+    assert loads == ["<p>a</p>"]
+
+    post.release()
+    assert post.content == "<p>a</p>"
+    assert loads == ["<p>a</p>", "<p>a</p>"]
+
+    post.content = "<p>b</p>"
+    post.release()
+    assert post.content == "<p>b</p>"
+    assert post.loader is None
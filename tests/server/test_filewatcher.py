@@ -0,0 +1,86 @@
+import time
+import threading
+
+from watchdog.events import (
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileOpenedEvent,
+    FileClosedNoWriteEvent,
+    DirModifiedEvent,
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirMovedEvent,
+)
+
+from pavo.server._filewatcher import FileWatcher
+
+
+def test_events_are_coalesced() -> None:
+    calls: list[set[str]] = []
+    watcher = FileWatcher(calls.append, settle_time=0.05)
+
+    watcher.on_any_event(FileModifiedEvent("/project/_posts/a.md"))
+    watcher.on_any_event(DirModifiedEvent("/project/_posts"))
+    watcher.on_any_event(FileMovedEvent("/project/_pages/b.md", "/project/_pages/c.md"))
+    time.sleep(0.2)
+
+    assert calls == [
+        {"/project/_posts/a.md", "/project/_pages/b.md", "/project/_pages/c.md"}
+    ]
+
+
+def test_reading_files_is_not_a_change() -> None:
+    calls: list[set[str]] = []
+    watcher = FileWatcher(calls.append, settle_time=0.05)
+
+    watcher.on_any_event(FileOpenedEvent("/project/_pages/index.md"))
+    watcher.on_any_event(FileClosedNoWriteEvent("/project/_pages/index.md"))
+    time.sleep(0.2)
+
+    assert not calls
+
+
+def test_events_during_callback_are_not_lost() -> None:
+    calls: list[set[str]] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def callback(paths: set[str]) -> None:
+        calls.append(paths)
+        started.set()
+        release.wait(1)
+
+    watcher = FileWatcher(callback, settle_time=0.01)
+    watcher.on_any_event(FileModifiedEvent("/project/_posts/a.md"))
+    assert started.wait(1)
+
+    watcher.on_any_event(FileModifiedEvent("/project/_posts/b.md"))
+    time.sleep(0.1)
+    assert len(calls) == 1
+
+    release.set()
+    time.sleep(0.1)
+    assert calls == [{"/project/_posts/a.md"}, {"/project/_posts/b.md"}]
+
+
+def test_directory_events_are_expanded(tmp_path) -> None:
+    calls: list[set[str]] = []
+    watcher = FileWatcher(calls.append, settle_time=0.05)
+    (tmp_path / "drafts").mkdir()
+    (tmp_path / "drafts" / "a.md").write_text("a")
+    (tmp_path / "moved").mkdir()
+    (tmp_path / "moved" / "b.md").write_text("b")
+
+    watcher.on_any_event(DirCreatedEvent(f"{tmp_path}/drafts"))
+    watcher.on_any_event(DirMovedEvent(f"{tmp_path}/old", f"{tmp_path}/moved"))
+    watcher.on_any_event(DirDeletedEvent(f"{tmp_path}/gone"))
+    time.sleep(0.2)
+
+    assert calls == [
+        {
+            f"{tmp_path}/drafts/a.md",
+            f"{tmp_path}/old/",
+            f"{tmp_path}/moved/b.md",
+            f"{tmp_path}/gone/",
+        }
+    ]
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from pavo.utils import cache
+
+
+def test_disk_cache(tmp_path) -> None:
+    disk_cache = cache.DiskCache(f"{tmp_path}/cache")
+    key = cache.DiskCache.key("content", "settings")
+
+    assert key == cache.DiskCache.key("content", "settings")
+    assert key != cache.DiskCache.key("contentsettings")
+    assert disk_cache.get(key) is None
+
+    disk_cache.set(key, b"artifact")
+    assert disk_cache.get(key) == b"artifact"
+
+    disk_cache.clear()
+    assert disk_cache.get(key) is None
+
+
+def test_disk_cache_writer(tmp_path) -> None:
+    disk_cache = cache.DiskCache(f"{tmp_path}/cache")
+    with disk_cache.writer("stored") as file:
+        file.write(b"arti")
+        file.write(b"fact")
+    assert disk_cache.get("stored") == b"artifact"
+
+    with pytest.raises(ValueError):
+        with disk_cache.writer("failed") as file:
+            file.write(b"part")
+            raise ValueError
+    assert disk_cache.get("failed") is None
+    assert os.listdir(f"{tmp_path}/cache/fa") == []
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path) -> None:
+    disk_cache = cache.DiskCache(f"{tmp_path}/cache", max_size=20)
+    keys = [cache.DiskCache.key(str(number)) for number in range(3)]
+    for age, key in enumerate(keys):
+        disk_cache.set(key, b"0123456789")
+        os.utime(disk_cache._path(key), ns=(age, age))
+
+    # Reading an entry marks it as recently used, so it survives eviction
+    assert disk_cache.get(keys[0]) == b"0123456789"
+    assert disk_cache.prune() == 1
+    assert disk_cache.get(keys[0]) is not None
+    assert disk_cache.get(keys[1]) is None
+    assert disk_cache.get(keys[2]) is not None
@@ -1,4 +1,7 @@
+import os
+import json
 import pathlib
+import pytest
 import yaml
 
 from pavo.utils import config
@@ -17,3 +20,71 @@ def test_get_config_value(monkeypatch, tmp_path) -> None:
     assert config.get_config_value("test.something.value") == 11
     assert config.get_config_value("test.unexisting") == ""
     assert config.get_config_value("test.something") == {"value": 11}
+
+
+def test_config_values_are_copies(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    pathlib.Path(f"{tmp_path}/pavoconfig.yaml").write_text(
+        "public: {links: [a, b]}\n", encoding="utf-8"
+    )
+
+    public = config.get_config_value("public")
+    public["links"].append("c")
+
+    assert json.dumps(public) == '{"links": ["a", "b", "c"]}'
+    assert config.get_config_value("public") == {"links": ["a", "b"]}
+
+
+def test_config_reloads_on_change(monkeypatch, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+    config_file = pathlib.Path(f"{tmp_path}/pavoconfig.yaml")
+    config_file.write_text("build:\n  max_template_cache: 50\n", encoding="utf-8")
+
+    project_config = config.get_config()
+    assert project_config is config.get_config("pavoconfig.yaml")
+    assert project_config.get("build.max_template_cache") == 50
+
+    # Lookups are served from memory as long as the file stays untouched
+    monkeypatch.setattr(yaml, "load", lambda *_, **kwargs: pytest.fail())
+    assert project_config.get("build.max_template_cache") == 50
+    monkeypatch.undo()
+    monkeypatch.chdir(tmp_path)
+
+    config_file.write_text("build:\n  max_template_cache: 100\n", encoding="utf-8")
+    os.utime(config_file, ns=(0, 0))
+    assert config.get_config_value("build.max_template_cache") == 100
+
+
+def test_config_get_as(tmp_path) -> None:
+    config_file = pathlib.Path(f"{tmp_path}/pavoconfig.yaml")
+    config_file.write_text(
+        "build:\n  extras: [a, b]\n  enabled: true\n  empty: null\n", encoding="utf-8"
+    )
+    project_config = config.Config(str(config_file))
+
+    assert project_config.get_as("build.extras", list, []) == ("a", "b")
+    assert project_config.get_as("build.extras", str, "none") == "none"
+    assert project_config.get_as("build.enabled", bool, False) is True
+    assert project_config.get_as("build.enabled", int, 1) == 1
+    assert project_config.get_as("build.missing", int, 10) == 10
+    assert project_config.get("build.empty", "default") is None
+    assert project_config.get("build.extras.nested") == ""
+
+
+def test_config_lookups_are_read_only(tmp_path) -> None:
+    config_file = pathlib.Path(f"{tmp_path}/pavoconfig.yaml")
+    config_file.write_text(
+        "build:\n  markdown: {extras: [a, {b: c}]}\n", encoding="utf-8"
+    )
+    project_config = config.Config(str(config_file))
+
+    markdown = project_config.get_as("build.markdown", dict, {})
+    with pytest.raises(TypeError):
+        markdown["extras"] = []
+    with pytest.raises(TypeError):
+        markdown["extras"][1]["b"] = "d"
+
+    extras = config.thaw(project_config.get("build.markdown.extras"))
+    extras.append("e")
+    assert extras == ["a", {"b": "c"}, "e"]
+    assert project_config.get("build.markdown.extras") == ("a", {"b": "c"})
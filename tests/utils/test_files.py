@@ -2,7 +2,9 @@ import os
 import pytest
 import pathlib
 
-from pavo.utils import files, config
+import markdown2
+
+from pavo.utils import cache, files, config
 
 
 def test_set_dir(monkeypatch) -> None:
@@ -59,3 +61,21 @@ def test_convert_md_to_html(monkeypatch) -> None:
     monkeypatch.setattr(config, "get_config_value", lambda _: [])
     assert files.convert_md_to_html("# Test") == "<h1>Test</h1>"
     assert files.convert_md_to_html("---") == "<hr />"
+
+
+def test_hash_file(tmp_path) -> None:
+    path = pathlib.Path(f"{tmp_path}/content.md")
+    path.write_text("# Test", encoding="utf-8")
+
+    assert files.hash_file(str(path)) == files.hash_content("# Test")
+    assert files.hash_content("# Test") == files.hash_content(b"# Test")
+    assert files.hash_content("# Test") != files.hash_content("# Other")
+
+
+def test_convert_md_to_html_cached(tmp_path, monkeypatch) -> None:
+    disk_cache = cache.DiskCache(f"{tmp_path}/cache")
+    assert files.convert_md_to_html("# Test", [], disk_cache) == "<h1>Test</h1>"
+
+    # A second conversion with the same markdown and extras is served from the cache
+    monkeypatch.setattr(markdown2, "markdown", lambda *_, **kwargs: pytest.fail())
+    assert files.convert_md_to_html("# Test", [], disk_cache) == "<h1>Test</h1>"